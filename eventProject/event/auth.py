@@ -1,37 +1,154 @@
+import hashlib
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from graphql_jwt.utils import get_payload, get_user_by_payload
+from graphql_jwt.settings import jwt_settings
+from graphql_jwt.utils import get_payload
 from graphql_jwt.exceptions import JSONWebTokenError
 from .models import UserToken
 
 
-class UserTokenJWTAuthentication(BaseAuthentication):
+class AuthenticationError(Exception):
+    pass
 
-    def authenticate(self, request):
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if not auth_header.startswith('JWT '):
+
+_session_cache    = {}
+_digest_index     = {}
+_token_cache_lock = threading.Lock()
+_SESSION_CACHE_MAX = 10000
+
+USER_VERSION_KEY = 'auth:user-version:{}'
+
+
+def token_digest(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _token_cache_ttl():
+    return getattr(settings, 'USER_TOKEN_CACHE_TTL', 30)
+
+
+def _shared_cache():
+    return caches[getattr(settings, 'SHARED_CACHE_ALIAS', 'default')]
+
+
+def _user_version(user_id):
+    return _shared_cache().get(USER_VERSION_KEY.format(user_id), 0)
+
+
+def _forget(user_id):
+    entry = _session_cache.pop(user_id, None)
+    if entry is not None:
+        _digest_index.pop(entry[0], None)
+
+
+def invalidate_user_token(user_id):
+    """Drop the cached session here and bump the shared stamp so other workers drop theirs."""
+    with _token_cache_lock:
+        _forget(user_id)
+    # After commit, so no worker can cache the old row under the new stamp.
+    transaction.on_commit(lambda: _bump_user_version(user_id))
+
+
+def _bump_user_version(user_id):
+    key = USER_VERSION_KEY.format(user_id)
+    # Never expires and is never incremented: a plain set of a new timestamp cannot
+    # lose a concurrent bump or fall back to a value a stale worker still holds.
+    _shared_cache().set(key, time.time_ns(), timeout=None)
+
+
+def _cached_session_user(digest):
+    now = time.monotonic()
+    with _token_cache_lock:
+        user_id = _digest_index.get(digest)
+        entry = _session_cache.get(user_id) if user_id is not None else None
+        if entry is None:
+            return None
+        if entry[0] != digest or entry[2] <= now:
+            _forget(user_id)
             return None
+    if _user_version(user_id) != entry[3]:
+        with _token_cache_lock:
+            if _session_cache.get(user_id) is entry:
+                _forget(user_id)
+        return None
+    return entry[1]
 
-        token = auth_header[4:] 
 
-        try:
-            payload = get_payload(token, request)
-            user = get_user_by_payload(payload)
-        except JSONWebTokenError as e:
-            raise AuthenticationFailed(f'Invalid or expired token: {e}')
+def _cache_session(user, digest, version):
+    now = time.monotonic()
+    with _token_cache_lock:
+        if len(_session_cache) >= _SESSION_CACHE_MAX:
+            for user_id in [uid for uid, entry in _session_cache.items() if entry[2] <= now]:
+                _forget(user_id)
+        _forget(user.pk)
+        _session_cache[user.pk] = (digest, user, now + _token_cache_ttl(), version)
+        _digest_index[digest] = user.pk
+
+
+def _authenticate(request, token):
+    try:
+        payload = get_payload(token, request)
+    except JSONWebTokenError as e:
+        raise AuthenticationError(f"Invalid or expired token: {e}")
+    username = jwt_settings.JWT_PAYLOAD_GET_USERNAME_HANDLER(payload)
+
+    digest = token_digest(token)
+    user = _cached_session_user(digest)
+    if user is None:
+        session = UserToken.objects.select_related('user').filter(access_token_hash=digest).first()
+        if session is None:
+            if UserToken.objects.filter(user__username=username).exists():
+                raise AuthenticationError("Token has been invalidated. Please log in again.")
+            raise AuthenticationError("No active session found. Please log in.")
+        user = session.user
+        # Read the stamp after the row: a revocation committed before it is
+        # already reflected in the row, one after it bumps the stamp.
+        _cache_session(user, digest, _user_version(user.pk))
 
-        if not user or not user.is_active:
-            raise AuthenticationFailed('User not found or inactive.')
+    if user.get_username() != username:
+        raise AuthenticationError("Token has been invalidated. Please log in again.")
+    if not user.is_active:
+        raise AuthenticationError("User not found or inactive.")
+    return user
 
+
+def authenticate_request(request):
+    request = getattr(request, '_request', request)
+    auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+    if not auth_header.startswith('JWT '):
+        raise AuthenticationError(
+            "Authentication required. "
+            "Please provide a valid JWT token in the Authorization header."
+        )
+    token = auth_header[4:]
+
+    cached = getattr(request, '_user_token_auth', None)
+    if cached is None or cached[0] != token:
         try:
-            stored = UserToken.objects.get(user=user)
-        except UserToken.DoesNotExist:
-            raise AuthenticationFailed('No active session found. Please log in.')
+            cached = (token, _authenticate(request, token), None)
+        except AuthenticationError as e:
+            cached = (token, None, e)
+        request._user_token_auth = cached
+    if cached[2] is not None:
+        raise cached[2]
+    return cached[1], token
 
-        if stored.access_token != token:
-            raise AuthenticationFailed('Token has been invalidated. Please log in again.')
 
-        return (user, token)
+class UserTokenJWTAuthentication(BaseAuthentication):
+
+    def authenticate(self, request):
+        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+        if not auth_header.startswith('JWT '):
+            return None
+        try:
+            return authenticate_request(request)
+        except AuthenticationError as e:
+            raise AuthenticationFailed(str(e))
 
     def authenticate_header(self, request):
         return 'JWT'
@@ -0,0 +1,120 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from .models import Category, EventTag, Country, State, City
+
+
+class AutocompleteItem:
+    __slots__ = ('kind', 'id', 'name', 'slug', 'parent_name')
+
+    def __init__(self, kind, id, name, slug, parent_name=None):
+        self.kind        = kind
+        self.id          = id
+        self.name        = name
+        self.slug        = slug
+        self.parent_name = parent_name
+
+
+def normalize(text):
+    return ' '.join(re.findall(r'\w+', text.lower()))
+
+
+class PrefixIndex:
+
+    def __init__(self, items):
+        entries = []
+        for item in items:
+            words = normalize(item.name).split()
+            for i in range(len(words)):
+                entries.append((' '.join(words[i:]), i, item.name.lower(), item.id, item))
+        entries.sort(key=lambda e: e[:4])
+        self.keys  = [e[0] for e in entries]
+        self.items = [e[4] for e in entries]
+
+    def search(self, prefix, limit):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        results, seen = [], set()
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix) and len(results) < limit:
+            item = self.items[i]
+            if item.id not in seen:
+                seen.add(item.id)
+                results.append(item)
+            i += 1
+        return results
+
+
+def _load_category():
+    return [AutocompleteItem('category', pk, name, slug) for pk, name, slug in Category.objects.values_list('id', 'name', 'slug')]
+
+
+def _load_tag():
+    return [AutocompleteItem('tag', pk, name, slug) for pk, name, slug in EventTag.objects.values_list('id', 'name', 'slug')]
+
+
+def _load_country():
+    return [AutocompleteItem('country', pk, name, slug) for pk, name, slug in Country.objects.values_list('id', 'name', 'slug')]
+
+
+def _load_state():
+    return [
+        AutocompleteItem('state', pk, name, slug, parent)
+        for pk, name, slug, parent in State.objects.values_list('id', 'name', 'slug', 'country__name')
+    ]
+
+
+def _load_city():
+    return [
+        AutocompleteItem('city', pk, name, slug, parent)
+        for pk, name, slug, parent in City.objects.values_list('id', 'name', 'slug', 'state__name')
+    ]
+
+
+LOADERS = {
+    'category': _load_category,
+    'tag':      _load_tag,
+    'country':  _load_country,
+    'state':    _load_state,
+    'city':     _load_city,
+}
+
+MODEL_KINDS = {
+    Category: ('category',),
+    EventTag: ('tag',),
+    Country:  ('country', 'state'),
+    State:    ('state', 'city'),
+    City:     ('city',),
+}
+
+MAX_INDEX_AGE = 300
+
+
+class AutocompleteRegistry:
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock    = threading.Lock()
+
+    def get(self, kind):
+        entry = self._indexes.get(kind)
+        if entry is None or time.monotonic() - entry[1] > MAX_INDEX_AGE:
+            with self._lock:
+                entry = self._indexes.get(kind)
+                if entry is None or time.monotonic() - entry[1] > MAX_INDEX_AGE:
+                    entry = (PrefixIndex(LOADERS[kind]()), time.monotonic())
+                    self._indexes[kind] = entry
+        return entry[0]
+
+    def invalidate(self, *kinds):
+        with self._lock:
+            for kind in kinds:
+                self._indexes.pop(kind, None)
+
+    def search(self, kind, prefix, limit):
+        return self.get(kind).search(prefix, limit)
+
+
+registry = AutocompleteRegistry()
@@ -0,0 +1,376 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from . import response_cache
+from .autocomplete import registry as autocomplete_registry
+from .geo import GEO_KINDS, geo_cache
+from .listings import schedule_refresh
+from .models import Category, EventTag, Country, State, City, Event
+from .nearby import assign_geohashes, validate_point
+from .search import get_search_backend
+from .slugs import SLUG_RETRIES, is_slug_conflict, reserve_event_slugs
+
+
+BULK_MAX_ITEMS = 2000
+BATCH_SIZE     = 500
+
+BATCH_REJECTED = 'Not saved: the batch contains invalid items.'
+
+EVENT_FIELDS = (
+    'title', 'venue', 'event_date', 'start_time', 'end_time',
+    'short_description', 'long_description', 'is_active',
+    'latitude', 'longitude',
+)
+EVENT_REQUIRED = (
+    'title', 'country_id', 'state_id', 'city_id', 'venue', 'event_date',
+    'start_time', 'end_time', 'short_description', 'long_description',
+)
+
+
+class BulkItemResult:
+
+    def __init__(self, index, success=True, message='', id=None, slug=None):
+        self.index   = index
+        self.success = success
+        self.message = message
+        self.id      = id
+        self.slug    = slug
+
+
+class BulkError(Exception):
+    pass
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int_list(values):
+    ids = [_to_int(v) for v in values or ()]
+    return None if None in ids else ids
+
+
+def _check_size(items):
+    if not items:
+        raise BulkError('No items provided.')
+    if len(items) > BULK_MAX_ITEMS:
+        raise BulkError(f'At most {BULK_MAX_ITEMS} items can be processed per call.')
+
+
+def _existing_ids(model, ids):
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return set()
+    return set(model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+
+
+def _reject(results, errors):
+    for result in results:
+        if result.index in errors:
+            result.success = False
+            result.message = errors[result.index]
+        else:
+            result.success = False
+            result.message = BATCH_REJECTED
+    return results, False
+
+
+def _after_write(event_ids=(), kinds=()):
+    response_cache.bump_generation()
+    if event_ids:
+        get_search_backend().index(list(event_ids))
+        schedule_refresh(event_ids)
+    if kinds:
+        autocomplete_registry.invalidate(*kinds)
+    if GEO_KINDS.intersection(kinds):
+        transaction.on_commit(geo_cache.invalidate)
+
+
+def _replace_m2m(field_name, target_column, assignments):
+    through = Event._meta.get_field(field_name).remote_field.through
+    if not assignments:
+        return
+    through.objects.filter(event_id__in=list(assignments)).delete()
+    through.objects.bulk_create(
+        [through(event_id=event_id, **{target_column: target_id})
+         for event_id, target_ids in assignments.items()
+         for target_id in dict.fromkeys(target_ids)],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def _validate_event_refs(items, errors, require=False):
+    # Checked against the database: the geo cache may lag writes made on other workers.
+    locations  = {
+        key: _existing_ids(model, (_to_int(i.get(key)) for i in items))
+        for key, model in (('country_id', Country), ('state_id', State), ('city_id', City))
+    }
+    categories = _existing_ids(Category, (c for i in items for c in (_to_int_list(i.get('category_ids')) or ())))
+    tags       = _existing_ids(EventTag, (t for i in items for t in (_to_int_list(i.get('tag_ids')) or ())))
+
+    for index, item in enumerate(items):
+        problems = []
+        if require:
+            missing = [f for f in EVENT_REQUIRED if item.get(f) in (None, '')]
+            if missing:
+                problems.append(f"Missing required field(s): {', '.join(missing)}.")
+        for key, model in (('country_id', Country), ('state_id', State), ('city_id', City)):
+            value = item.get(key)
+            if value is not None and _to_int(value) not in locations[key]:
+                problems.append(f'{model.__name__} matching query does not exist.')
+        try:
+            validate_point(item.get('latitude'), item.get('longitude'))
+        except ValueError as e:
+            problems.append(str(e))
+        category_ids = _to_int_list(item.get('category_ids'))
+        if category_ids is None or not set(category_ids) <= categories:
+            problems.append('Unknown category id(s).')
+        tag_ids = _to_int_list(item.get('tag_ids'))
+        if tag_ids is None or not set(tag_ids) <= tags:
+            problems.append('Unknown tag id(s).')
+        if problems:
+            errors[index] = ' '.join(([errors[index]] if index in errors else []) + problems)
+
+
+def bulk_create_events(items):
+    _check_size(items)
+    results = [BulkItemResult(index) for index in range(len(items))]
+    errors = {}
+    _validate_event_refs(items, errors, require=True)
+    if errors:
+        return _reject(results, errors)
+
+    for attempt in range(SLUG_RETRIES):
+        try:
+            with transaction.atomic():
+                slugs = reserve_event_slugs([item['title'] for item in items])
+                events = []
+                for item, slug in zip(items, slugs):
+                    event = Event(
+                        slug=slug,
+                        country_id=_to_int(item['country_id']),
+                        state_id=_to_int(item['state_id']),
+                        city_id=_to_int(item['city_id']),
+                        **{f: item[f] for f in EVENT_FIELDS if item.get(f) is not None},
+                    )
+                    events.append(event)
+                assign_geohashes(events)
+                Event.objects.bulk_create(events, batch_size=BATCH_SIZE)
+                _replace_m2m('category', 'category_id', {
+                    e.pk: _to_int_list(item.get('category_ids')) for e, item in zip(events, items) if item.get('category_ids')
+                })
+                _replace_m2m('tags', 'eventtag_id', {
+                    e.pk: _to_int_list(item.get('tag_ids')) for e, item in zip(events, items) if item.get('tag_ids')
+                })
+            break
+        except IntegrityError as e:
+            if attempt == SLUG_RETRIES - 1 or not is_slug_conflict(e):
+                raise BulkError(f'Bulk create failed: {e}')
+
+    for result, event in zip(results, events):
+        result.message = 'Event created.'
+        result.id      = event.pk
+        result.slug    = event.slug
+    _after_write(event_ids=[e.pk for e in events])
+    return results, True
+
+
+def bulk_update_events(items):
+    _check_size(items)
+    results = [BulkItemResult(index) for index in range(len(items))]
+    errors = {}
+    ids = [_to_int(item.get('id')) for item in items]
+    events = Event.objects.in_bulk([i for i in ids if i is not None])
+    seen = set()
+    for index, event_id in enumerate(ids):
+        if event_id not in events:
+            errors[index] = 'Event not found.'
+        elif event_id in seen:
+            errors[index] = 'Event listed more than once.'
+        seen.add(event_id)
+    _validate_event_refs(items, errors)
+    if errors:
+        return _reject(results, errors)
+
+    now = timezone.now()
+    changed = {'updated_at'}
+    retitled = [(events[i], item['title']) for i, item in zip(ids, items) if item.get('title') is not None]
+    try:
+        with transaction.atomic():
+            slugs = reserve_event_slugs([title for _, title in retitled], exclude_pks=[e.pk for e, _ in retitled])
+            for (event, _), slug in zip(retitled, slugs):
+                event.slug = slug
+                changed.add('slug')
+            for event_id, item in zip(ids, items):
+                event = events[event_id]
+                for field in EVENT_FIELDS:
+                    if item.get(field) is not None:
+                        setattr(event, field, item[field])
+                        changed.add(field)
+                for key in ('country_id', 'state_id', 'city_id'):
+                    if item.get(key) is not None:
+                        setattr(event, key, _to_int(item[key]))
+                        changed.add(key[:-3])
+                event.updated_at = now
+            if changed & {'latitude', 'longitude', 'city'}:
+                assign_geohashes(list(events.values()))
+                changed.add('geohash')
+            Event.objects.bulk_update(list(events.values()), sorted(changed), batch_size=BATCH_SIZE)
+            _replace_m2m('category', 'category_id', {
+                i: _to_int_list(item['category_ids']) for i, item in zip(ids, items) if item.get('category_ids') is not None
+            })
+            _replace_m2m('tags', 'eventtag_id', {
+                i: _to_int_list(item['tag_ids']) for i, item in zip(ids, items) if item.get('tag_ids') is not None
+            })
+    except IntegrityError as e:
+        raise BulkError(f'Bulk update failed: {e}')
+
+    for result, event_id in zip(results, ids):
+        result.message = 'Event updated.'
+        result.id      = event_id
+        result.slug    = events[event_id].slug
+    _after_write(event_ids=ids)
+    return results, True
+
+
+def _upsert(model, items, item_key, obj_key, build_fn, update_fn, kinds, slug_unique=False):
+    _check_size(items)
+    results = [BulkItemResult(index) for index in range(len(items))]
+    errors = {}
+    max_length = model._meta.get_field('name').max_length
+
+    keys, seen = [], set()
+    for index, item in enumerate(items):
+        name = (item.get('name') or '').strip()
+        key = item_key(item, name)
+        if not name:
+            errors[index] = 'Name is required.'
+        elif len(name) > max_length:
+            errors[index] = f'Name must be at most {max_length} characters.'
+        elif key in seen:
+            errors[index] = 'Duplicate item in batch.'
+        keys.append(key)
+        seen.add(key)
+
+    existing = {obj_key(obj): obj for obj in model.objects.filter(name__in={k[0] for k in keys})}
+    if slug_unique:
+        new_slugs = {index: slugify(key[0]) for index, key in enumerate(keys) if key not in existing}
+        taken = set(model.objects.filter(slug__in=new_slugs.values()).values_list('slug', flat=True))
+        claimed = set()
+        for index, slug in new_slugs.items():
+            if slug in taken or slug in claimed:
+                errors.setdefault(index, f'Slug "{slug}" is already in use.')
+            claimed.add(slug)
+    if errors:
+        return _reject(results, errors)
+
+    now = timezone.now()
+    to_create, to_update = [], []
+    for index, (item, key) in enumerate(zip(items, keys)):
+        obj = existing.get(key)
+        if obj is None:
+            obj = build_fn(item, key[0])
+            obj.slug = slugify(key[0])
+            to_create.append(obj)
+            results[index].message = 'Created.'
+        elif update_fn(obj, item):
+            obj.updated_at = now
+            to_update.append(obj)
+            results[index].message = 'Updated.'
+        else:
+            results[index].message = 'Unchanged.'
+        results[index].slug = obj.slug
+        existing[key] = obj
+
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+            if to_update:
+                model.objects.bulk_update(to_update, ['isActive', 'updated_at'], batch_size=BATCH_SIZE)
+    except IntegrityError as e:
+        # A concurrent writer took one of the names or slugs after validation.
+        raise BulkError(f'Bulk upsert failed: {e}')
+
+    for result, key in zip(results, keys):
+        result.id = existing[key].pk
+    _after_write(kinds=kinds)
+    return results, True
+
+
+def _set_active(obj, item):
+    if item.get('is_active') is None or item['is_active'] == obj.isActive:
+        return False
+    obj.isActive = item['is_active']
+    return True
+
+
+def _unchanged(obj, item):
+    return False
+
+
+def bulk_upsert_categories(items):
+    return _upsert(
+        Category, items,
+        item_key=lambda item, name: (name,),
+        obj_key=lambda obj: (obj.name,),
+        build_fn=lambda item, name: Category(name=name, isActive=item.get('is_active') is not False),
+        update_fn=_set_active,
+        kinds=('category',),
+        slug_unique=True,
+    )
+
+
+def bulk_upsert_tags(items):
+    return _upsert(
+        EventTag, items,
+        item_key=lambda item, name: (name,),
+        obj_key=lambda obj: (obj.name,),
+        build_fn=lambda item, name: EventTag(name=name, isActive=item.get('is_active') is not False),
+        update_fn=_set_active,
+        kinds=('tag',),
+        slug_unique=True,
+    )
+
+
+def bulk_upsert_countries(items):
+    return _upsert(
+        Country, items,
+        item_key=lambda item, name: (name,),
+        obj_key=lambda obj: (obj.name,),
+        build_fn=lambda item, name: Country(name=name),
+        update_fn=_unchanged,
+        kinds=('country', 'state'),
+        slug_unique=True,
+    )
+
+
+def _upsert_child(model, parent_model, parent_field, items, kinds):
+    _check_size(items)
+    parent_key = f'{parent_field}_id'
+    parents = _existing_ids(parent_model, (_to_int(item.get(parent_key)) for item in items))
+    errors = {
+        index: f'{parent_model.__name__} not found.'
+        for index, item in enumerate(items)
+        if _to_int(item.get(parent_key)) not in parents
+    }
+    if errors:
+        return _reject([BulkItemResult(index) for index in range(len(items))], errors)
+    return _upsert(
+        model, items,
+        item_key=lambda item, name: (name, _to_int(item.get(parent_key))),
+        obj_key=lambda obj: (obj.name, getattr(obj, parent_key)),
+        build_fn=lambda item, name: model(name=name, **{parent_key: _to_int(item.get(parent_key))}),
+        update_fn=_unchanged,
+        kinds=kinds,
+    )
+
+
+def bulk_upsert_states(items):
+    return _upsert_child(State, Country, 'country', items, kinds=('state', 'city'))
+
+
+def bulk_upsert_cities(items):
+    return _upsert_child(City, State, 'state', items, kinds=('city',))
@@ -0,0 +1,214 @@
+import hashlib
+import os
+import re
+import shutil
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from .images import image_pipeline
+from .models import Event, EventImages, UploadSession
+from .uploads import UploadValidationError, sniff_image
+
+
+DEFAULTS = {
+    'MAX_SIZE':   50 * 1024 * 1024,
+    'CHUNK_SIZE': 1024 * 1024,
+    'TTL':        24 * 60 * 60,
+}
+
+READ_BLOCK       = 64 * 1024
+CHECKSUM_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+CONTENT_RANGE    = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'EVENT_CHUNKED_UPLOADS', {}))
+    return config
+
+
+class ChunkedUploadError(Exception):
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def partial_path(session):
+    return os.path.join(settings.MEDIA_ROOT, 'uploads', 'partial', f'{session.pk}.part')
+
+
+def start_session(user, event, kind, filename, size, checksum):
+    config = get_config()
+    if kind not in UploadSession.KINDS:
+        raise ChunkedUploadError(f"Unknown upload kind. Use one of: {', '.join(UploadSession.KINDS)}.")
+    if not filename:
+        raise ChunkedUploadError('A filename is required.')
+    if not isinstance(size, int) or size <= 0:
+        raise ChunkedUploadError('Size must be a positive number of bytes.')
+    if size > config['MAX_SIZE']:
+        raise ChunkedUploadError(f"Uploads are limited to {config['MAX_SIZE']} bytes.", status=413)
+    checksum = (checksum or '').lower()
+    if not CHECKSUM_PATTERN.match(checksum):
+        raise ChunkedUploadError('Checksum must be a hex SHA-256 digest.')
+
+    session = UploadSession.objects.create(
+        user=user, event=event, kind=kind,
+        filename=os.path.basename(filename)[:255], size=size, checksum=checksum,
+    )
+    path = partial_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    return session
+
+
+def parse_offset(headers):
+    content_range = headers.get('Content-Range')
+    if content_range:
+        match = CONTENT_RANGE.match(content_range.strip())
+        if match is None:
+            raise ChunkedUploadError('Malformed Content-Range header.')
+        return int(match.group(1))
+    offset = headers.get('Upload-Offset')
+    if offset is None or not offset.isdigit():
+        raise ChunkedUploadError('Send the chunk position in Upload-Offset or Content-Range.')
+    return int(offset)
+
+
+def _check_chunk(session, offset, length):
+    if session.status != UploadSession.STATUS_ACTIVE:
+        raise ChunkedUploadError('Upload session is already complete.', status=409, offset=session.offset)
+    if offset != session.offset:
+        raise ChunkedUploadError('Chunk does not start at the current upload offset.', status=409, offset=session.offset)
+    if length <= 0:
+        raise ChunkedUploadError('Empty chunk.', offset=session.offset)
+    if offset + length > session.size:
+        raise ChunkedUploadError('Chunk extends past the declared upload size.', status=413, offset=session.offset)
+
+
+def _receive_chunk(session, offset, stream, length, chunk_checksum):
+    # Each request streams into its own file, so concurrent retries of a chunk never mix bytes.
+    path = f'{partial_path(session)}.{uuid.uuid4().hex}.chunk'
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(path, 'wb') as fh:
+            while written < length:
+                block = stream.read(min(READ_BLOCK, length - written))
+                if not block:
+                    break
+                fh.write(block)
+                digest.update(block)
+                written += len(block)
+        if written != length or (chunk_checksum and digest.hexdigest() != chunk_checksum.lower()):
+            raise ChunkedUploadError('Chunk was incomplete or failed its checksum; resend it.', offset=offset)
+    except BaseException:
+        _remove_partial(path)
+        raise
+    return path
+
+
+def write_chunk(session_id, offset, stream, length, chunk_checksum=None):
+    """Receive ``length`` bytes from ``stream`` and append them to the upload at ``offset``.
+
+    The body is read before the session row is locked, so a slow client never
+    holds the lock; the lock only covers the offset check and the local append.
+    """
+    session = UploadSession.objects.get(pk=session_id)
+    _check_chunk(session, offset, length)
+    chunk_path = _receive_chunk(session, offset, stream, length, chunk_checksum)
+    try:
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=session_id)
+            _check_chunk(session, offset, length)
+            with open(partial_path(session), 'r+b') as fh, open(chunk_path, 'rb') as chunk:
+                fh.seek(offset)
+                fh.truncate()
+                shutil.copyfileobj(chunk, fh, READ_BLOCK)
+                fh.flush()
+                os.fsync(fh.fileno())
+            session.offset = offset + length
+            session.save(update_fields=['offset', 'updated_at'])
+    finally:
+        _remove_partial(chunk_path)
+    return session
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(READ_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _store(session, field, path):
+    # Copy rather than move: if the transaction rolls back, a retry must still find the partial file.
+    with open(path, 'rb') as fh:
+        return field.storage.save(field.generate_filename(None, session.filename), File(fh))
+
+
+def complete_session(session_id):
+    """Verify the assembled file and attach it to the session's event."""
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().select_related('event').get(pk=session_id)
+        if session.status != UploadSession.STATUS_ACTIVE:
+            raise ChunkedUploadError('Upload session is already complete.', status=409, offset=session.offset)
+        if session.offset != session.size:
+            raise ChunkedUploadError('Upload is not finished yet.', status=409, offset=session.offset)
+
+        path = partial_path(session)
+        if not os.path.exists(path):
+            raise ChunkedUploadError('Upload data is no longer available; start a new upload.', status=410, offset=0)
+        if _file_digest(path) != session.checksum:
+            with open(path, 'r+b') as fh:
+                fh.truncate(0)
+            session.offset = 0
+            session.save(update_fields=['offset', 'updated_at'])
+            raise ChunkedUploadError('Checksum mismatch; the upload has been reset.', status=422, offset=0)
+        try:
+            with open(path, 'rb') as fh:
+                sniff_image(File(fh), max_size=get_config()['MAX_SIZE'])
+        except UploadValidationError as e:
+            raise ChunkedUploadError(str(e), status=422, offset=session.offset)
+
+        event = session.event
+        if session.kind == UploadSession.KIND_FEATURE:
+            name = _store(session, Event._meta.get_field('feature_image'), path)
+            if event.feature_image:
+                event.feature_image.delete(save=False)
+            event.feature_image = name
+            event.save(update_fields=['feature_image', 'updated_at'])
+        else:
+            name = _store(session, EventImages._meta.get_field('image'), path)
+            event.extraImages.add(EventImages.objects.create(image=name))
+
+        session.status = UploadSession.STATUS_COMPLETE
+        session.result_name = name
+        session.save(update_fields=['status', 'result_name', 'updated_at'])
+        image_pipeline.submit(name)
+        transaction.on_commit(lambda: _remove_partial(path))
+    return session
+
+
+def _remove_partial(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def abort_session(session):
+    _remove_partial(partial_path(session))
+    session.delete()
+
+
+def expire_sessions(now=None):
+    cutoff = (now or timezone.now()) - timedelta(seconds=get_config()['TTL'])
+    expired = 0
+    for session in UploadSession.objects.filter(updated_at__lt=cutoff).iterator():
+        abort_session(session)
+        expired += 1
+    return expired
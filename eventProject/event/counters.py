@@ -0,0 +1,91 @@
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+
+    def __init__(self, flush_interval=10):
+        self.flush_interval = flush_interval
+        self._pending = Counter()
+        self._lock    = threading.Lock()
+        self._stop    = threading.Event()
+        self._thread  = None
+
+    def increment(self, event_id, n=1):
+        with self._lock:
+            self._pending[int(event_id)] += n
+            pending = self._pending[int(event_id)]
+        if self.flush_interval <= 0:
+            self.flush()
+        else:
+            self._ensure_started()
+        return pending
+
+    def pending(self, event_id):
+        with self._lock:
+            return self._pending.get(int(event_id), 0)
+
+    def flush(self):
+        from .models import Event
+
+        with self._lock:
+            batch, self._pending = self._pending, Counter()
+        if not batch:
+            return 0
+
+        by_amount = defaultdict(list)
+        for event_id, n in batch.items():
+            by_amount[n].append(event_id)
+        try:
+            with transaction.atomic():
+                for n, ids in by_amount.items():
+                    Event.objects.filter(pk__in=ids).update(views_count=F('views_count') + n)
+        except Exception:
+            logger.exception("Failed to flush %d buffered view counts; retrying later.", len(batch))
+            with self._lock:
+                self._pending.update(batch)
+            return 0
+        return len(batch)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='event-view-counter', daemon=True)
+            self._thread.start()
+        atexit.register(self.shutdown)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+            close_old_connections()
+
+    def shutdown(self):
+        self._stop.set()
+        self.flush()
+
+
+def _build_counter():
+    config = getattr(settings, 'EVENT_VIEW_COUNTER', {})
+    return ViewCounter(flush_interval=config.get('FLUSH_INTERVAL', 10))
+
+
+view_counter = _build_counter()
+
+
+def record_view(event, request=None):
+    event.views_count += view_counter.increment(event.pk)
+    recorded = getattr(request, '_recorded_views', None)
+    if recorded is not None:
+        recorded.append(event.pk)
+    return event
@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from graphql import parse, validate
+from graphql.error import GraphQLError
+from graphene_django.settings import graphene_settings
+from .persisted_queries import query_hash
+
+
+class DocumentCache:
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock    = threading.Lock()
+        self.hits     = 0
+        self.misses   = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return entry
+
+    def peek(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+document_cache = DocumentCache(maxsize=getattr(settings, 'GRAPHQL_DOCUMENT_CACHE_SIZE', 256))
+
+
+def get_document(schema, query, key=None):
+    """Return ``(document, errors)`` for ``query``, parsing and validating it once per process.
+
+    ``key`` defaults to the query's hash; persisted queries pass the hash they arrived with.
+    """
+    key = key or query_hash(query)
+    entry = document_cache.get(key)
+    if entry is None:
+        try:
+            document = parse(query)
+        except GraphQLError as e:
+            entry = (None, [e])
+        else:
+            entry = (document, validate(schema, document, max_errors=graphene_settings.MAX_VALIDATION_ERRORS))
+        document_cache.set(key, entry)
+    return entry
@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+import zlib
+from django.db.models import Q
+from .importer import LIST_SEPARATOR
+from .models import Event
+
+
+EXPORT_FORMATS = {
+    'csv':    'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'jsonl':  'application/x-ndjson',
+}
+
+COLUMNS = (
+    'id', 'slug', 'title', 'country', 'state', 'city', 'venue',
+    'event_date', 'start_time', 'end_time', 'short_description', 'long_description',
+    'is_active', 'views_count', 'categories', 'tags', 'created_at', 'updated_at',
+)
+
+VALUE_FIELDS = {
+    'country': 'country__name',
+    'state':   'state__name',
+    'city':    'city__name',
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+FLUSH_BYTES        = 64 * 1024
+
+
+def filter_events(search=None, category_id=None, tag_id=None, status=None):
+    qs = Event.objects.all()
+    if search:
+        qs = qs.filter(Q(title__icontains=search) | Q(slug__icontains=search))
+    if category_id:
+        qs = qs.filter(category__id=category_id)
+    if tag_id:
+        qs = qs.filter(tags__id=tag_id)
+    if status == 'active':
+        qs = qs.filter(is_active=True)
+    elif status == 'inactive':
+        qs = qs.filter(is_active=False)
+    if category_id or tag_id:
+        qs = qs.distinct()
+    return qs.order_by('id')
+
+
+def _m2m_names(field_name, target_column, event_ids):
+    through = Event._meta.get_field(field_name).remote_field.through
+    names = {}
+    rows = (
+        through.objects
+        .filter(event_id__in=event_ids)
+        .order_by('event_id', f'{target_column}__name')
+        .values_list('event_id', f'{target_column}__name')
+    )
+    for event_id, name in rows:
+        names.setdefault(event_id, []).append(name)
+    return names
+
+
+def _attach_names(chunk):
+    ids = [row['id'] for row in chunk]
+    categories = _m2m_names('category', 'category', ids)
+    tags       = _m2m_names('tags', 'eventtag', ids)
+    for row in chunk:
+        row['categories'] = categories.get(row['id'], [])
+        row['tags']       = tags.get(row['id'], [])
+    return chunk
+
+
+def iter_rows(qs, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield export rows as dicts; M2M names are fetched once per chunk, not per row."""
+    fields = [VALUE_FIELDS.get(c, c) for c in COLUMNS if c not in ('categories', 'tags')]
+    renames = {v: k for k, v in VALUE_FIELDS.items()}
+    chunk = []
+    for values in qs.values(*fields).iterator(chunk_size=chunk_size):
+        chunk.append({renames.get(k, k): v for k, v in values.items()})
+        if len(chunk) >= chunk_size:
+            yield from _attach_names(chunk)
+            chunk = []
+    if chunk:
+        yield from _attach_names(chunk)
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return LIST_SEPARATOR.join(value)
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _encode(rows, fmt):
+    buffer = io.StringIO()
+    if fmt == 'csv':
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMNS)
+        for row in rows:
+            writer.writerow([_csv_value(row[c]) for c in COLUMNS])
+            if buffer.tell() >= FLUSH_BYTES:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+    else:
+        for row in rows:
+            buffer.write(json.dumps({c: row[c] for c in COLUMNS}, default=str, ensure_ascii=False))
+            buffer.write('\n')
+            if buffer.tell() >= FLUSH_BYTES:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(qs, fmt='csv', compress=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format. Allowed: {', '.join(EXPORT_FORMATS)}.")
+    chunks = _encode(iter_rows(qs, chunk_size), fmt)
+    return _gzip(chunks) if compress else chunks
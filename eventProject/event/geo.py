@@ -0,0 +1,167 @@
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from .models import Country, State, City
+
+
+VERSION_KEY            = 'geo:version'
+VERSION_CHECK_INTERVAL = 2.0
+
+GEO_KINDS = frozenset(('country', 'state', 'city'))
+
+GEO_MODELS = {'country': Country, 'state': State, 'city': City}
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _shared_cache():
+    # The version stamp only works if every worker reads the same cache; see CACHES['shared'].
+    return caches[getattr(settings, 'SHARED_CACHE_ALIAS', 'default')]
+
+
+def _shared_version():
+    cache = _shared_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+class GeoTree:
+    """An immutable snapshot of every country, state and city, loaded with one query per table.
+
+    The rows are unsaved-looking model instances with their parent already
+    cached, so GraphQL types and ``__str__`` can use them without touching
+    the database. Treat them as read-only.
+    """
+
+    __slots__ = ('version', 'countries', 'states', 'cities', 'states_by_country', 'cities_by_state')
+
+    def __init__(self, version):
+        self.version = version
+        country_field = State._meta.get_field('country')
+        state_field   = City._meta.get_field('state')
+
+        self.countries = {}
+        for pk, name, slug, created_at, updated_at in Country.objects.order_by('name').values_list(
+            'id', 'name', 'slug', 'created_at', 'updated_at'
+        ):
+            self.countries[pk] = Country(id=pk, name=name, slug=slug, created_at=created_at, updated_at=updated_at)
+
+        self.states = {}
+        states_by_country = {}
+        for pk, name, slug, country_id, created_at, updated_at in State.objects.order_by('name').values_list(
+            'id', 'name', 'slug', 'country_id', 'created_at', 'updated_at'
+        ):
+            if country_id not in self.countries:
+                continue    # parent deleted between the two queries; the next reload settles it
+            state = State(id=pk, name=name, slug=slug, country_id=country_id, created_at=created_at, updated_at=updated_at)
+            country_field.set_cached_value(state, self.countries[country_id])
+            self.states[pk] = state
+            states_by_country.setdefault(country_id, []).append(state)
+
+        self.cities = {}
+        cities_by_state = {}
+        for pk, name, slug, state_id, latitude, longitude, created_at, updated_at in City.objects.order_by('name').values_list(
+            'id', 'name', 'slug', 'state_id', 'latitude', 'longitude', 'created_at', 'updated_at'
+        ):
+            if state_id not in self.states:
+                continue
+            city = City(
+                id=pk, name=name, slug=slug, state_id=state_id, latitude=latitude, longitude=longitude,
+                created_at=created_at, updated_at=updated_at,
+            )
+            state_field.set_cached_value(city, self.states[state_id])
+            self.cities[pk] = city
+            cities_by_state.setdefault(state_id, []).append(city)
+
+        for instance in (*self.countries.values(), *self.states.values(), *self.cities.values()):
+            instance._state.adding = False
+            instance._state.db = 'default'
+
+        self.states_by_country = {k: tuple(v) for k, v in states_by_country.items()}
+        self.cities_by_state   = {k: tuple(v) for k, v in cities_by_state.items()}
+
+
+class GeoCache:
+
+    def __init__(self):
+        self._tree       = None
+        self._checked_at = 0.0
+        self._lock       = threading.Lock()
+
+    def tree(self):
+        tree = self._tree
+        now = time.monotonic()
+        if tree is not None and now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return tree
+        version = _shared_version()
+        if tree is not None and tree.version == version:
+            self._checked_at = now
+            return tree
+        with self._lock:
+            if self._tree is None or self._tree.version != version:
+                self._tree = GeoTree(version)
+            self._checked_at = now
+            return self._tree
+
+    def invalidate(self):
+        """Drop this process's tree and bump the shared version so other workers reload too."""
+        with self._lock:
+            self._tree = None
+        # A fresh timestamp rather than incr(): file/locmem incr is a racy get+set and
+        # re-adds an expired key at 1, which a stale worker may still hold.
+        _shared_cache().set(VERSION_KEY, time.time_ns(), timeout=None)
+
+    def countries(self):
+        return list(self.tree().countries.values())
+
+    def states(self):
+        return list(self.tree().states.values())
+
+    def cities(self):
+        return list(self.tree().cities.values())
+
+    def country(self, pk):
+        return self.tree().countries.get(_to_int(pk))
+
+    def state(self, pk):
+        return self.tree().states.get(_to_int(pk))
+
+    def city(self, pk):
+        return self.tree().cities.get(_to_int(pk))
+
+    def verified(self, kind, pk):
+        """Look up a location for a write, confirmed against the database.
+
+        The tree may lag other workers by a few seconds, so a miss is not
+        proof of absence and a hit is not proof of existence; both would
+        otherwise surface as bogus "not found" errors or FK violations.
+        """
+        pk = _to_int(pk)
+        if pk is None:
+            return None
+        model = GEO_MODELS[kind]
+        cached = getattr(self, kind)(pk)
+        if cached is None:
+            return model.objects.filter(pk=pk).first()
+        return cached if model.objects.filter(pk=pk).exists() else None
+
+    def country_by_slug(self, slug):
+        return next((c for c in self.tree().countries.values() if c.slug == slug), None)
+
+    def states_of(self, country_id):
+        return list(self.tree().states_by_country.get(_to_int(country_id), ()))
+
+    def cities_of(self, state_id):
+        return list(self.tree().cities_by_state.get(_to_int(state_id), ()))
+
+
+geo_cache = GeoCache()
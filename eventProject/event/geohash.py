@@ -0,0 +1,80 @@
+import math
+
+
+BASE32          = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE   = math.pi * EARTH_RADIUS_KM / 180     # same sphere as haversine_km
+
+
+def encode(latitude, longitude, precision=9):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """Return the (lat, lng) size in degrees of a cell at ``precision``."""
+    total = 5 * precision
+    lat_bits = total // 2
+    lng_bits = total - lat_bits
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Return ``(lat_min, lat_max, lng_min, lng_max)`` enclosing the circle; longitudes may pass ±180."""
+    angle = radius_km / EARTH_RADIUS_KM
+    dlat = radius_km / KM_PER_DEGREE
+    lat_min, lat_max = max(latitude - dlat, -90.0), min(latitude + dlat, 90.0)
+    cos_lat = math.cos(math.radians(latitude))
+    if lat_min == -90.0 or lat_max == 90.0 or math.sin(angle) >= cos_lat:
+        return lat_min, lat_max, -180.0, 180.0      # the circle contains a pole
+    # Exact longitude half-width of the circle on the sphere, not the flat-earth estimate.
+    dlng = math.degrees(math.asin(math.sin(angle) / cos_lat))
+    return lat_min, lat_max, longitude - dlng, longitude + dlng
+
+
+def covering_cells(latitude, longitude, radius_km, max_cells=24, max_precision=9):
+    """Return geohash prefixes whose cells together cover the circle.
+
+    Picks the finest precision that needs at most ``max_cells`` cells, so a
+    handful of index range scans replace a full scan.
+    """
+    lat_min, lat_max, lng_min, lng_max = bounding_box(latitude, longitude, radius_km)
+    for precision in range(max_precision, 0, -1):
+        cell_lat, cell_lng = cell_size(precision)
+        rows = range(math.floor((lat_min + 90) / cell_lat), math.floor((min(lat_max, 89.999999) + 90) / cell_lat) + 1)
+        cols = range(math.floor((lng_min + 180) / cell_lng), math.floor((lng_max + 180) / cell_lng) + 1)
+        if len(rows) * len(cols) > max_cells and precision > 1:
+            continue
+        columns = (1 << (5 * precision - (5 * precision) // 2))
+        cells = set()
+        for row in rows:
+            for col in cols:
+                center_lat = -90 + (row + 0.5) * cell_lat
+                center_lng = -180 + ((col % columns) + 0.5) * cell_lng
+                cells.add(encode(center_lat, center_lng, precision))
+        return sorted(cells)
+    return ['']
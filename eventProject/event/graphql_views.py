@@ -0,0 +1,116 @@
+from django.db import connection, transaction
+from django.http import HttpResponseNotAllowed
+from graphql import ExecutionResult, OperationType, execute, get_operation_ast, validate_schema
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.views import GraphQLView, HttpError
+from . import persisted_queries, response_cache
+from .counters import view_counter
+from .documents import get_document
+from .persisted_queries import PersistedQueryError
+from .query_cost import QueryCostError, check_query_cost
+
+
+class EventGraphQLView(GraphQLView):
+
+    def get_response(self, request, data, show_graphiql=False):
+        if isinstance(data, dict):
+            try:
+                persisted = persisted_queries.resolve(request, data)
+            except PersistedQueryError as e:
+                body = {'errors': [{'message': str(e), 'extensions': {'code': e.code}}]}
+                return self.json_encode(request, body, pretty=show_graphiql), 200
+            if persisted:
+                request._persisted_query_hash, data['query'] = persisted
+
+        if show_graphiql or not response_cache.is_enabled():
+            return super().get_response(request, data, show_graphiql)
+
+        query, variables, operation_name, _ = self.get_graphql_params(request, data)
+        key = response_cache.cache_key(request, self.schema.graphql_schema, query, variables, operation_name)
+        if key is None:
+            return super().get_response(request, data, show_graphiql)
+
+        cached = response_cache.lookup(key)
+        if cached is not None:
+            for event_id in cached['views']:
+                view_counter.increment(event_id)
+            return cached['body'], 200
+
+        request._recorded_views = []
+        request._graphql_failed = True
+        result, status_code = super().get_response(request, data, show_graphiql)
+        if status_code == 200 and result and not request._graphql_failed:
+            response_cache.store(key, result, request._recorded_views)
+        return result, status_code
+
+    def json_encode(self, request, d, pretty=False):
+        cost = getattr(request, '_query_cost', None)
+        if cost is not None and isinstance(d, dict):
+            d = dict(d, extensions={**d.get('extensions', {}), 'cost': cost})
+        return super().json_encode(request, d, pretty)
+
+    def get_document(self, request, query):
+        return get_document(self.schema.graphql_schema, query, getattr(request, '_persisted_query_hash', None))
+
+    def execute_graphql_request(self, request, data, query, variables, operation_name, show_graphiql=False):
+        result = self._execute(request, data, query, variables, operation_name, show_graphiql)
+        request._graphql_failed = result is None or bool(result.errors)
+        return result
+
+    def _execute(self, request, data, query, variables, operation_name, show_graphiql=False):
+        # Upstream re-parses and re-validates every request; this mirrors its
+        # execution on the cached document instead.
+        if not query:
+            return super().execute_graphql_request(request, data, query, variables, operation_name, show_graphiql)
+
+        schema = self.schema.graphql_schema
+        schema_errors = validate_schema(schema)
+        if schema_errors:
+            return ExecutionResult(data=None, errors=schema_errors)
+
+        document, errors = self.get_document(request, query)
+        if document is None:
+            return ExecutionResult(errors=errors)
+
+        operation = get_operation_ast(document, operation_name)
+        if request.method.lower() == 'get' and operation is not None and operation.operation != OperationType.QUERY:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseNotAllowed(
+                ['POST'], f'Can only perform a {operation.operation.value} operation from a POST request.',
+            ))
+        if errors:
+            return ExecutionResult(data=None, errors=errors)
+
+        try:
+            request._query_cost = check_query_cost(schema, document, operation_name, variables)
+        except QueryCostError as e:
+            return ExecutionResult(data=None, errors=[e])
+
+        try:
+            options = {
+                'root_value': self.get_root_value(request),
+                'context_value': self.get_context(request),
+                'variable_values': variables,
+                'operation_name': operation_name,
+                'middleware': self.get_middleware(request),
+            }
+            if self.execution_context_class:
+                options['execution_context_class'] = self.execution_context_class
+            if operation is not None and operation.operation == OperationType.MUTATION and self._atomic_mutations():
+                with transaction.atomic():
+                    result = execute(schema, document, **options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
+            return execute(schema, document, **options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+    @staticmethod
+    def _atomic_mutations():
+        return (
+            graphene_settings.ATOMIC_MUTATIONS is True
+            or connection.settings_dict.get('ATOMIC_MUTATIONS', False) is True
+        )
@@ -0,0 +1,159 @@
+import atexit
+import base64
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+from .models import ProcessedImage
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = {
+    'thumbnail': (160, 160),
+    'card':      (640, 400),
+    'hero':      (1600, 900),
+}
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+PLACEHOLDER_WIDTH = 16
+VARIANT_DIR       = 'events/variants'
+
+
+def _config():
+    return getattr(settings, 'EVENT_IMAGE_PIPELINE', {})
+
+
+def variant_sizes():
+    return _config().get('SIZES', DEFAULT_SIZES)
+
+
+def _open(name):
+    with default_storage.open(name, 'rb') as fh:
+        image = Image.open(fh)
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image, fmt, **overrides):
+    pil_format, options = FORMATS[fmt]
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **{**options, **overrides})
+    return buffer.getvalue()
+
+
+def _placeholder(image):
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    tiny = image.resize((PLACEHOLDER_WIDTH, height), Image.BILINEAR)
+    data = _encode(tiny, 'jpeg', quality=40, optimize=False, progressive=False)
+    return 'data:image/jpeg;base64,' + base64.b64encode(data).decode()
+
+
+def _delete_files(variants):
+    for formats in variants.values():
+        for variant in formats.values():
+            default_storage.delete(variant['name'])
+
+
+def process_image(name):
+    """Render every size/format variant of ``name`` plus an inline LQIP placeholder."""
+    image = _open(name)
+    stem = os.path.splitext(os.path.basename(name))[0]
+
+    variants = {}
+    for size, bounds in variant_sizes().items():
+        resized = image.copy()
+        resized.thumbnail(bounds, Image.LANCZOS, reducing_gap=3.0)
+        variants[size] = {}
+        for fmt in FORMATS:
+            stored = default_storage.save(f'{VARIANT_DIR}/{stem}-{size}.{fmt}', ContentFile(_encode(resized, fmt)))
+            variants[size][fmt] = {'name': stored, 'width': resized.width, 'height': resized.height}
+
+    previous = ProcessedImage.objects.filter(source=name).first()
+    processed, _ = ProcessedImage.objects.update_or_create(
+        source=name,
+        defaults={
+            'width':       image.width,
+            'height':      image.height,
+            'placeholder': _placeholder(image),
+            'variants':    variants,
+        },
+    )
+    if previous is not None:
+        _delete_files(previous.variants)
+    return processed
+
+
+def discard_variants(name):
+    processed = ProcessedImage.objects.filter(source=name).first()
+    if processed is None:
+        return
+    _delete_files(processed.variants)
+    processed.delete()
+
+
+class ImagePipeline:
+
+    def __init__(self, workers=2):
+        self.workers   = workers
+        self._executor = None
+        self._lock     = threading.Lock()
+
+    def submit(self, name):
+        if name:
+            transaction.on_commit(lambda: self._dispatch(name))
+
+    def _dispatch(self, name):
+        if self.workers <= 0:
+            self._process(name)
+            return
+        self._ensure_started().submit(self._run, name)
+
+    def _ensure_started(self):
+        if self._executor is not None:
+            return self._executor
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='event-images')
+                atexit.register(self.shutdown)
+        return self._executor
+
+    def _process(self, name):
+        try:
+            process_image(name)
+        except Exception:
+            logger.exception("Failed to build image variants for %s.", name)
+
+    def _run(self, name):
+        close_old_connections()
+        try:
+            self._process(name)
+        finally:
+            close_old_connections()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+def _build_pipeline():
+    return ImagePipeline(workers=_config().get('WORKERS', 2))
+
+
+image_pipeline = _build_pipeline()
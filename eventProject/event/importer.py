@@ -0,0 +1,267 @@
+import csv
+import io
+import json
+import os
+import time
+from datetime import date, time as dtime
+from django.db import DatabaseError, transaction
+from . import bulk
+from .models import Category, EventTag, Country, State, City, ImportCheckpoint
+
+
+LIST_SEPARATOR = '|'
+
+REQUIRED_COLUMNS = (
+    'title', 'country', 'state', 'city', 'venue', 'event_date', 'start_time', 'end_time',
+    'short_description', 'long_description',
+)
+
+
+class ImportRowError(Exception):
+    pass
+
+
+def detect_format(name):
+    return 'csv' if name.lower().endswith('.csv') else 'jsonl'
+
+
+def iter_records(stream, fmt):
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        while True:
+            try:
+                record = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                # The reader has consumed the bad line; report it and carry on.
+                yield ImportRowError(f'Invalid CSV: {e}')
+                continue
+            yield record
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield ImportRowError(f'Invalid JSON: {e}')
+            continue
+        if isinstance(record, dict):
+            yield record
+        else:
+            yield ImportRowError(f'Expected a JSON object, got {type(record).__name__}.')
+
+
+def _names(value):
+    if value is None or value == '':
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in str(value).split(LIST_SEPARATOR) if v.strip()]
+
+
+def _key(name):
+    return name.strip().lower()
+
+
+def _bool(value):
+    if value is None or value == '':
+        return True
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ('0', 'false', 'no', 'n', 'off')
+
+
+class LookupMaps:
+
+    def __init__(self, create_missing=False):
+        self.create_missing = create_missing
+        self.countries  = {_key(n): pk for pk, n in Country.objects.values_list('id', 'name')}
+        self.states     = {(c, _key(n)): pk for pk, n, c in State.objects.values_list('id', 'name', 'country_id')}
+        self.cities     = {(s, _key(n)): pk for pk, n, s in City.objects.values_list('id', 'name', 'state_id')}
+        self.categories = {_key(n): pk for pk, n in Category.objects.values_list('id', 'name')}
+        self.tags       = {_key(n): pk for pk, n in EventTag.objects.values_list('id', 'name')}
+
+    def _resolve(self, mapping, key, model, label, name, **fields):
+        pk = mapping.get(key)
+        if pk is None:
+            if not self.create_missing:
+                raise ImportRowError(f'Unknown {label} "{name}".')
+            pk = self._create(model, label, name.strip(), **fields)
+            mapping[key] = pk
+        return pk
+
+    def _create(self, model, label, name, **fields):
+        max_length = model._meta.get_field('name').max_length
+        if len(name) > max_length:
+            raise ImportRowError(f'{label.capitalize()} "{name}" is longer than {max_length} characters.')
+        try:
+            # A savepoint, so a failed insert only costs this row.
+            with transaction.atomic():
+                return model.objects.get_or_create(name=name, **fields)[0].pk
+        except DatabaseError as e:
+            raise ImportRowError(f'Could not create {label} "{name}": {e}')
+
+    def country(self, name):
+        return self._resolve(self.countries, _key(name), Country, 'country', name)
+
+    def state(self, country_id, name):
+        return self._resolve(self.states, (country_id, _key(name)), State, 'state', name, country_id=country_id)
+
+    def city(self, state_id, name):
+        return self._resolve(self.cities, (state_id, _key(name)), City, 'city', name, state_id=state_id)
+
+    def category(self, name):
+        return self._resolve(self.categories, _key(name), Category, 'category', name)
+
+    def tag(self, name):
+        return self._resolve(self.tags, _key(name), EventTag, 'tag', name)
+
+
+def build_item(record, lookups):
+    if isinstance(record, ImportRowError):
+        raise record
+    missing = [f for f in REQUIRED_COLUMNS if not str(record.get(f) or '').strip()]
+    if missing:
+        raise ImportRowError(f"Missing field(s): {', '.join(missing)}.")
+    try:
+        event_date = date.fromisoformat(str(record['event_date']).strip())
+        start_time = dtime.fromisoformat(str(record['start_time']).strip())
+        end_time   = dtime.fromisoformat(str(record['end_time']).strip())
+    except ValueError as e:
+        raise ImportRowError(f'Invalid date or time: {e}')
+
+    country_id = lookups.country(record['country'])
+    state_id   = lookups.state(country_id, record['state'])
+    city_id    = lookups.city(state_id, record['city'])
+    return {
+        'title':             str(record['title']).strip(),
+        'country_id':        country_id,
+        'state_id':          state_id,
+        'city_id':           city_id,
+        'venue':             str(record['venue']).strip(),
+        'event_date':        event_date,
+        'start_time':        start_time,
+        'end_time':          end_time,
+        'short_description': str(record['short_description']).strip(),
+        'long_description':  str(record['long_description']).strip(),
+        'is_active':         _bool(record.get('is_active')),
+        'category_ids':      [lookups.category(n) for n in _names(record.get('categories'))],
+        'tag_ids':           [lookups.tag(n) for n in _names(record.get('tags'))],
+    }
+
+
+class Checkpoint:
+    """Import progress for one source file, kept in the database.
+
+    ``save()`` is called inside the batch's transaction, so the recorded row
+    count and the imported rows commit (or roll back) together.
+    """
+
+    def __init__(self, key, source):
+        self.key    = key
+        self.source = source
+
+    def _fingerprint(self):
+        stat = os.stat(self.source)
+        return {'source': os.path.abspath(self.source), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def load(self):
+        data = ImportCheckpoint.objects.filter(key=self.key).values('source', 'size', 'mtime', 'rows_done').first()
+        if data is None:
+            return 0
+        if {k: data[k] for k in ('source', 'size', 'mtime')} != self._fingerprint():
+            raise ImportRowError('Checkpoint belongs to a different or modified source file.')
+        return data['rows_done']
+
+    def save(self, rows_done, stats):
+        ImportCheckpoint.objects.update_or_create(
+            key=self.key, defaults={**self._fingerprint(), 'rows_done': rows_done, 'stats': stats},
+        )
+
+
+class ImportStats:
+
+    def __init__(self):
+        self.processed = 0
+        self.created   = 0
+        self.failed    = 0
+        self.errors    = []
+        self.started   = time.monotonic()
+
+    @property
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self):
+        return {'processed': self.processed, 'created': self.created, 'failed': self.failed}
+
+
+def run_import(stream, fmt, batch_size=500, create_missing=False, skip=0,
+               on_batch=None, on_error=None, max_errors_kept=100):
+    lookups = LookupMaps(create_missing=create_missing)
+    stats = ImportStats()
+    batch = []
+
+    def submit(entries):
+        # A rejected batch names its invalid rows; re-submit the rest rather than losing them.
+        while entries:
+            try:
+                results, ok = bulk.bulk_create_events([item for _, item in entries])
+            except bulk.BulkError as e:
+                for line, _ in entries:
+                    _record_error(line, str(e))
+                stats.failed += len(entries)
+                return
+            if ok:
+                stats.created += len(results)
+                return
+            retry = []
+            for entry, result in zip(entries, results):
+                if result.message == bulk.BATCH_REJECTED:
+                    retry.append(entry)
+                else:
+                    _record_error(entry[0], result.message)
+                    stats.failed += 1
+            if len(retry) == len(entries):
+                for line, _ in retry:
+                    _record_error(line, bulk.BATCH_REJECTED)
+                stats.failed += len(retry)
+                return
+            entries = retry
+
+    def flush(row_number):
+        # on_batch runs in the batch's transaction so progress it records commits with the rows.
+        with transaction.atomic():
+            if batch:
+                submit(list(batch))
+            if on_batch:
+                on_batch(row_number, stats)
+        batch.clear()
+
+    def _record_error(line, message):
+        if len(stats.errors) < max_errors_kept:
+            stats.errors.append({'row': line, 'error': message})
+        if on_error:
+            on_error(line, message)
+
+    row_number = 0
+    for row_number, record in enumerate(iter_records(stream, fmt), start=1):
+        if row_number <= skip:
+            continue
+        stats.processed += 1
+        try:
+            batch.append((row_number, build_item(record, lookups)))
+        except ImportRowError as e:
+            stats.failed += 1
+            _record_error(row_number, str(e))
+        if len(batch) >= batch_size:
+            flush(row_number)
+    flush(row_number)
+    return stats
+
+
+def open_text(uploaded_file):
+    return io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', newline='')
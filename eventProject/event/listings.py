@@ -0,0 +1,124 @@
+import threading
+from django.conf import settings
+from django.db import transaction
+from . import response_cache
+from .models import Event, EventListing, ProcessedImage
+
+
+REFRESH_BATCH = 500
+
+LISTING_FIELDS = (
+    'title', 'slug', 'short_description', 'venue', 'event_date', 'start_time', 'end_time',
+    'is_active', 'country_name', 'state_name', 'city_name', 'category_names', 'tag_names',
+    'taxonomy_keys', 'image_url', 'image_variants', 'placeholder', 'refreshed_at',
+)
+
+_pending = threading.local()
+
+
+def taxonomy_key(kind, pk):
+    return f' {kind}{pk} '
+
+
+def _media_url(name):
+    return f'{settings.MEDIA_URL}{name}' if name else ''
+
+
+def _variants(processed):
+    if processed is None:
+        return []
+    return [
+        {'size': size, 'format': fmt, 'url': _media_url(v['name']), 'width': v['width'], 'height': v['height']}
+        for size, formats in processed.variants.items()
+        for fmt, v in formats.items()
+    ]
+
+
+def build_listing(event, processed=None):
+    categories = list(event.category.all())
+    tags       = list(event.tags.all())
+    keys = [taxonomy_key('c', c.pk) for c in categories] + [taxonomy_key('t', t.pk) for t in tags]
+    return EventListing(
+        event_id=event.pk,
+        title=event.title,
+        slug=event.slug,
+        short_description=event.short_description,
+        venue=event.venue,
+        event_date=event.event_date,
+        start_time=event.start_time,
+        end_time=event.end_time,
+        is_active=event.is_active,
+        country_name=event.country.name,
+        state_name=event.state.name,
+        city_name=event.city.name,
+        category_names=[c.name for c in categories],
+        tag_names=[t.name for t in tags],
+        taxonomy_keys=''.join(keys),
+        image_url=_media_url(event.feature_image.name if event.feature_image else ''),
+        image_variants=_variants(processed),
+        placeholder=processed.placeholder if processed is not None else '',
+    )
+
+
+def _refresh_batch(event_ids):
+    events = list(
+        Event.objects
+        .filter(pk__in=event_ids)
+        .select_related('country', 'state', 'city')
+        .prefetch_related('category', 'tags')
+    )
+    images = [e.feature_image.name for e in events if e.feature_image]
+    processed = ProcessedImage.objects.in_bulk(images, field_name='source') if images else {}
+    listings = [
+        build_listing(e, processed.get(e.feature_image.name) if e.feature_image else None)
+        for e in events
+    ]
+    # A stale row may still hold a slug that has since moved to one of these events.
+    stale = EventListing.objects.filter(slug__in=[l.slug for l in listings]).exclude(event_id__in=event_ids)
+    stale_ids = list(stale.values_list('event_id', flat=True))
+    with transaction.atomic():
+        if stale_ids:
+            EventListing.objects.filter(event_id__in=stale_ids).delete()
+        EventListing.objects.bulk_create(
+            listings,
+            update_conflicts=True,
+            unique_fields=['event'],
+            update_fields=list(LISTING_FIELDS),
+        )
+    if stale_ids:
+        _refresh_batch(stale_ids)
+    return len(listings)
+
+
+def refresh_listings(event_ids):
+    """Rebuild the listing rows for ``event_ids`` in a few set-based queries per batch."""
+    event_ids = list(dict.fromkeys(int(i) for i in event_ids))
+    refreshed = 0
+    for start in range(0, len(event_ids), REFRESH_BATCH):
+        refreshed += _refresh_batch(event_ids[start:start + REFRESH_BATCH])
+    if refreshed:
+        # bulk_create sends no post_save, so cached listing responses are invalidated here.
+        response_cache.bump_generation()
+    return refreshed
+
+
+def _flush_pending():
+    ids = getattr(_pending, 'ids', None)
+    _pending.ids = set()
+    if ids:
+        refresh_listings(ids)
+
+
+def schedule_refresh(event_ids):
+    """Queue listing refreshes until the current transaction commits.
+
+    Every call registers a callback, but the first one to run drains the
+    shared set, so an event touched many times is rebuilt once.
+    """
+    event_ids = [i for i in event_ids if i is not None]
+    if not event_ids:
+        return
+    if getattr(_pending, 'ids', None) is None:
+        _pending.ids = set()
+    _pending.ids.update(event_ids)
+    transaction.on_commit(_flush_pending)
@@ -0,0 +1,105 @@
+from collections import defaultdict
+from .models import Event, ProcessedImage
+
+
+class BatchLoader:
+
+    def __init__(self, batch_load_fn, default=None):
+        self.batch_load_fn = batch_load_fn
+        self.default       = default
+        self.pending       = set()
+        self.cache         = {}
+
+    def register(self, keys):
+        self.pending.update(k for k in keys if k is not None and k not in self.cache)
+
+    def prime(self, key, value):
+        self.cache[key] = value
+        self.pending.discard(key)
+
+    def load(self, key):
+        if key is None:
+            return self.default
+        if key not in self.cache:
+            self.pending.add(key)
+            keys = list(self.pending)
+            self.pending.clear()
+            found = self.batch_load_fn(keys)
+            for k in keys:
+                self.cache[k] = found.get(k, self.default)
+        return self.cache[key]
+
+    def clear(self, key=None):
+        if key is None:
+            self.cache.clear()
+            self.pending.clear()
+        else:
+            self.cache.pop(key, None)
+            self.pending.discard(key)
+
+
+def _load_m2m(field_name, target_field):
+    through = Event._meta.get_field(field_name).remote_field.through
+
+    def batch_load(event_ids):
+        grouped = defaultdict(list)
+        rows = (
+            through.objects
+            .filter(event_id__in=event_ids)
+            .select_related(target_field)
+            .order_by(f'{target_field}_id')
+        )
+        for row in rows:
+            grouped[row.event_id].append(getattr(row, target_field))
+        return grouped
+    return batch_load
+
+
+class EventLoaders:
+
+    def __init__(self):
+        self.category     = BatchLoader(_load_m2m('category', 'category'), default=[])
+        self.tags         = BatchLoader(_load_m2m('tags', 'eventtag'), default=[])
+        self._extra_image_rows = _load_m2m('extraImages', 'eventimages')
+        self.extra_images = BatchLoader(self._load_extra_images, default=[])
+        self.processed_images = BatchLoader(
+            lambda names: ProcessedImage.objects.in_bulk(names, field_name='source')
+        )
+
+    def _load_extra_images(self, event_ids):
+        found = self._extra_image_rows(event_ids)
+        self._register_images(image for images in found.values() for image in images)
+        return found
+
+    def _register_images(self, images):
+        self.processed_images.register(image.image.name for image in images if image.image)
+
+    def prime_events(self, events):
+        events = list(events)
+        for event in events:
+            if 'feature_image' not in event.get_deferred_fields() and event.feature_image:
+                self.processed_images.register([event.feature_image.name])
+            prefetched = getattr(event, '_prefetched_objects_cache', {})
+            for name, loader in (('category', self.category), ('tags', self.tags), ('extraImages', self.extra_images)):
+                if name in prefetched:
+                    loader.prime(event.pk, list(prefetched[name]))
+                else:
+                    loader.register([event.pk])
+            if 'extraImages' in prefetched:
+                self._register_images(prefetched['extraImages'])
+        return events
+
+    def forget_event(self, event_id):
+        event_id = int(event_id)
+        self.category.clear(event_id)
+        self.tags.clear(event_id)
+        self.extra_images.clear(event_id)
+
+
+def get_loaders(info):
+    request = info.context
+    loaders = getattr(request, '_event_loaders', None)
+    if loaders is None:
+        loaders = EventLoaders()
+        request._event_loaders = loaders
+    return loaders
@@ -0,0 +1,78 @@
+import os
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from event.models import Event, EventImages, ProcessedImage, StoredBlob
+
+
+SKIP_DIRS = ('uploads',)
+
+
+class Command(BaseCommand):
+    help = 'Delete media files no longer referenced by any event, image or variant, and repair blob refcounts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true')
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help='Leave files younger than this alone; they may belong to uploads in flight.')
+        parser.add_argument('--prune-unlinked-images', action='store_true',
+                            help='Also delete gallery images that are no longer attached to any event.')
+
+    def _references(self):
+        refs = Counter()
+        refs.update(Event.objects.exclude(feature_image='').exclude(feature_image=None).values_list('feature_image', flat=True))
+        refs.update(EventImages.objects.exclude(image='').values_list('image', flat=True))
+        for variants in ProcessedImage.objects.values_list('variants', flat=True).iterator():
+            for formats in variants.values():
+                refs.update(variant['name'] for variant in formats.values())
+        return refs
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        cutoff = time.time() - options['grace_hours'] * 3600
+
+        if options['prune_unlinked_images']:
+            unlinked = EventImages.objects.filter(events__isnull=True)
+            count = unlinked.count()
+            if not dry_run:
+                # post_delete releases each file through the storage backend.
+                for image in unlinked.iterator():
+                    image.delete()
+            self.stdout.write(f'Unlinked gallery images: {count}')
+
+        refs = self._references()
+        root = settings.MEDIA_ROOT
+        removed = freed = 0
+        for dirpath, dirnames, filenames in os.walk(root):
+            if os.path.relpath(dirpath, root) == '.':
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, root).replace(os.sep, '/')
+                if name in refs or os.path.getmtime(path) > cutoff:
+                    continue
+                removed += 1
+                freed += os.path.getsize(path)
+                if dry_run:
+                    self.stdout.write(f'would remove {name}')
+                else:
+                    os.remove(path)
+
+        repaired = 0
+        for blob in StoredBlob.objects.iterator():
+            actual = refs.get(blob.name, 0)
+            if actual == 0 and not default_storage.exists(blob.name):
+                repaired += 1
+                if not dry_run:
+                    blob.delete()
+            elif actual and actual != blob.refcount:
+                repaired += 1
+                if not dry_run:
+                    StoredBlob.objects.filter(pk=blob.pk).update(refcount=actual)
+
+        verb = 'Would remove' if dry_run else 'Removed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {removed} orphaned file(s) ({freed / (1024 * 1024):.1f} MB); {repaired} blob record(s) repaired.'
+        ))
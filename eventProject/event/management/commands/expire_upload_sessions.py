@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from event.chunked_uploads import expire_sessions
+
+
+class Command(BaseCommand):
+    help = 'Delete upload sessions (and their partial files) idle for longer than the configured TTL.'
+
+    def handle(self, *args, **options):
+        expired = expire_sessions()
+        self.stdout.write(self.style.SUCCESS(f'Removed {expired} upload session(s).'))
@@ -0,0 +1,75 @@
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from event.models import Category, EventTag, Country, State, City, Event
+
+
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite':     re.compile(r'SCAN (?:TABLE )?(\w+)\b(?! USING (?:COVERING )?INDEX)'),
+}
+
+
+def _first_pk(model):
+    return model.objects.order_by('pk').values_list('pk', flat=True).first() or 0
+
+
+def resolver_querysets():
+    country_id  = _first_pk(Country)
+    state_id    = _first_pk(State)
+    category_id = _first_pk(Category)
+    tag_id      = _first_pk(EventTag)
+    return {
+        'all_events':              Event.objects.all().order_by('id')[:50],
+        'active_events':           Event.objects.filter(is_active=True)[:50],
+        'events_by_category':      Event.objects.filter(category__id=category_id)[:50],
+        'events_by_tag':           Event.objects.filter(tags__id=tag_id)[:50],
+        'paginated_active_events': Event.objects.filter(is_active=True).order_by('event_date')[:10],
+        'active_events_connection': Event.objects.filter(is_active=True).order_by('event_date', 'id')[:11],
+        'paginated_events':        Event.objects.filter(is_active=True).order_by('id').distinct()[:10],
+        'events_by_category_page': Event.objects.filter(category__id=category_id).order_by('id').distinct()[:10],
+        'event_by_slug':           Event.objects.filter(slug='sample'),
+        'states_by_country':       State.objects.filter(country_id=country_id).order_by('name'),
+        'cities_by_state':         City.objects.filter(state_id=state_id).order_by('name'),
+        'paginated_states':        State.objects.filter(country_id=country_id).order_by('id')[:10],
+        'paginated_cities':        City.objects.filter(state_id=state_id).order_by('id')[:10],
+    }
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on each resolver's queryset and flag sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action='store_true', help='Use EXPLAIN ANALYZE (PostgreSQL only).')
+        parser.add_argument('--disable-seqscan', action='store_true',
+                            help='SET enable_seqscan = off so small tables still show which indexes are usable (PostgreSQL only).')
+        parser.add_argument('--fail-on-seq-scan', action='store_true', help='Exit with an error when any scan is flagged.')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan for every query.')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        pattern = SEQ_SCAN_PATTERNS.get(vendor)
+        if pattern is None:
+            raise CommandError(f'Unsupported database backend: {vendor}')
+
+        flagged = {}
+        with transaction.atomic():
+            if vendor == 'postgresql' and options['disable_seqscan']:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            for name, qs in resolver_querysets().items():
+                explain_options = {'analyze': True} if options['analyze'] and vendor == 'postgresql' else {}
+                plan = qs.explain(**explain_options)
+                scans = sorted(set(pattern.findall(plan)))
+                if scans:
+                    flagged[name] = scans
+                    self.stdout.write(self.style.WARNING(f'{name}: sequential scan on {", ".join(scans)}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'{name}: index only'))
+                if options['verbose_plans'] or scans:
+                    self.stdout.write(plan)
+                    self.stdout.write('')
+            transaction.set_rollback(True)
+
+        if flagged and options['fail_on_seq_scan']:
+            raise CommandError(f'{len(flagged)} queryset(s) use sequential scans.')
@@ -0,0 +1,38 @@
+import sys
+from django.core.management.base import BaseCommand
+from event.exporter import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, filter_events, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Stream every event to a CSV or NDJSON file (or stdout) in constant memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', help='Destination file; defaults to stdout.')
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--search')
+        parser.add_argument('--category-id')
+        parser.add_argument('--tag-id')
+        parser.add_argument('--status', choices=['active', 'inactive'])
+
+    def handle(self, *args, **options):
+        qs = filter_events(
+            search=options['search'],
+            category_id=options['category_id'],
+            tag_id=options['tag_id'],
+            status=options['status'],
+        )
+        chunks = stream_export(qs, options['format'], options['gzip'], options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+
+        written = 0
+        with open(options['output'], 'wb') as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+                written += len(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}."))
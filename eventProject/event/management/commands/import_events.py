@@ -0,0 +1,60 @@
+import json
+import os
+from django.core.management.base import BaseCommand, CommandError
+from event.importer import Checkpoint, ImportRowError, detect_format, run_import
+
+
+class Command(BaseCommand):
+    help = 'Stream events from a CSV or JSONL file into the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--create-missing', action='store_true',
+                            help='Create unknown countries, states, cities, categories and tags.')
+        parser.add_argument('--checkpoint', help='Name under which progress is recorded; defaults to the absolute path.')
+        parser.add_argument('--no-resume', action='store_true', help='Ignore an existing checkpoint.')
+        parser.add_argument('--errors-file', help='Write rejected rows as JSONL to this file.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        checkpoint = Checkpoint(options['checkpoint'] or os.path.abspath(path), path)
+        try:
+            skip = 0 if options['no_resume'] else checkpoint.load()
+        except ImportRowError as e:
+            raise CommandError(f'{e} Use --no-resume to start over.')
+        if skip:
+            self.stdout.write(f'Resuming after row {skip}.')
+
+        errors_fh = open(options['errors_file'], 'a') if options['errors_file'] else None
+
+        def on_batch(row_number, stats):
+            checkpoint.save(row_number, stats.as_dict())
+            self.stdout.write(
+                f'row {row_number}: {stats.created} created, {stats.failed} failed, {stats.rate:.0f} rows/s'
+            )
+
+        def on_error(row_number, message):
+            if errors_fh:
+                errors_fh.write(json.dumps({'row': row_number, 'error': message}) + '\n')
+
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as stream:
+                stats = run_import(
+                    stream, fmt,
+                    batch_size=options['batch_size'],
+                    create_missing=options['create_missing'],
+                    skip=skip,
+                    on_batch=on_batch,
+                    on_error=on_error,
+                )
+        finally:
+            if errors_fh:
+                errors_fh.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {stats.processed} processed, {stats.created} created, {stats.failed} failed '
+            f'({stats.rate:.0f} rows/s).'
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from event.images import process_image
+from event.models import Event, EventImages, ProcessedImage
+
+
+class Command(BaseCommand):
+    help = 'Build resized variants and placeholders for event images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true', help='Skip images that already have variants.')
+
+    def handle(self, *args, **options):
+        names = set(Event.objects.exclude(feature_image='').exclude(feature_image=None).values_list('feature_image', flat=True))
+        names.update(EventImages.objects.exclude(image='').values_list('image', flat=True))
+        if options['missing_only']:
+            names -= set(ProcessedImage.objects.values_list('source', flat=True))
+
+        done = failed = 0
+        for name in sorted(names):
+            try:
+                process_image(name)
+                done += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f'{name}: {e}')
+        self.stdout.write(self.style.SUCCESS(f'Processed {done} image(s), {failed} failed.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from event import response_cache
+from event.nearby import BATCH_SIZE, rebuild_geohashes
+
+
+class Command(BaseCommand):
+    help = 'Recompute the geohash used by nearbyEvents for every event, e.g. after importing coordinates.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        changed = rebuild_geohashes(batch_size=options['batch_size'])
+        if changed:
+            response_cache.bump_generation()
+        self.stdout.write(self.style.SUCCESS(f'Updated the geohash of {changed} event(s).'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from event.models import Event
+from event.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Recompute the full-text search data for every event.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        batch_size = options['batch_size']
+        total = 0
+        batch = []
+        for event_id in Event.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=batch_size):
+            batch.append(event_id)
+            if len(batch) >= batch_size:
+                backend.index(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            backend.index(batch)
+            total += len(batch)
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} event(s) with {type(backend).__name__}.'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from event.listings import REFRESH_BATCH, refresh_listings
+from event.models import Event, EventListing
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized EventListing rows from the normalized event tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REFRESH_BATCH)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+        batch = []
+        for event_id in Event.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=batch_size):
+            batch.append(event_id)
+            if len(batch) >= batch_size:
+                total += refresh_listings(batch)
+                batch = []
+        if batch:
+            total += refresh_listings(batch)
+        self.stdout.write(self.style.SUCCESS(
+            f'Refreshed {total} listing(s); {EventListing.objects.count()} in the table.'
+        ))
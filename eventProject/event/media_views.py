@@ -0,0 +1,154 @@
+import hashlib
+import mimetypes
+import os
+import re
+from functools import lru_cache
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_safe
+from .storage import BLOB_ROOT
+
+
+DEFAULTS = {
+    'OFFLOAD': None,            # None, 'x-sendfile' or 'x-accel-redirect'
+    'ACCEL_PREFIX': '/protected-media/',
+    'MAX_AGE': 3600,
+    'IMMUTABLE_MAX_AGE': 365 * 24 * 60 * 60,
+}
+
+BLOB_NAME  = re.compile(rf'^{BLOB_ROOT}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/([0-9a-f]{{64}})(?:\.\w+)?$')
+RANGE      = re.compile(r'^bytes=(\d*)-(\d*)$')
+READ_BLOCK = 64 * 1024
+
+# In-progress chunked uploads live under MEDIA_ROOT but are not validated media.
+PRIVATE_PREFIXES = ('uploads/partial/',)
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'MEDIA_SERVING', {}))
+    return config
+
+
+@lru_cache(maxsize=4096)
+def _file_digest(path, mtime_ns, size):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(READ_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _etag(name, path, stat):
+    match = BLOB_NAME.match(name)
+    digest = match.group(1) if match else _file_digest(path, stat.st_mtime_ns, stat.st_size)
+    return f'"{digest}"', match is not None
+
+
+def _parse_range(header, size):
+    """Return ``(start, end)`` for a single satisfiable byte range, None to serve the whole file.
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = RANGE.match(header.strip())
+    if match is None:
+        return None     # multiple or malformed ranges: fall back to a full response
+    first, last = match.groups()
+    if first == '' and last == '':
+        return None
+    if first == '':
+        length = int(last)
+        if length == 0:
+            raise ValueError
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError
+    return start, end
+
+
+def _iter_range(path, start, length):
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        while length > 0:
+            block = fh.read(min(READ_BLOCK, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def _offload(config, name, path):
+    response = HttpResponse()
+    if config['OFFLOAD'] == 'x-sendfile':
+        response['X-Sendfile'] = path
+    else:
+        response['X-Accel-Redirect'] = config['ACCEL_PREFIX'].rstrip('/') + '/' + name
+    # Let the front-end server fill in the type for the file it sends.
+    del response['Content-Type']
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    config = get_config()
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except ValueError:
+        raise Http404('Invalid media path.')
+    name = os.path.relpath(full_path, os.path.abspath(settings.MEDIA_ROOT)).replace(os.sep, '/')
+    if name.startswith(PRIVATE_PREFIXES) or not os.path.isfile(full_path):
+        raise Http404('Media file not found.')
+
+    stat = os.stat(full_path)
+    etag, immutable = _etag(name, full_path, stat)
+
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': (
+            f"public, max-age={config['IMMUTABLE_MAX_AGE']}, immutable" if immutable
+            else f"public, max-age={config['MAX_AGE']}"
+        ),
+    }
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and (if_none_match.strip() == '*' or etag in parse_etags(if_none_match)):
+        response = HttpResponseNotModified()
+        for key in ('ETag', 'Cache-Control', 'Last-Modified'):
+            response[key] = headers[key]
+        return response
+
+    if config['OFFLOAD']:
+        response = _offload(config, name, full_path)
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = _parse_range(range_header, stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(_iter_range(full_path, start, length), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        response['Content-Length'] = str(length)
+    for key, value in headers.items():
+        response[key] = value
+    return response
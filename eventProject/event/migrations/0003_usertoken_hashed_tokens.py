@@ -0,0 +1,44 @@
+# Generated by Django 6.0.2 on 2026-10-17 10:12
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_tokens(apps, schema_editor):
+    UserToken = apps.get_model('event', 'UserToken')
+    for row in UserToken.objects.all():
+        row.access_token = hashlib.sha256(row.access_token.encode()).hexdigest()
+        row.refresh_token = hashlib.sha256(row.refresh_token.encode()).hexdigest()
+        row.save(update_fields=['access_token', 'refresh_token'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0002_alter_event_slug'),
+    ]
+
+    operations = [
+        migrations.RunPython(hash_existing_tokens, migrations.RunPython.noop),
+        migrations.RenameField(
+            model_name='usertoken',
+            old_name='access_token',
+            new_name='access_token_hash',
+        ),
+        migrations.RenameField(
+            model_name='usertoken',
+            old_name='refresh_token',
+            new_name='refresh_token_hash',
+        ),
+        migrations.AlterField(
+            model_name='usertoken',
+            name='access_token_hash',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='usertoken',
+            name='refresh_token_hash',
+            field=models.CharField(db_index=True, max_length=64),
+        ),
+    ]
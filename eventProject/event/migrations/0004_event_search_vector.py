@@ -0,0 +1,59 @@
+# Generated by Django 6.0.2 on 2026-10-17 11:40
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+BACKFILL = """
+UPDATE event_event e SET search_vector =
+    setweight(to_tsvector('english', coalesce(e.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce((
+        SELECT string_agg(c.name, ' ') FROM event_event_category ec
+        JOIN event_category c ON c.id = ec.category_id WHERE ec.event_id = e.id
+    ), '')), 'B') ||
+    setweight(to_tsvector('english', coalesce((
+        SELECT string_agg(t.name, ' ') FROM event_event_tags et
+        JOIN event_eventtag t ON t.id = et.eventtag_id WHERE et.event_id = e.id
+    ), '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(e.short_description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(e.venue, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(e.long_description, '')), 'D')
+"""
+
+
+def backfill_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(BACKFILL)
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    """AddIndex that only touches the database on PostgreSQL; GIN has no equivalent elsewhere."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0003_usertoken_hashed_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        AddPostgresIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_event_search_vector_gin'),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
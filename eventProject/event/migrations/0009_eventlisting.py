@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-17 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0008_storedblob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventListing',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='event.event')),
+                ('title', models.CharField(max_length=100)),
+                ('slug', models.SlugField(unique=True)),
+                ('short_description', models.CharField(max_length=255)),
+                ('venue', models.CharField(max_length=200)),
+                ('event_date', models.DateField()),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('country_name', models.CharField(max_length=100)),
+                ('state_name', models.CharField(max_length=100)),
+                ('city_name', models.CharField(max_length=100)),
+                ('category_names', models.JSONField(default=list)),
+                ('tag_names', models.JSONField(default=list)),
+                ('taxonomy_keys', models.TextField(blank=True)),
+                ('image_url', models.CharField(blank=True, max_length=255)),
+                ('image_variants', models.JSONField(default=list)),
+                ('placeholder', models.TextField(blank=True)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('is_active', True)), fields=['event_date', 'event'], name='listing_active_date_idx')],
+            },
+        ),
+    ]
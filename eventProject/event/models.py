@@ -1,12 +1,27 @@
-from django.db import models
+import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import User
 from django.utils.text import slugify
+from .slugs import SLUG_RETRIES, is_slug_conflict, reserve_event_slugs
+
+
+def _parent(instance, field_name):
+    # Read the parent from the geo cache unless it is already loaded, so __str__ never queries.
+    from .geo import geo_cache
+
+    field = instance._meta.get_field(field_name)
+    if field.is_cached(instance):
+        return getattr(instance, field_name)
+    cached = getattr(geo_cache, field_name)(getattr(instance, field.attname))
+    return cached if cached is not None else getattr(instance, field_name)
 
 
 class UserToken(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='active_token')
-    access_token = models.TextField()
-    refresh_token = models.TextField()
+    access_token_hash = models.CharField(max_length=64, unique=True)
+    refresh_token_hash = models.CharField(max_length=64, db_index=True)
     created_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
@@ -54,6 +69,31 @@ class EventImages(models.Model):
         return f"Event Image - {self.id}"
 
 
+class ProcessedImage(models.Model):
+    source = models.CharField(max_length=255, unique=True)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    placeholder = models.TextField(blank=True)
+    variants = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.source
+
+
+class StoredBlob(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64)
+    size = models.BigIntegerField()
+    refcount = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
+
+
 class Country(models.Model):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(unique=True, blank=True)
@@ -83,6 +123,9 @@ class State(models.Model):
     class Meta:
         unique_together = ['name', 'country']
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['country', 'name'], name='state_country_name_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -90,13 +133,15 @@ class State(models.Model):
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.name}, {self.country.name}"
+        return f"{self.name}, {_parent(self, 'country').name}"
 
 
 class City(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(blank=True)
     state = models.ForeignKey(State, on_delete=models.CASCADE, related_name='cities')
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -104,6 +149,9 @@ class City(models.Model):
         verbose_name_plural = "Cities"
         unique_together = ['name', 'state']
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['state', 'name'], name='city_state_name_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -111,7 +159,7 @@ class City(models.Model):
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.name}, {self.state.name}"
+        return f"{self.name}, {_parent(self, 'state').name}"
 
 
 class Event(models.Model):
@@ -125,6 +173,9 @@ class Event(models.Model):
     state = models.ForeignKey(State, on_delete=models.PROTECT, related_name='events')
     city = models.ForeignKey(City, on_delete=models.PROTECT, related_name='events')
     venue = models.CharField(max_length=200)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, editable=False)
     event_date = models.DateField()
     start_time = models.TimeField()
     end_time = models.TimeField()
@@ -132,19 +183,119 @@ class Event(models.Model):
     short_description = models.CharField(max_length=255)
     long_description = models.TextField()
     views_count = models.IntegerField(default=0)
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['event_date', 'id'], name='event_active_date_idx', condition=models.Q(is_active=True)),
+            models.Index(fields=['is_active', 'id'], name='event_status_id_idx'),
+            models.Index(fields=['geohash', 'event_date'], name='event_geohash_date_idx', condition=models.Q(is_active=True)),
+            # Created on PostgreSQL only; see migration 0004.
+            GinIndex(fields=['search_vector'], name='event_event_search_vector_gin'),
+        ]
+
+    LOCATION_FIELDS = ('latitude', 'longitude', 'city_id')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_location = instance._location()
+        return instance
+
+    def _location(self):
+        # Deferred fields are absent from __dict__ and count as unchanged.
+        return tuple(self.__dict__.get(f) for f in self.LOCATION_FIELDS)
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 2
-            while Event.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        from .nearby import event_geohash
+
+        if self._location() != getattr(self, '_saved_location', None):
+            # Only a venue or city change needs the geohash (and maybe a City query) again;
+            # moving a city re-points its events through rehash_city_events().
+            self.geohash = event_geohash(self.latitude, self.longitude, self.city_id)
+            self._saved_location = self._location()
+        if self.slug:
+            return super().save(*args, **kwargs)
+        for attempt in range(SLUG_RETRIES):
+            self.slug = reserve_event_slugs([self.title], exclude_pks=[self.pk] if self.pk else ())[0]
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError as e:
+                # Another writer took the same slug between reserving and saving.
+                if attempt == SLUG_RETRIES - 1 or not is_slug_conflict(e):
+                    self.slug = ''
+                    raise
+
+    def __str__(self):
+        return self.title
+
+
+class UploadSession(models.Model):
+    KIND_FEATURE = 'feature'
+    KIND_EXTRA = 'extra'
+    KINDS = (KIND_FEATURE, KIND_EXTRA)
+
+    STATUS_ACTIVE = 'active'
+    STATUS_COMPLETE = 'complete'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='upload_sessions')
+    kind = models.CharField(max_length=10)
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    checksum = models.CharField(max_length=64)
+    offset = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=10, default=STATUS_ACTIVE)
+    result_name = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.offset}/{self.size})"
+
+
+class EventListing(models.Model):
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='listing')
+    title = models.CharField(max_length=100)
+    slug = models.SlugField(unique=True)
+    short_description = models.CharField(max_length=255)
+    venue = models.CharField(max_length=200)
+    event_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    is_active = models.BooleanField(default=True)
+    country_name = models.CharField(max_length=100)
+    state_name = models.CharField(max_length=100)
+    city_name = models.CharField(max_length=100)
+    category_names = models.JSONField(default=list)
+    tag_names = models.JSONField(default=list)
+    taxonomy_keys = models.TextField(blank=True)
+    image_url = models.CharField(max_length=255, blank=True)
+    image_variants = models.JSONField(default=list)
+    placeholder = models.TextField(blank=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['event_date', 'event'], name='listing_active_date_idx', condition=models.Q(is_active=True)),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class ImportCheckpoint(models.Model):
+    key = models.CharField(max_length=1024, unique=True)
+    source = models.CharField(max_length=1024)
+    size = models.BigIntegerField()
+    mtime = models.FloatField()
+    rows_done = models.PositiveIntegerField(default=0)
+    stats = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Import of {self.source} at row {self.rows_done}"
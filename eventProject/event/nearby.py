@@ -0,0 +1,150 @@
+import heapq
+from django.db.models import Q
+from .geohash import BASE32, covering_cells, encode, haversine_km
+from .models import City, Event
+
+
+GEOHASH_PRECISION = 9       # ~5 m cells; queries only ever use a prefix of it
+MAX_RADIUS_KM     = 500
+MAX_CELLS         = 32
+BATCH_SIZE        = 2000
+
+
+class NearbyHit:
+
+    def __init__(self, event_id, distance_km):
+        self.event_id    = event_id
+        self.distance_km = distance_km
+
+
+def city_points(city_ids):
+    ids = {i for i in city_ids if i is not None}
+    if not ids:
+        return {}
+    return {
+        pk: (latitude, longitude)
+        for pk, latitude, longitude in City.objects.filter(pk__in=ids).values_list('id', 'latitude', 'longitude')
+    }
+
+
+def event_geohash(latitude, longitude, city_id, points=None):
+    """Geohash of an event's venue, falling back to its city's coordinates."""
+    if latitude is None or longitude is None:
+        if points is None:
+            points = city_points([city_id])
+        latitude, longitude = points.get(city_id, (None, None))
+    if latitude is None or longitude is None:
+        return ''
+    return encode(latitude, longitude, GEOHASH_PRECISION)
+
+
+def assign_geohashes(events):
+    """Set ``geohash`` on unsaved/bulk-updated events with one city query for the lot."""
+    points = city_points(e.city_id for e in events if e.latitude is None or e.longitude is None)
+    for event in events:
+        event.geohash = event_geohash(event.latitude, event.longitude, event.city_id, points)
+
+
+def rehash_city_events(city):
+    """Re-point events that inherit their location from ``city``; one UPDATE, no-op rows skipped."""
+    geohash = event_geohash(city.latitude, city.longitude, None)
+    return (
+        Event.objects
+        .filter(city_id=city.pk)
+        .filter(Q(latitude__isnull=True) | Q(longitude__isnull=True))
+        .exclude(geohash=geohash)
+        .update(geohash=geohash)
+    )
+
+
+def _prefix_upper_bound(prefix):
+    # Smallest string greater than every string starting with ``prefix``.
+    chars = list(prefix)
+    while chars:
+        index = BASE32.index(chars[-1])
+        if index + 1 < len(BASE32):
+            chars[-1] = BASE32[index + 1]
+            return ''.join(chars)
+        chars.pop()
+    return None
+
+
+def _cells_filter(cells):
+    # Half-open ranges rather than LIKE 'abc%': a plain btree serves them on every backend.
+    condition = Q()
+    for cell in cells:
+        if not cell:
+            return Q(geohash__gt='')
+        upper = _prefix_upper_bound(cell)
+        condition |= Q(geohash__gte=cell, geohash__lt=upper) if upper else Q(geohash__gte=cell)
+    return condition
+
+
+def validate_point(latitude=None, longitude=None):
+    if (latitude is None) != (longitude is None):
+        raise ValueError('Latitude and longitude must be given together.')
+    if latitude is not None and not -90 <= latitude <= 90:
+        raise ValueError('Latitude must be between -90 and 90.')
+    if longitude is not None and not -180 <= longitude <= 180:
+        raise ValueError('Longitude must be between -180 and 180.')
+
+
+def validate_query(latitude, longitude, radius_km):
+    validate_point(latitude, longitude)
+    if not 0 < radius_km <= MAX_RADIUS_KM:
+        raise ValueError(f'Radius must be greater than 0 and at most {MAX_RADIUS_KM} km.')
+
+
+def nearby_events(latitude, longitude, radius_km, date_from=None, date_to=None, limit=20):
+    """Return the ``limit`` closest active events within ``radius_km`` as NearbyHits.
+
+    The geohash cells covering the circle narrow the scan to a few index
+    ranges; the exact haversine distance then drops the corners.
+    """
+    validate_query(latitude, longitude, radius_km)
+    qs = Event.objects.filter(_cells_filter(covering_cells(latitude, longitude, radius_km, MAX_CELLS)), is_active=True)
+    if date_from:
+        qs = qs.filter(event_date__gte=date_from)
+    if date_to:
+        qs = qs.filter(event_date__lte=date_to)
+
+    rows = list(qs.values_list('id', 'latitude', 'longitude', 'city_id', 'event_date'))
+    # City fallbacks come from the same database state the geohashes were written from.
+    points = city_points(city_id for _, lat, lng, city_id, _ in rows if lat is None or lng is None)
+    hits = []
+    for pk, lat, lng, city_id, event_date in rows:
+        if lat is None or lng is None:
+            lat, lng = points.get(city_id, (None, None))
+            if lat is None or lng is None:
+                continue
+        distance = haversine_km(latitude, longitude, lat, lng)
+        if distance <= radius_km:
+            hits.append((distance, event_date, pk))
+    return [NearbyHit(pk, round(distance, 3)) for distance, _, pk in heapq.nsmallest(limit, hits)]
+
+
+def rebuild_geohashes(batch_size=BATCH_SIZE):
+    """Recompute every event's geohash; returns the number of rows changed."""
+    changed = 0
+    for city in City.objects.only('id', 'latitude', 'longitude').iterator(chunk_size=batch_size):
+        changed += rehash_city_events(city)
+
+    pending = []
+    rows = (
+        Event.objects
+        .filter(latitude__isnull=False, longitude__isnull=False)
+        .values_list('id', 'latitude', 'longitude', 'geohash')
+        .iterator(chunk_size=batch_size)
+    )
+    for pk, latitude, longitude, current in rows:
+        geohash = encode(latitude, longitude, GEOHASH_PRECISION)
+        if geohash != current:
+            pending.append(Event(id=pk, geohash=geohash))
+        if len(pending) >= batch_size:
+            Event.objects.bulk_update(pending, ['geohash'])
+            changed += len(pending)
+            pending = []
+    if pending:
+        Event.objects.bulk_update(pending, ['geohash'])
+        changed += len(pending)
+    return changed
@@ -0,0 +1,72 @@
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
+from graphene.utils.str_converters import to_snake_case
+
+
+EVENT_COLUMNS = frozenset((
+    'id', 'title', 'slug', 'feature_image', 'venue',
+    'latitude', 'longitude',
+    'event_date', 'start_time', 'end_time', 'is_active',
+    'short_description', 'long_description',
+    'views_count', 'created_at', 'updated_at',
+))
+
+EVENT_PREFETCH_RELATED = {
+    'category':     'category',
+    'tags':         'tags',
+    'extra_images': 'extraImages',
+}
+
+# Location resolvers read the raw FK ids from the geo cache, so they are never deferred.
+EVENT_KEY_COLUMNS = ('id', 'country', 'state', 'city')
+
+# Computed fields and the columns their resolvers read.
+EVENT_FIELD_COLUMNS = {
+    'variants':    ('feature_image',),
+    'placeholder': ('feature_image',),
+}
+
+
+def _collect_fields(selection_set, fragments, into):
+    if selection_set is None:
+        return into
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            name = selection.name.value
+            if name.startswith('__'):
+                continue
+            into.setdefault(to_snake_case(name), []).append(selection)
+        elif isinstance(selection, InlineFragmentNode):
+            _collect_fields(selection.selection_set, fragments, into)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = fragments.get(selection.name.value)
+            if fragment is not None:
+                _collect_fields(fragment.selection_set, fragments, into)
+    return into
+
+
+def selected_fields(info, path=()):
+    fields = {}
+    for node in info.field_nodes:
+        _collect_fields(node.selection_set, info.fragments, fields)
+    for key in path:
+        nested = {}
+        for node in fields.get(key, []):
+            _collect_fields(node.selection_set, info.fragments, nested)
+        fields = nested
+    return set(fields)
+
+
+def optimize_event_queryset(qs, info, path=(), keep=()):
+    fields = selected_fields(info, path)
+    if not fields:
+        return qs
+
+    columns = set(EVENT_KEY_COLUMNS) | set(keep) | (fields & EVENT_COLUMNS)
+    columns.update(c for name in fields for c in EVENT_FIELD_COLUMNS.get(name, ()))
+
+    prefetch = [attr for name, attr in EVENT_PREFETCH_RELATED.items() if name in fields]
+
+    if prefetch:
+        qs = qs.prefetch_related(*prefetch)
+    return qs.only(*columns)
+
@@ -0,0 +1,62 @@
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE     = 100
+
+
+def encode_cursor(values):
+    raw = json.dumps([str(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        raise Exception("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != size:
+        raise Exception("Invalid cursor.")
+    return values
+
+
+def _cursor_values(model, keys, values):
+    # Cursors come back from clients; a well-formed one can still hold values its keys reject.
+    try:
+        return [model._meta.get_field(key).to_python(value) for key, value in zip(keys, values)]
+    except (ValidationError, ValueError, TypeError):
+        raise Exception("Invalid cursor.")
+
+
+def page_size(first):
+    if first is None:
+        return DEFAULT_PAGE_SIZE
+    if first < 0:
+        raise Exception("first must not be negative.")
+    return min(first, MAX_PAGE_SIZE)
+
+
+def _after_filter(keys, values):
+    condition = Q()
+    for i, key in enumerate(keys):
+        step = Q(**{f'{key}__gt': values[i]})
+        for prev_key, prev_value in zip(keys[:i], values[:i]):
+            step &= Q(**{prev_key: prev_value})
+        condition |= step
+    return condition
+
+
+def keyset_page(qs, keys, first=None, after=None):
+    first = page_size(first)
+    qs = qs.order_by(*keys)
+    if after:
+        qs = qs.filter(_after_filter(keys, _cursor_values(qs.model, keys, decode_cursor(after, len(keys)))))
+    rows = list(qs[:first + 1])
+    has_next = len(rows) > first
+    rows = rows[:first]
+    edges = [(row, encode_cursor([getattr(row, k) for k in keys])) for row in rows]
+    return edges, has_next
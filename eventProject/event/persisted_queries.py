@@ -0,0 +1,81 @@
+import hashlib
+import json
+from functools import lru_cache
+from django.conf import settings
+from django.core.cache import caches
+
+
+class PersistedQueryError(Exception):
+
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.code = code
+
+
+def _config():
+    return getattr(settings, 'GRAPHQL_PERSISTED_QUERIES', {})
+
+
+def query_hash(query):
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _manifest():
+    path = _config().get('MANIFEST')
+    if not path:
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def _cache():
+    return caches[_config().get('CACHE_ALIAS', 'default')]
+
+
+def get_query(sha256_hash):
+    query = _manifest().get(sha256_hash)
+    if query is None:
+        query = _cache().get(f'graphql:persisted:{sha256_hash}')
+    return query
+
+
+def register_query(sha256_hash, query):
+    if query_hash(query) != sha256_hash:
+        raise PersistedQueryError('provided sha does not match query', 'INVALID_PERSISTED_QUERY_HASH')
+    if sha256_hash in _manifest():
+        return
+    if not _config().get('ALLOW_REGISTRATION', True):
+        raise PersistedQueryError('PersistedQueryNotSupported', 'PERSISTED_QUERY_NOT_SUPPORTED')
+    _cache().set(f'graphql:persisted:{sha256_hash}', query, timeout=None)
+
+
+def _extensions(request, data):
+    extensions = data.get('extensions') or request.GET.get('extensions')
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+    return extensions if isinstance(extensions, dict) else None
+
+
+def resolve(request, data):
+    extensions = _extensions(request, data)
+    persisted = extensions.get('persistedQuery') if extensions else None
+    if not persisted:
+        return None
+    if persisted.get('version') != 1:
+        raise PersistedQueryError('Unsupported persisted query version.', 'PERSISTED_QUERY_NOT_SUPPORTED')
+    sha256_hash = persisted.get('sha256Hash')
+    if not isinstance(sha256_hash, str):
+        raise PersistedQueryError('Missing sha256Hash.', 'PERSISTED_QUERY_NOT_FOUND')
+
+    query = request.GET.get('query') or data.get('query')
+    if query:
+        register_query(sha256_hash, query)
+    else:
+        query = get_query(sha256_hash)
+        if query is None:
+            raise PersistedQueryError('PersistedQueryNotFound', 'PERSISTED_QUERY_NOT_FOUND')
+    return sha256_hash, query
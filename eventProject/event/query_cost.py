@@ -0,0 +1,125 @@
+from django.conf import settings
+from graphql import GraphQLError, GraphQLInt, OperationType, get_operation_ast, value_from_ast
+from graphql.language import FieldNode, FragmentDefinitionNode, FragmentSpreadNode, InlineFragmentNode
+from graphql.type import get_named_type, get_nullable_type, is_list_type, is_leaf_type
+
+
+DEFAULTS = {
+    'ENABLED': True,
+    'MAX_COST': 5000,
+    'MAX_DEPTH': 8,
+    'OBJECT_COST': 1,
+    'SCALAR_COST': 0,
+    'DEFAULT_LIST_SIZE': 100,
+    'PAGINATION_ARGUMENTS': ('pageSize', 'first'),
+    'DEFAULT_PAGE_SIZE': 10,
+    'FIELD_COSTS': {},
+    'LIST_SIZES': {},
+}
+
+
+class QueryCostError(GraphQLError):
+    pass
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'GRAPHQL_QUERY_COST', {}))
+    return config
+
+
+class CostAnalyzer:
+
+    def __init__(self, schema, document, variables=None, config=None):
+        self.schema    = schema
+        self.variables = variables or {}
+        self.config    = config or get_config()
+        self.fragments = {
+            d.name.value: d for d in document.definitions
+            if isinstance(d, FragmentDefinitionNode)
+        }
+        self.max_depth = 0
+
+    def analyze(self, operation):
+        root = {
+            OperationType.QUERY: self.schema.query_type,
+            OperationType.MUTATION: self.schema.mutation_type,
+            OperationType.SUBSCRIPTION: self.schema.subscription_type,
+        }[operation.operation]
+        return self._selection_cost(root, operation.selection_set, depth=1, page_size=None)
+
+    def _page_size(self, field_def, node):
+        for arg in node.arguments or ():
+            if arg.name.value in self.config['PAGINATION_ARGUMENTS']:
+                value = value_from_ast(arg.value, GraphQLInt, self.variables)
+                if isinstance(value, int) and value > 0:
+                    return value
+                return None
+        for name in self.config['PAGINATION_ARGUMENTS']:
+            if name in field_def.args:
+                return self.config['DEFAULT_PAGE_SIZE']
+        return None
+
+    def _selection_cost(self, parent_type, selection_set, depth, page_size):
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost += self._field_cost(parent_type, selection, depth, page_size)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition is not None:
+                    fragment_type = self.schema.get_type(selection.type_condition.name.value) or parent_type
+                cost += self._selection_cost(fragment_type, selection.selection_set, depth, page_size)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments.get(selection.name.value)
+                if fragment is not None:
+                    fragment_type = self.schema.get_type(fragment.type_condition.name.value) or parent_type
+                    cost += self._selection_cost(fragment_type, fragment.selection_set, depth, page_size)
+        return cost
+
+    def _field_cost(self, parent_type, node, depth, page_size):
+        name = node.name.value
+        if name.startswith('__'):
+            return 0
+        field_def = getattr(parent_type, 'fields', {}).get(name)
+        if field_def is None:
+            return 0
+
+        self.max_depth = max(self.max_depth, depth)
+        key = f'{parent_type.name}.{name}'
+        named_type = get_named_type(field_def.type)
+        default_cost = self.config['SCALAR_COST'] if is_leaf_type(named_type) else self.config['OBJECT_COST']
+        cost = self.config['FIELD_COSTS'].get(key, default_cost)
+
+        multiplier = 1
+        if is_list_type(get_nullable_type(field_def.type)):
+            multiplier = page_size or self.config['LIST_SIZES'].get(key, self.config['DEFAULT_LIST_SIZE'])
+            page_size = None
+        own_page_size = self._page_size(field_def, node)
+        if own_page_size is not None:
+            page_size = own_page_size
+
+        if node.selection_set is not None:
+            cost += self._selection_cost(named_type, node.selection_set, depth + 1, page_size)
+        return cost * multiplier
+
+
+def check_query_cost(schema, document, operation_name, variables):
+    config = get_config()
+    if not config['ENABLED']:
+        return None
+    operation = get_operation_ast(document, operation_name)
+    if operation is None:
+        return None
+
+    analyzer = CostAnalyzer(schema, document, variables, config)
+    cost = analyzer.analyze(operation)
+    if analyzer.max_depth > config['MAX_DEPTH']:
+        raise QueryCostError(
+            f"Query depth {analyzer.max_depth} exceeds the maximum allowed depth of {config['MAX_DEPTH']}."
+        )
+    if cost > config['MAX_COST']:
+        raise QueryCostError(
+            f"Query cost {cost} exceeds the maximum allowed cost of {config['MAX_COST']}."
+        )
+    return {'cost': cost, 'max_cost': config['MAX_COST'], 'depth': analyzer.max_depth}
@@ -0,0 +1,110 @@
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import caches
+from graphql import OperationType, print_ast
+from graphql.language import FieldNode, OperationDefinitionNode
+from graphene.utils.str_converters import to_snake_case
+from .auth import AuthenticationError, authenticate_request
+from .documents import get_document
+
+
+CACHEABLE_FIELDS = frozenset((
+    'all_categories', 'all_event_tags', 'all_countries', 'all_states', 'all_cities',
+    'all_events', 'active_events', 'events_by_category', 'events_by_tag',
+    'event_by_id', 'event_by_slug',
+    'paginated_active_events', 'active_events_connection',
+    'listings', 'listing_by_slug', 'nearby_events',
+))
+
+GENERATION_KEY = 'graphql:generation'
+
+
+def _config():
+    return getattr(settings, 'GRAPHQL_RESPONSE_CACHE', {})
+
+
+def is_enabled():
+    return _config().get('ENABLED', True)
+
+
+def get_cache():
+    return caches[_config().get('CACHE_ALIAS', 'default')]
+
+
+def current_generation():
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def bump_generation():
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 2, timeout=None)
+
+
+def _selected_operation(document, operation_name):
+    operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+    if operation_name:
+        operations = [op for op in operations if op.name and op.name.value == operation_name]
+    return operations[0] if len(operations) == 1 else None
+
+
+def normalized_query(schema, query, operation_name=None, key=None):
+    document, errors = get_document(schema, query, key)
+    if errors:
+        return None
+    operation = _selected_operation(document, operation_name)
+    if operation is None or operation.operation != OperationType.QUERY:
+        return None
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, FieldNode):
+            return None
+        if to_snake_case(selection.name.value) not in CACHEABLE_FIELDS:
+            return None
+    return print_ast(document)
+
+
+def auth_scope(request):
+    if not request.META.get('HTTP_AUTHORIZATION'):
+        return 'anonymous'
+    try:
+        user, _ = authenticate_request(request)
+    except AuthenticationError:
+        return None
+    return f'user:{user.pk}'
+
+
+def cache_key(request, schema, query, variables, operation_name):
+    if not query:
+        return None
+    normalized = normalized_query(schema, query, operation_name, getattr(request, '_persisted_query_hash', None))
+    if normalized is None:
+        return None
+    scope = auth_scope(request)
+    if scope is None:
+        return None
+    raw = json.dumps(
+        [normalized, variables or {}, operation_name or '', scope],
+        sort_keys=True, separators=(',', ':'), default=str,
+    )
+    digest = hashlib.sha256(raw.encode()).hexdigest()
+    return f'graphql:response:{current_generation()}:{digest}'
+
+
+def lookup(key):
+    return get_cache().get(key)
+
+
+def store(key, body, recorded_views):
+    get_cache().set(
+        key,
+        {'body': body, 'views': list(recorded_views)},
+        timeout=_config().get('TIMEOUT', 60),
+    )
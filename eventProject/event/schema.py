@@ -3,6 +3,7 @@ import graphql_jwt
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
+from django.db.models import Q
 from django.utils.text import slugify
 from graphene_django import DjangoObjectType
 from graphql_jwt.shortcuts import get_token
@@ -10,40 +11,28 @@ from graphql_jwt.refresh_token.shortcuts import create_refresh_token
 from graphql_jwt.refresh_token.models import RefreshToken
 from graphql_jwt.utils import get_payload, get_user_by_payload
 from graphql_jwt.exceptions import JSONWebTokenError
-from .models import Category, EventTag, Country, State, City, Event, UserToken, EventImages
+from .models import Category, EventTag, Country, State, City, Event, UserToken, EventImages, EventListing
+from . import bulk
+from .autocomplete import LOADERS as AUTOCOMPLETE_KINDS, registry as autocomplete_registry
+from .auth import AuthenticationError, authenticate_request, invalidate_user_token, token_digest
+from .counters import record_view
+from .geo import geo_cache
+from .listings import taxonomy_key
+from .loaders import get_loaders
+from .nearby import nearby_events, validate_point
+from .optimizer import optimize_event_queryset
+from .pagination import MAX_PAGE_SIZE, keyset_page
+from .search import get_search_backend
 
 
 def admin_required(info):
-
-    request = info.context
-    # print('Request:', request.META)
-    auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-    # print("auth: ", auth_header)
-    if not auth_header.startswith('JWT '):
-        raise Exception(
-            "Authentication required. "
-            "Please provide a valid JWT token in the Authorization header."
-        )
-    token = auth_header[4:]
     try:
-        payload = get_payload(token, request)
-        user    = get_user_by_payload(payload)
-        # print(payload)
-        # print("----------------------------------------------")
-        # print(user)
-    except JSONWebTokenError as e:
-        raise Exception(f"Invalid or expired token: {e}")
-    if not user or not user.is_active:
-        raise Exception("User not found or inactive.")
-
-    try:
-        stored = UserToken.objects.get(user=user)
-    except UserToken.DoesNotExist:
-        raise Exception("No active session found. Please log in.")
-    if stored.access_token != token:
-        raise Exception("Token has been invalidated. Please log in again.")
+        user, _ = authenticate_request(info.context)
+    except AuthenticationError as e:
+        raise Exception(str(e))
     if not (user.is_staff or user.is_superuser):
         raise Exception("Admin access required. Only admins can perform this action.")
+    return user
 
 # Types 
 
@@ -76,15 +65,53 @@ class StateType(DjangoObjectType):
         model = State
         fields = ('id', 'name', 'slug', 'country', 'created_at', 'updated_at')
 
+    def resolve_country(self, info):
+        return geo_cache.country(self.country_id) or self.country
+
 
 class CityType(DjangoObjectType):
     class Meta:
         model = City
-        fields = ('id', 'name', 'slug', 'state', 'created_at', 'updated_at')
+        fields = ('id', 'name', 'slug', 'state', 'latitude', 'longitude', 'created_at', 'updated_at')
+
+    def resolve_state(self, info):
+        return geo_cache.state(self.state_id) or self.state
+
+
+class ImageVariantType(graphene.ObjectType):
+    size   = graphene.String()
+    format = graphene.String()
+    url    = graphene.String()
+    width  = graphene.Int()
+    height = graphene.Int()
+
+
+def resolve_image_variants(info, name, size=None):
+    processed = get_loaders(info).processed_images.load(name or None)
+    if processed is None:
+        return []
+    request = info.context
+    return [
+        ImageVariantType(
+            size=variant_size, format=fmt,
+            url=request.build_absolute_uri(f"/media/{variant['name']}"),
+            width=variant['width'], height=variant['height'],
+        )
+        for variant_size, formats in processed.variants.items()
+        if size is None or variant_size == size
+        for fmt, variant in formats.items()
+    ]
+
+
+def resolve_image_placeholder(info, name):
+    processed = get_loaders(info).processed_images.load(name or None)
+    return processed.placeholder if processed is not None else None
 
 
 class EventImagesType(DjangoObjectType):
-    image = graphene.String()
+    image       = graphene.String()
+    variants    = graphene.List(ImageVariantType, size=graphene.String())
+    placeholder = graphene.String()
 
     class Meta:
         model = EventImages
@@ -96,17 +123,25 @@ class EventImagesType(DjangoObjectType):
         request = info.context
         return request.build_absolute_uri(f'/media/{self.image.name}')
 
+    def resolve_variants(self, info, size=None):
+        return resolve_image_variants(info, self.image.name, size)
+
+    def resolve_placeholder(self, info):
+        return resolve_image_placeholder(info, self.image.name)
+
 
 class EventType(DjangoObjectType):
     feature_image = graphene.String()
     extra_images  = graphene.List(EventImagesType)
+    variants      = graphene.List(ImageVariantType, size=graphene.String())
+    placeholder   = graphene.String()
 
     class Meta:
         model = Event
         fields = (
             'id', 'title', 'slug',
             'category', 'tags',
-            'country', 'state', 'city', 'venue',
+            'country', 'state', 'city', 'venue', 'latitude', 'longitude',
             'event_date', 'start_time', 'end_time',
             'is_active', 'short_description', 'long_description',
             'views_count', 'created_at', 'updated_at',
@@ -118,8 +153,29 @@ class EventType(DjangoObjectType):
         request = info.context
         return request.build_absolute_uri(f'/media/{self.feature_image.name}')
 
+    def resolve_variants(self, info, size=None):
+        return resolve_image_variants(info, self.feature_image.name, size)
+
+    def resolve_placeholder(self, info):
+        return resolve_image_placeholder(info, self.feature_image.name)
+
     def resolve_extra_images(self, info):
-        return self.extraImages.all()
+        return get_loaders(info).extra_images.load(self.pk)
+
+    def resolve_category(self, info):
+        return get_loaders(info).category.load(self.pk)
+
+    def resolve_tags(self, info):
+        return get_loaders(info).tags.load(self.pk)
+
+    def resolve_country(self, info):
+        return geo_cache.country(self.country_id) or self.country
+
+    def resolve_state(self, info):
+        return geo_cache.state(self.state_id) or self.state
+
+    def resolve_city(self, info):
+        return geo_cache.city(self.city_id) or self.city
 
 
 # Auth Mutations 
@@ -176,8 +232,12 @@ class LoginMutation(graphene.Mutation):
 
         UserToken.objects.update_or_create(
             user=user,
-            defaults={'access_token': access_token, 'refresh_token': str(refresh.token)}
+            defaults={
+                'access_token_hash': token_digest(access_token),
+                'refresh_token_hash': token_digest(str(refresh.token)),
+            }
         )
+        invalidate_user_token(user.pk)
         return LoginMutation(success=True, message='Login successful.',
                              user=user, access_token=access_token, refresh_token=str(refresh.token))
 
@@ -207,8 +267,12 @@ class RefreshAccessTokenMutation(graphene.Mutation):
 
         UserToken.objects.update_or_create(
             user=user,
-            defaults={'access_token': new_access_token, 'refresh_token': refresh_token}
+            defaults={
+                'access_token_hash': token_digest(new_access_token),
+                'refresh_token_hash': token_digest(refresh_token),
+            }
         )
+        invalidate_user_token(user.pk)
         return RefreshAccessTokenMutation(success=True,
                                          message='Access token refreshed successfully.',
                                          access_token=new_access_token)
@@ -417,9 +481,8 @@ class CreateStateMutation(graphene.Mutation):
 
     def mutate(self, info, name, country_id):
         admin_required(info)
-        try:
-            country = Country.objects.get(pk=country_id)
-        except Country.DoesNotExist:
+        country = geo_cache.verified('country', country_id)
+        if country is None:
             return CreateStateMutation(success=False, message='Country not found.', state=None)
         state = State.objects.create(name=name, country=country)
         return CreateStateMutation(success=True, message='State created.', state=state)
@@ -448,10 +511,9 @@ class UpdateStateMutation(graphene.Mutation):
         elif slug is not None:
             state.slug = slug
         if country_id is not None:
-            try:
-                state.country = Country.objects.get(pk=country_id)
-            except Country.DoesNotExist:
+            if geo_cache.verified('country', country_id) is None:
                 return UpdateStateMutation(success=False, message='Country not found.', state=None)
+            state.country_id = int(country_id)
         state.save()
         return UpdateStateMutation(success=True, message='State updated.', state=state)
 
@@ -476,50 +538,67 @@ class DeleteStateMutation(graphene.Mutation):
 
 class CreateCityMutation(graphene.Mutation):
     class Arguments:
-        name     = graphene.String(required=True)
-        state_id = graphene.ID(required=True)
+        name      = graphene.String(required=True)
+        state_id  = graphene.ID(required=True)
+        latitude  = graphene.Float()
+        longitude = graphene.Float()
 
     success = graphene.Boolean()
     message = graphene.String()
     city    = graphene.Field(CityType)
 
-    def mutate(self, info, name, state_id):
+    def mutate(self, info, name, state_id, latitude=None, longitude=None):
         admin_required(info)
-        try:
-            state = State.objects.get(pk=state_id)
-        except State.DoesNotExist:
+        state = geo_cache.verified('state', state_id)
+        if state is None:
             return CreateCityMutation(success=False, message='State not found.', city=None)
-        city = City.objects.create(name=name, state=state)
+        try:
+            validate_point(latitude, longitude)
+        except ValueError as e:
+            return CreateCityMutation(success=False, message=str(e), city=None)
+        city = City.objects.create(name=name, state=state, latitude=latitude, longitude=longitude)
         return CreateCityMutation(success=True, message='City created.', city=city)
 
 
 class UpdateCityMutation(graphene.Mutation):
     class Arguments:
-        id       = graphene.ID(required=True)
-        name     = graphene.String()
-        slug     = graphene.String()
-        state_id = graphene.ID()
+        id        = graphene.ID(required=True)
+        name      = graphene.String()
+        slug      = graphene.String()
+        state_id  = graphene.ID()
+        latitude  = graphene.Float()
+        longitude = graphene.Float()
+        clear_coordinates = graphene.Boolean()
 
     success = graphene.Boolean()
     message = graphene.String()
     city    = graphene.Field(CityType)
 
-    def mutate(self, info, id, name=None, slug=None, state_id=None):
+    def mutate(self, info, id, name=None, slug=None, state_id=None, latitude=None, longitude=None, clear_coordinates=False):
         admin_required(info)
         try:
             city = City.objects.get(pk=id)
         except City.DoesNotExist:
             return UpdateCityMutation(success=False, message='City not found.', city=None)
+        try:
+            validate_point(latitude, longitude)
+        except ValueError as e:
+            return UpdateCityMutation(success=False, message=str(e), city=None)
+        if clear_coordinates:
+            if latitude is not None:
+                return UpdateCityMutation(success=False, message='Pass coordinates or clearCoordinates, not both.', city=None)
+            city.latitude = city.longitude = None
+        if latitude  is not None: city.latitude  = latitude
+        if longitude is not None: city.longitude = longitude
         if name is not None:
             city.name = name
             city.slug = slug if slug else slugify(name)
         elif slug is not None:
             city.slug = slug
         if state_id is not None:
-            try:
-                city.state = State.objects.get(pk=state_id)
-            except State.DoesNotExist:
+            if geo_cache.verified('state', state_id) is None:
                 return UpdateCityMutation(success=False, message='State not found.', city=None)
+            city.state_id = int(state_id)
         city.save()
         return UpdateCityMutation(success=True, message='City updated.', city=city)
 
@@ -549,6 +628,8 @@ class CreateEventMutation(graphene.Mutation):
         state_id          = graphene.ID(required=True)
         city_id           = graphene.ID(required=True)
         venue             = graphene.String(required=True)
+        latitude          = graphene.Float()
+        longitude         = graphene.Float()
         event_date        = graphene.Date(required=True)
         start_time        = graphene.Time(required=True)
         end_time          = graphene.Time(required=True)
@@ -565,17 +646,22 @@ class CreateEventMutation(graphene.Mutation):
     def mutate(self, info, title, country_id, state_id, city_id,
                venue, event_date, start_time, end_time,
                short_description, long_description,
-               category_ids=None, tag_ids=None, is_active=True):
+               category_ids=None, tag_ids=None, is_active=True,
+               latitude=None, longitude=None):
         admin_required(info)
+        country = geo_cache.verified('country', country_id)
+        state   = geo_cache.verified('state', state_id)
+        city    = geo_cache.verified('city', city_id)
+        for model, found in ((Country, country), (State, state), (City, city)):
+            if found is None:
+                return CreateEventMutation(success=False, message=f'{model.__name__} matching query does not exist.', event=None)
         try:
-            country = Country.objects.get(pk=country_id)
-            state   = State.objects.get(pk=state_id)
-            city    = City.objects.get(pk=city_id)
-        except (Country.DoesNotExist, State.DoesNotExist, City.DoesNotExist) as e:
+            validate_point(latitude, longitude)
+        except ValueError as e:
             return CreateEventMutation(success=False, message=str(e), event=None)
         event = Event.objects.create(
             title=title, country=country, state=state, city=city,
-            venue=venue, event_date=event_date, start_time=start_time, end_time=end_time,
+            venue=venue, latitude=latitude, longitude=longitude, event_date=event_date, start_time=start_time, end_time=end_time,
             short_description=short_description, long_description=long_description,
             is_active=is_active,
         )
@@ -594,6 +680,8 @@ class UpdateEventMutation(graphene.Mutation):
         state_id          = graphene.ID()
         city_id           = graphene.ID()
         venue             = graphene.String()
+        latitude          = graphene.Float()
+        longitude         = graphene.Float()
         event_date        = graphene.Date()
         start_time        = graphene.Time()
         end_time          = graphene.Time()
@@ -604,6 +692,7 @@ class UpdateEventMutation(graphene.Mutation):
         is_active         = graphene.Boolean()
         remove_feature_image    = graphene.Boolean()
         remove_extra_image_ids  = graphene.List(graphene.ID)
+        clear_coordinates       = graphene.Boolean()
 
     success = graphene.Boolean()
     message = graphene.String()
@@ -613,37 +702,37 @@ class UpdateEventMutation(graphene.Mutation):
                venue=None, event_date=None, start_time=None, end_time=None,
                short_description=None, long_description=None,
                category_ids=None, tag_ids=None, is_active=None,
-               remove_feature_image=False, remove_extra_image_ids=None):
+               remove_feature_image=False, remove_extra_image_ids=None,
+               latitude=None, longitude=None, clear_coordinates=False):
         admin_required(info)
         try:
             event = Event.objects.get(pk=id)
         except Event.DoesNotExist:
             return UpdateEventMutation(success=False, message='Event not found.', event=None)
+        try:
+            validate_point(latitude, longitude)
+        except ValueError as e:
+            return UpdateEventMutation(success=False, message=str(e), event=None)
+        if clear_coordinates:
+            if latitude is not None:
+                return UpdateEventMutation(success=False, message='Pass coordinates or clearCoordinates, not both.', event=None)
+            # Back to the city's location.
+            event.latitude = event.longitude = None
         if title is not None:
             event.title = title
-            base_slug = slugify(title)
-            slug = base_slug
-            counter = 2
-            while Event.objects.filter(slug=slug).exclude(pk=event.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            event.slug = slug
+            event.slug  = ''
         if venue             is not None: event.venue             = venue
+        if latitude          is not None: event.latitude          = latitude
+        if longitude         is not None: event.longitude         = longitude
         if event_date        is not None: event.event_date        = event_date
         if start_time        is not None: event.start_time        = start_time
         if end_time          is not None: event.end_time          = end_time
         if short_description is not None: event.short_description = short_description
         if long_description  is not None: event.long_description  = long_description
         if is_active         is not None: event.is_active         = is_active
-        if country_id is not None:
-            try:    event.country = Country.objects.get(pk=country_id)
-            except Country.DoesNotExist: pass
-        if state_id is not None:
-            try:    event.state = State.objects.get(pk=state_id)
-            except State.DoesNotExist: pass
-        if city_id is not None:
-            try:    event.city = City.objects.get(pk=city_id)
-            except City.DoesNotExist: pass
+        if country_id is not None and geo_cache.verified('country', country_id) is not None: event.country_id = int(country_id)
+        if state_id   is not None and geo_cache.verified('state', state_id)     is not None: event.state_id   = int(state_id)
+        if city_id    is not None and geo_cache.verified('city', city_id)       is not None: event.city_id    = int(city_id)
         if remove_feature_image:
             if event.feature_image:
                 event.feature_image.delete(save=False)
@@ -655,6 +744,7 @@ class UpdateEventMutation(graphene.Mutation):
             event.tags.set(EventTag.objects.filter(pk__in=tag_ids))
         if remove_extra_image_ids:
             event.extraImages.filter(pk__in=remove_extra_image_ids).delete()
+        get_loaders(info).forget_event(event.pk)
         return UpdateEventMutation(success=True, message='Event updated.', event=event)
 
 
@@ -674,6 +764,166 @@ class DeleteEventMutation(graphene.Mutation):
         return DeleteEventMutation(success=True, message='Event deleted.')
 
 
+# Bulk Mutations
+
+class EventInput(graphene.InputObjectType):
+    title             = graphene.String(required=True)
+    country_id        = graphene.ID(required=True)
+    state_id          = graphene.ID(required=True)
+    city_id           = graphene.ID(required=True)
+    venue             = graphene.String(required=True)
+    latitude          = graphene.Float()
+    longitude         = graphene.Float()
+    event_date        = graphene.Date(required=True)
+    start_time        = graphene.Time(required=True)
+    end_time          = graphene.Time(required=True)
+    short_description = graphene.String(required=True)
+    long_description  = graphene.String(required=True)
+    category_ids      = graphene.List(graphene.ID)
+    tag_ids           = graphene.List(graphene.ID)
+    is_active         = graphene.Boolean()
+
+
+class EventUpdateInput(graphene.InputObjectType):
+    id                = graphene.ID(required=True)
+    title             = graphene.String()
+    country_id        = graphene.ID()
+    state_id          = graphene.ID()
+    city_id           = graphene.ID()
+    venue             = graphene.String()
+    latitude          = graphene.Float()
+    longitude         = graphene.Float()
+    event_date        = graphene.Date()
+    start_time        = graphene.Time()
+    end_time          = graphene.Time()
+    short_description = graphene.String()
+    long_description  = graphene.String()
+    category_ids      = graphene.List(graphene.ID)
+    tag_ids           = graphene.List(graphene.ID)
+    is_active         = graphene.Boolean()
+
+
+class TaxonomyInput(graphene.InputObjectType):
+    name      = graphene.String(required=True)
+    is_active = graphene.Boolean()
+
+
+class CountryInput(graphene.InputObjectType):
+    name = graphene.String(required=True)
+
+
+class StateInput(graphene.InputObjectType):
+    name       = graphene.String(required=True)
+    country_id = graphene.ID(required=True)
+
+
+class CityInput(graphene.InputObjectType):
+    name     = graphene.String(required=True)
+    state_id = graphene.ID(required=True)
+
+
+class BulkItemResult(graphene.ObjectType):
+    index   = graphene.Int()
+    success = graphene.Boolean()
+    message = graphene.String()
+    id      = graphene.ID()
+    slug    = graphene.String()
+
+
+def run_bulk(mutation, info, service, items, success_message):
+    admin_required(info)
+    try:
+        results, ok = service(items)
+    except bulk.BulkError as e:
+        return mutation(success=False, message=str(e), results=[])
+    message = success_message.format(count=len(results)) if ok else 'Batch rejected. No changes were saved.'
+    return mutation(success=ok, message=message, results=results)
+
+
+class BulkCreateEventsMutation(graphene.Mutation):
+    class Arguments:
+        items = graphene.List(graphene.NonNull(EventInput), required=True)
+
+    success = graphene.Boolean()
+    message = graphene.String()
+    results = graphene.List(BulkItemResult)
+
+    def mutate(self, info, items):
+        return run_bulk(BulkCreateEventsMutation, info, bulk.bulk_create_events, items, '{count} event(s) created.')
+
+
+class BulkUpdateEventsMutation(graphene.Mutation):
+    class Arguments:
+        items = graphene.List(graphene.NonNull(EventUpdateInput), required=True)
+
+    success = graphene.Boolean()
+    message = graphene.String()
+    results = graphene.List(BulkItemResult)
+
+    def mutate(self, info, items):
+        return run_bulk(BulkUpdateEventsMutation, info, bulk.bulk_update_events, items, '{count} event(s) updated.')
+
+
+class BulkUpsertCategoriesMutation(graphene.Mutation):
+    class Arguments:
+        items = graphene.List(graphene.NonNull(TaxonomyInput), required=True)
+
+    success = graphene.Boolean()
+    message = graphene.String()
+    results = graphene.List(BulkItemResult)
+
+    def mutate(self, info, items):
+        return run_bulk(BulkUpsertCategoriesMutation, info, bulk.bulk_upsert_categories, items, '{count} category item(s) processed.')
+
+
+class BulkUpsertTagsMutation(graphene.Mutation):
+    class Arguments:
+        items = graphene.List(graphene.NonNull(TaxonomyInput), required=True)
+
+    success = graphene.Boolean()
+    message = graphene.String()
+    results = graphene.List(BulkItemResult)
+
+    def mutate(self, info, items):
+        return run_bulk(BulkUpsertTagsMutation, info, bulk.bulk_upsert_tags, items, '{count} tag item(s) processed.')
+
+
+class BulkUpsertCountriesMutation(graphene.Mutation):
+    class Arguments:
+        items = graphene.List(graphene.NonNull(CountryInput), required=True)
+
+    success = graphene.Boolean()
+    message = graphene.String()
+    results = graphene.List(BulkItemResult)
+
+    def mutate(self, info, items):
+        return run_bulk(BulkUpsertCountriesMutation, info, bulk.bulk_upsert_countries, items, '{count} country item(s) processed.')
+
+
+class BulkUpsertStatesMutation(graphene.Mutation):
+    class Arguments:
+        items = graphene.List(graphene.NonNull(StateInput), required=True)
+
+    success = graphene.Boolean()
+    message = graphene.String()
+    results = graphene.List(BulkItemResult)
+
+    def mutate(self, info, items):
+        return run_bulk(BulkUpsertStatesMutation, info, bulk.bulk_upsert_states, items, '{count} state item(s) processed.')
+
+
+class BulkUpsertCitiesMutation(graphene.Mutation):
+    class Arguments:
+        items = graphene.List(graphene.NonNull(CityInput), required=True)
+
+    success = graphene.Boolean()
+    message = graphene.String()
+    results = graphene.List(BulkItemResult)
+
+    def mutate(self, info, items):
+        return run_bulk(BulkUpsertCitiesMutation, info, bulk.bulk_upsert_cities, items, '{count} city item(s) processed.')
+
+
 class PaginatedCategoryResult(graphene.ObjectType):
     results      = graphene.List(CategoryType)
     total_count  = graphene.Int()
@@ -711,6 +961,99 @@ class PaginatedEventResult(graphene.ObjectType):
     current_page = graphene.Int()
 
 
+class EventEdge(graphene.ObjectType):
+    node   = graphene.Field(EventType)
+    cursor = graphene.String()
+
+class EventConnection(graphene.ObjectType):
+    edges       = graphene.List(EventEdge)
+    page_info   = graphene.Field(graphene.relay.PageInfo)
+    total_count = graphene.Int()
+
+    def resolve_total_count(self, info):
+        return self.count_queryset.count()
+
+
+def event_connection(info, qs, keys, first=None, after=None):
+    count_queryset = qs
+    qs = optimize_event_queryset(qs, info, path=('edges', 'node'), keep=keys)
+    edges, has_next = keyset_page(qs, keys, first=first, after=after)
+    get_loaders(info).prime_events(node for node, _ in edges)
+    connection = EventConnection(
+        edges=[EventEdge(node=node, cursor=cursor) for node, cursor in edges],
+        page_info=graphene.relay.PageInfo(
+            has_next_page=has_next,
+            has_previous_page=bool(after),
+            start_cursor=edges[0][1] if edges else None,
+            end_cursor=edges[-1][1] if edges else None,
+        ),
+    )
+    connection.count_queryset = count_queryset
+    return connection
+
+
+class EventListingType(DjangoObjectType):
+    id             = graphene.ID()
+    category_names = graphene.List(graphene.String)
+    tag_names      = graphene.List(graphene.String)
+    image_url      = graphene.String()
+    variants       = graphene.List(ImageVariantType, size=graphene.String())
+
+    class Meta:
+        model = EventListing
+        fields = (
+            'title', 'slug', 'short_description', 'venue',
+            'event_date', 'start_time', 'end_time', 'is_active',
+            'country_name', 'state_name', 'city_name', 'placeholder',
+        )
+
+    def resolve_id(self, info):
+        return self.event_id
+
+    def resolve_image_url(self, info):
+        return info.context.build_absolute_uri(self.image_url) if self.image_url else None
+
+    def resolve_variants(self, info, size=None):
+        request = info.context
+        return [
+            ImageVariantType(
+                size=v['size'], format=v['format'], url=request.build_absolute_uri(v['url']),
+                width=v['width'], height=v['height'],
+            )
+            for v in self.image_variants
+            if size is None or v['size'] == size
+        ]
+
+
+class ListingEdge(graphene.ObjectType):
+    node   = graphene.Field(EventListingType)
+    cursor = graphene.String()
+
+
+class ListingConnection(graphene.ObjectType):
+    edges     = graphene.List(ListingEdge)
+    page_info = graphene.Field(graphene.relay.PageInfo)
+
+
+class AutocompleteResult(graphene.ObjectType):
+    kind        = graphene.String()
+    id          = graphene.ID()
+    name        = graphene.String()
+    slug        = graphene.String()
+    parent_name = graphene.String()
+
+
+class EventSearchResult(graphene.ObjectType):
+    event   = graphene.Field(EventType)
+    rank    = graphene.Float()
+    snippet = graphene.String()
+
+
+class NearbyEventResult(graphene.ObjectType):
+    event       = graphene.Field(EventType)
+    distance_km = graphene.Float()
+
+
 # Mutation
 
 class Mutation(graphene.ObjectType):
@@ -742,6 +1085,14 @@ class Mutation(graphene.ObjectType):
     create_event = CreateEventMutation.Field()
     update_event = UpdateEventMutation.Field()
     delete_event = DeleteEventMutation.Field()
+    # bulk
+    bulk_create_events     = BulkCreateEventsMutation.Field()
+    bulk_update_events     = BulkUpdateEventsMutation.Field()
+    bulk_upsert_categories = BulkUpsertCategoriesMutation.Field()
+    bulk_upsert_tags       = BulkUpsertTagsMutation.Field()
+    bulk_upsert_countries  = BulkUpsertCountriesMutation.Field()
+    bulk_upsert_states     = BulkUpsertStatesMutation.Field()
+    bulk_upsert_cities     = BulkUpsertCitiesMutation.Field()
 
 
 # Query
@@ -794,6 +1145,27 @@ class Query(graphene.ObjectType):
     paginated_events        = graphene.Field(PaginatedEventResult, page=graphene.Int(), page_size=graphene.Int(), search=graphene.String(), category_id=graphene.ID(), tag_id=graphene.ID(), status=graphene.String())
     paginated_active_events = graphene.Field(PaginatedEventResult, page=graphene.Int(), page_size=graphene.Int(), search=graphene.String())
 
+    # listings (denormalized read model)
+    listings        = graphene.Field(ListingConnection, first=graphene.Int(), after=graphene.String(), search=graphene.String(), category_id=graphene.ID(), tag_id=graphene.ID())
+    listing_by_slug = graphene.Field(EventListingType, slug=graphene.String(required=True))
+
+    # autocomplete
+    autocomplete = graphene.List(AutocompleteResult, kind=graphene.String(required=True), prefix=graphene.String(required=True), limit=graphene.Int())
+
+    # search
+    search_events = graphene.List(EventSearchResult, query=graphene.String(required=True), first=graphene.Int())
+
+    # location
+    nearby_events = graphene.List(
+        NearbyEventResult,
+        lat=graphene.Float(required=True), lng=graphene.Float(required=True), radius_km=graphene.Float(required=True),
+        date_from=graphene.Date(name='from'), date_to=graphene.Date(name='to'), first=graphene.Int(),
+    )
+
+    # keyset connections
+    events_connection        = graphene.Field(EventConnection, first=graphene.Int(), after=graphene.String(), search=graphene.String(), category_id=graphene.ID(), tag_id=graphene.ID(), status=graphene.String())
+    active_events_connection = graphene.Field(EventConnection, first=graphene.Int(), after=graphene.String(), search=graphene.String())
+
     # resolvers
 
     def resolve_me(self, info):
@@ -855,82 +1227,63 @@ class Query(graphene.ObjectType):
 
     def resolve_all_countries(self, info):
         admin_required(info)
-        return Country.objects.all()
+        return geo_cache.countries()
 
     def resolve_country_by_id(self, info, id):
         admin_required(info)
-        try:
-            return Country.objects.get(pk=id)
-        except Country.DoesNotExist:
-            return None
+        return geo_cache.country(id)
 
     def resolve_country_by_slug(self, info, slug):
         admin_required(info)
-        try:
-            return Country.objects.get(slug=slug)
-        except Country.DoesNotExist:
-            return None
+        return geo_cache.country_by_slug(slug)
 
     def resolve_all_states(self, info):
         admin_required(info)
-        return State.objects.all()
+        return geo_cache.states()
 
     def resolve_state_by_id(self, info, id):
         admin_required(info)
-        try:
-            return State.objects.get(pk=id)
-        except State.DoesNotExist:
-            return None
+        return geo_cache.state(id)
 
     def resolve_states_by_country(self, info, country_id):
         admin_required(info)
-        return State.objects.filter(country_id=country_id)
+        return geo_cache.states_of(country_id)
 
     def resolve_all_cities(self, info):
         admin_required(info)
-        return City.objects.all()
+        return geo_cache.cities()
 
     def resolve_city_by_id(self, info, id):
         admin_required(info)
-        try:
-            return City.objects.get(pk=id)
-        except City.DoesNotExist:
-            return None
+        return geo_cache.city(id)
 
     def resolve_cities_by_state(self, info, state_id):
         admin_required(info)
-        return City.objects.filter(state_id=state_id)
+        return geo_cache.cities_of(state_id)
 
     def resolve_all_events(self, info):
-        return Event.objects.all().order_by('id')
+        return get_loaders(info).prime_events(optimize_event_queryset(Event.objects.all().order_by('id'), info))
 
     def resolve_event_by_id(self, info, id):
         try:
-            event = Event.objects.get(pk=id)
-            event.views_count += 1
-            event.save()
-            return event
+            return record_view(Event.objects.get(pk=id), info.context)
         except Event.DoesNotExist:
             return None
 
     def resolve_event_by_slug(self, info, slug):
         try:
-            event = Event.objects.get(slug=slug)
-            event.views_count += 1
-            event.save()
-
-            return event
+            return record_view(Event.objects.get(slug=slug), info.context)
         except Event.DoesNotExist:
             return None
 
     def resolve_events_by_category(self, info, category_id):
-        return Event.objects.filter(category__id=category_id)
+        return get_loaders(info).prime_events(optimize_event_queryset(Event.objects.filter(category__id=category_id), info))
 
     def resolve_events_by_tag(self, info, tag_id):
-        return Event.objects.filter(tags__id=tag_id)
+        return get_loaders(info).prime_events(optimize_event_queryset(Event.objects.filter(tags__id=tag_id), info))
 
     def resolve_active_events(self, info):
-        return Event.objects.filter(is_active=True)
+        return get_loaders(info).prime_events(optimize_event_queryset(Event.objects.filter(is_active=True), info))
 
     def resolve_paginated_categories(self, info, page=1, page_size=10, search=None):
         admin_required(info)
@@ -987,9 +1340,10 @@ class Query(graphene.ObjectType):
         qs = Event.objects.filter(is_active=True).order_by('event_date')
         if search:
             qs = qs.filter(title__icontains=search)
+        qs = optimize_event_queryset(qs, info, path=('results',))
         paginator = Paginator(qs, page_size)
         p = paginator.get_page(page)
-        return PaginatedEventResult(results=list(p), total_count=paginator.count, num_pages=paginator.num_pages, current_page=p.number)
+        return PaginatedEventResult(results=get_loaders(info).prime_events(p), total_count=paginator.count, num_pages=paginator.num_pages, current_page=p.number)
 
     def resolve_paginated_events(self, info, page=1, page_size=10, search=None, category_id=None, tag_id=None, status=None):
         admin_required(info)
@@ -1004,9 +1358,83 @@ class Query(graphene.ObjectType):
             qs = qs.filter(is_active=True)
         elif status == 'inactive':
             qs = qs.filter(is_active=False)
-        paginator = Paginator(qs.distinct(), page_size)
+        qs = optimize_event_queryset(qs.distinct(), info, path=('results',))
+        paginator = Paginator(qs, page_size)
         p = paginator.get_page(page)
-        return PaginatedEventResult(results=list(p), total_count=paginator.count, num_pages=paginator.num_pages, current_page=p.number)
+        return PaginatedEventResult(results=get_loaders(info).prime_events(p), total_count=paginator.count, num_pages=paginator.num_pages, current_page=p.number)
+
+
+    def resolve_autocomplete(self, info, kind, prefix, limit=10):
+        admin_required(info)
+        if kind not in AUTOCOMPLETE_KINDS:
+            raise Exception(f"Unknown autocomplete kind. Use one of: {', '.join(AUTOCOMPLETE_KINDS)}.")
+        limit = min(max(limit or 10, 1), 50)
+        return autocomplete_registry.search(kind, prefix, limit)
+
+    def resolve_search_events(self, info, query, first=10):
+        first = min(max(first or 10, 1), MAX_PAGE_SIZE)
+        qs = optimize_event_queryset(Event.objects.filter(is_active=True), info, path=('event',))
+        hits = get_search_backend().search(qs, query, first)
+        get_loaders(info).prime_events(hit.event for hit in hits)
+        return [EventSearchResult(event=hit.event, rank=hit.rank, snippet=hit.snippet) for hit in hits]
+
+    def resolve_nearby_events(self, info, lat, lng, radius_km, date_from=None, date_to=None, first=20):
+        first = min(max(first or 20, 1), MAX_PAGE_SIZE)
+        try:
+            hits = nearby_events(lat, lng, radius_km, date_from, date_to, limit=first)
+        except ValueError as e:
+            raise Exception(str(e))
+        if not hits:
+            return []
+        qs = optimize_event_queryset(Event.objects.filter(pk__in=[hit.event_id for hit in hits]), info, path=('event',))
+        events = {event.pk: event for event in get_loaders(info).prime_events(qs)}
+        return [
+            NearbyEventResult(event=events[hit.event_id], distance_km=hit.distance_km)
+            for hit in hits if hit.event_id in events
+        ]
+
+    def resolve_events_connection(self, info, first=None, after=None, search=None, category_id=None, tag_id=None, status=None):
+        admin_required(info)
+        qs = Event.objects.all()
+        if search:
+            qs = qs.filter(Q(title__icontains=search) | Q(slug__icontains=search))
+        if category_id:
+            qs = qs.filter(category__id=category_id)
+        if tag_id:
+            qs = qs.filter(tags__id=tag_id)
+        if status == 'active':
+            qs = qs.filter(is_active=True)
+        elif status == 'inactive':
+            qs = qs.filter(is_active=False)
+        return event_connection(info, qs.distinct(), ('id',), first=first, after=after)
+
+    def resolve_active_events_connection(self, info, first=None, after=None, search=None):
+        qs = Event.objects.filter(is_active=True)
+        if search:
+            qs = qs.filter(title__icontains=search)
+        return event_connection(info, qs, ('event_date', 'id'), first=first, after=after)
+
+    def resolve_listings(self, info, first=None, after=None, search=None, category_id=None, tag_id=None):
+        qs = EventListing.objects.filter(is_active=True)
+        if search:
+            qs = qs.filter(title__icontains=search)
+        if category_id:
+            qs = qs.filter(taxonomy_keys__contains=taxonomy_key('c', category_id))
+        if tag_id:
+            qs = qs.filter(taxonomy_keys__contains=taxonomy_key('t', tag_id))
+        edges, has_next = keyset_page(qs, ('event_date', 'event_id'), first=first, after=after)
+        return ListingConnection(
+            edges=[ListingEdge(node=node, cursor=cursor) for node, cursor in edges],
+            page_info=graphene.relay.PageInfo(
+                has_next_page=has_next,
+                has_previous_page=bool(after),
+                start_cursor=edges[0][1] if edges else None,
+                end_cursor=edges[-1][1] if edges else None,
+            ),
+        )
+
+    def resolve_listing_by_slug(self, info, slug):
+        return EventListing.objects.filter(slug=slug, is_active=True).first()
 
 
-schema = graphene.Schema(query=Query, mutation=Mutation)
\ No newline at end of file
+schema = graphene.Schema(query=Query, mutation=Mutation)
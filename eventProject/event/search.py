@@ -0,0 +1,165 @@
+import re
+from functools import lru_cache
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, OuterRef, Q, StringAgg, Subquery, TextField, Value
+from django.db.models.functions import Replace
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+from .models import Category, Event, EventTag
+
+
+INDEX_BATCH_SIZE = 500
+
+
+def _config():
+    return getattr(settings, 'EVENT_SEARCH', {})
+
+
+# The same characters django.utils.html.escape() replaces, '&' first.
+HTML_ESCAPES = (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'), ('"', '&quot;'), ("'", '&#x27;'))
+
+
+def _escaped(field_name):
+    expression = F(field_name)
+    for char, entity in HTML_ESCAPES:
+        expression = Replace(expression, Value(char), Value(entity))
+    return expression
+
+
+class SearchHit:
+
+    def __init__(self, event, rank, snippet):
+        self.event   = event
+        self.rank    = rank
+        self.snippet = snippet
+
+
+class BaseSearchBackend:
+
+    def search(self, qs, text, limit):
+        raise NotImplementedError
+
+    def index(self, event_ids):
+        pass
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+
+    def __init__(self):
+        self.config = _config().get('CONFIG', 'english')
+
+    def _names(self, model):
+        # Space-joined names of the event's categories/tags, computed in the UPDATE itself.
+        return Subquery(
+            model.objects
+            .filter(events=OuterRef('pk'))
+            .order_by()
+            .values('events')
+            .annotate(names=StringAgg('name', Value(' ')))
+            .values('names'),
+            output_field=TextField(),
+        )
+
+    def _vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        parts = (
+            ('title', 'A'),
+            (self._names(Category), 'B'),
+            (self._names(EventTag), 'B'),
+            ('short_description', 'B'),
+            ('venue', 'C'),
+            ('long_description', 'D'),
+        )
+        vector = None
+        for expression, weight in parts:
+            part = SearchVector(expression, weight=weight, config=self.config)
+            vector = part if vector is None else vector + part
+        return vector
+
+    def index(self, event_ids):
+        # One UPDATE per batch rather than a round trip per event.
+        event_ids = list(event_ids)
+        for start in range(0, len(event_ids), INDEX_BATCH_SIZE):
+            Event.objects.filter(pk__in=event_ids[start:start + INDEX_BATCH_SIZE]).update(search_vector=self._vector())
+
+    def search(self, qs, text, limit):
+        from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+
+        query = SearchQuery(text, search_type='websearch', config=self.config)
+        qs = (
+            qs.filter(search_vector=query)
+            .annotate(
+                rank=SearchRank('search_vector', query),
+                # Escaped before highlighting, so the snippet is safe HTML like SimpleSearchBackend's.
+                snippet=SearchHeadline(
+                    _escaped('long_description'), query, config=self.config,
+                    start_sel='<mark>', stop_sel='</mark>', max_words=30, min_words=10,
+                ),
+            )
+            .order_by('-rank', 'id')
+        )
+        return [SearchHit(event, event.rank, event.snippet) for event in qs[:limit]]
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+
+    WEIGHTS = (
+        ('title', 1.0),
+        ('short_description', 0.4),
+        ('venue', 0.2),
+        ('long_description', 0.1),
+    )
+    RELATED_WEIGHT = 0.4
+    CANDIDATE_LIMIT = 500
+
+    def _terms(self, text):
+        return [t for t in re.findall(r'\w+', text.lower()) if t]
+
+    def _snippet(self, text, terms, width=120):
+        lowered = text.lower()
+        positions = [lowered.find(t) for t in terms if lowered.find(t) >= 0]
+        start = max(min(positions) - width // 3, 0) if positions else 0
+        window = escape(text[start:start + width])
+        pattern = re.compile('|'.join(re.escape(t) for t in terms), re.IGNORECASE)
+        window = pattern.sub(lambda m: f'<mark>{m.group(0)}</mark>', window)
+        return ('…' if start else '') + window + ('…' if start + width < len(text) else '')
+
+    def search(self, qs, text, limit):
+        terms = self._terms(text)
+        if not terms:
+            return []
+        condition = Q()
+        for term in terms:
+            for field, _ in self.WEIGHTS:
+                condition |= Q(**{f'{field}__icontains': term})
+            condition |= Q(category__name__icontains=term) | Q(tags__name__icontains=term)
+        candidates = (
+            qs.defer(None)
+            .filter(pk__in=qs.filter(condition).values('pk'))
+            .prefetch_related('category', 'tags')[:self.CANDIDATE_LIMIT]
+        )
+
+        hits = []
+        for event in candidates:
+            rank = 0.0
+            for field, weight in self.WEIGHTS:
+                value = (getattr(event, field) or '').lower()
+                rank += weight * sum(value.count(t) for t in terms)
+            related = ' '.join([c.name for c in event.category.all()] + [t.name for t in event.tags.all()]).lower()
+            rank += self.RELATED_WEIGHT * sum(related.count(t) for t in terms)
+            if rank:
+                hits.append(SearchHit(event, rank, self._snippet(event.long_description or event.short_description or '', terms)))
+        hits.sort(key=lambda hit: (-hit.rank, hit.event.pk))
+        return hits[:limit]
+
+
+@lru_cache(maxsize=1)
+def get_search_backend():
+    path = _config().get('BACKEND')
+    if path:
+        return import_string(path)()
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return SimpleSearchBackend()
@@ -1,5 +1,14 @@
 from rest_framework import serializers
 from .models import Event, EventImages
+from .uploads import UploadValidationError, sniff_image
+
+
+def validate_image_upload(value):
+    try:
+        sniff_image(value)
+    except UploadValidationError as e:
+        raise serializers.ValidationError(str(e))
+    return value
 
 
 class FeatureImageSerializer(serializers.ModelSerializer):
@@ -9,17 +18,7 @@ class FeatureImageSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'title')
 
     def validate_feature_image(self, value):
-        # print(value)
-        # print(self)
-        allowed = ['image/jpeg', 'image/png', 'image/jpg']
-        if hasattr(value, 'content_type') and value.content_type not in allowed:
-            raise serializers.ValidationError(
-                'Unsupported image format. Allowed: JPEG, PNG, JPG.'
-            )
-        max_size = 5 * 1024 * 1024 
-        if value.size > max_size:
-            raise serializers.ValidationError('Image size must not exceed 5 MB.')
-        return value
+        return validate_image_upload(value)
 
 
 class EventImageSerializer(serializers.ModelSerializer):
@@ -29,15 +28,7 @@ class EventImageSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at')
 
     def validate_image(self, value):
-        allowed = ['image/jpeg', 'image/png', 'image/jpg']
-        if hasattr(value, 'content_type') and value.content_type not in allowed:
-            raise serializers.ValidationError(
-                'Unsupported image format. Allowed: JPEG, PNG, JPG.'
-            )
-        max_size = 5 * 1024 * 1024  # 5 MB
-        if value.size > max_size:
-            raise serializers.ValidationError('Image size must not exceed 5 MB.')
-        return value
+        return validate_image_upload(value)
 
 
 class ExtraImagesResponseSerializer(serializers.ModelSerializer):
@@ -0,0 +1,159 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save, m2m_changed
+from django.dispatch import receiver
+from .models import Category, EventTag, Country, State, City, Event, EventImages, ProcessedImage
+from . import response_cache
+from .autocomplete import MODEL_KINDS, registry as autocomplete_registry
+from .geo import geo_cache
+from .listings import schedule_refresh
+from .nearby import rehash_city_events
+from .search import get_search_backend
+
+
+CACHED_MODELS = (Event, Category, EventTag, Country, State, City, EventImages, ProcessedImage)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_response_cache(sender, **kwargs):
+    if sender in CACHED_MODELS:
+        response_cache.bump_generation()
+
+
+@receiver(m2m_changed, sender=Event.category.through)
+@receiver(m2m_changed, sender=Event.tags.through)
+@receiver(m2m_changed, sender=Event.extraImages.through)
+def invalidate_response_cache_m2m(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        response_cache.bump_generation()
+
+
+@receiver(post_save, sender=Event)
+def index_event(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_search_backend().index([instance.pk])
+
+
+@receiver(m2m_changed, sender=Event.category.through)
+@receiver(m2m_changed, sender=Event.tags.through)
+def index_event_taxonomy(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        get_search_backend().index([instance.pk])
+    elif pk_set:
+        get_search_backend().index(list(pk_set))
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=EventTag)
+def remember_taxonomy_name(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None or (update_fields is not None and 'name' not in update_fields):
+        instance._indexed_name = instance.name
+        return
+    instance._indexed_name = sender.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=EventTag)
+def index_taxonomy_events(sender, instance, created, raw=False, **kwargs):
+    # Only the name feeds the search vector; flag toggles need no reindex.
+    if created or raw or getattr(instance, '_indexed_name', None) == instance.name:
+        return
+    event_ids = list(instance.events.values_list('pk', flat=True))
+    if event_ids:
+        get_search_backend().index(event_ids)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_autocomplete(sender, **kwargs):
+    kinds = MODEL_KINDS.get(sender)
+    if kinds:
+        autocomplete_registry.invalidate(*kinds)
+
+
+@receiver(post_delete, sender=EventImages)
+def release_extra_image(sender, instance, **kwargs):
+    if instance.image:
+        name = instance.image.name
+        # The storage drops the variants too, once no other reference to the file remains.
+        transaction.on_commit(lambda: instance.image.storage.delete(name))
+
+
+@receiver(post_delete, sender=Event)
+def release_feature_image(sender, instance, **kwargs):
+    if instance.feature_image:
+        name = instance.feature_image.name
+        transaction.on_commit(lambda: instance.feature_image.storage.delete(name))
+
+
+@receiver(post_save, sender=Event)
+def refresh_event_listing(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_refresh([instance.pk])
+
+
+@receiver(m2m_changed, sender=Event.category.through)
+@receiver(m2m_changed, sender=Event.tags.through)
+def refresh_listing_taxonomy(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # The rows are gone by post_clear, so remember which events they linked.
+        instance._listing_clear_ids = list(instance.events.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        schedule_refresh([instance.pk])
+    elif pk_set:
+        schedule_refresh(pk_set)
+    elif action == 'post_clear':
+        schedule_refresh(instance.__dict__.pop('_listing_clear_ids', ()))
+
+
+LISTING_PARENTS = {
+    Category: 'category',
+    EventTag: 'tags',
+    Country:  'country',
+    State:    'state',
+    City:     'city',
+}
+
+
+@receiver(post_save)
+def refresh_listings_for_parent(sender, instance, created, raw=False, **kwargs):
+    lookup = LISTING_PARENTS.get(sender)
+    if lookup is None or created or raw:
+        return
+    schedule_refresh(Event.objects.filter(**{lookup: instance}).values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=EventTag)
+def refresh_listings_for_deleted_taxonomy(sender, instance, **kwargs):
+    # The cascade removes the M2M rows without m2m_changed; the refresh runs after commit.
+    schedule_refresh(list(instance.events.values_list('pk', flat=True)))
+
+
+@receiver(post_save, sender=ProcessedImage)
+@receiver(post_delete, sender=ProcessedImage)
+def refresh_listings_for_image(sender, instance, **kwargs):
+    schedule_refresh(Event.objects.filter(feature_image=instance.source).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_save, sender=State)
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=Country)
+@receiver(post_delete, sender=State)
+@receiver(post_delete, sender=City)
+def invalidate_geo_cache(sender, **kwargs):
+    # After commit, so other workers cannot reload the old rows under the new version.
+    transaction.on_commit(geo_cache.invalidate)
+
+
+@receiver(post_save, sender=City)
+def rehash_events_for_city(sender, instance, created, raw=False, **kwargs):
+    # Events without venue coordinates are indexed at their city's location.
+    if not (created or raw):
+        rehash_city_events(instance)
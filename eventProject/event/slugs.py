@@ -0,0 +1,49 @@
+import re
+from django.db.models import Q
+from django.utils.text import slugify
+
+
+BASE_MAX_LENGTH = 40
+SLUG_RETRIES    = 5
+
+
+def is_slug_conflict(error):
+    return 'slug' in str(error).lower()
+
+
+def slug_base(title):
+    return slugify(title)[:BASE_MAX_LENGTH].strip('-') or 'event'
+
+
+def reserve_event_slugs(titles, exclude_pks=()):
+    """Return a free slug per title using one query, however many "-N" siblings exist."""
+    from .models import Event
+
+    bases = [slug_base(title) for title in titles]
+    if not bases:
+        return []
+
+    condition = Q()
+    for base in set(bases):
+        condition |= Q(slug=base) | (Q(slug__startswith=f'{base}-') & Q(slug__regex=rf'^{re.escape(base)}-[0-9]+$'))
+    used = set(Event.objects.filter(condition).exclude(pk__in=list(exclude_pks)).values_list('slug', flat=True))
+
+    base_set    = set(bases)
+    next_suffix = {}
+    for slug in used:
+        head, _, tail = slug.rpartition('-')
+        if head in base_set and tail.isdigit():
+            next_suffix[head] = max(next_suffix.get(head, 2), int(tail) + 1)
+
+    slugs = []
+    for base in bases:
+        slug = base
+        if slug in used:
+            suffix = next_suffix.get(base, 2)
+            while f'{base}-{suffix}' in used:
+                suffix += 1
+            slug = f'{base}-{suffix}'
+            next_suffix[base] = suffix + 1
+        used.add(slug)
+        slugs.append(slug)
+    return slugs
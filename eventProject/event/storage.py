@@ -0,0 +1,87 @@
+import hashlib
+import os
+import uuid
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+
+BLOB_ROOT = 'blobs'
+
+EXTENSION_ALIASES = {'.jpeg': '.jpg'}
+
+
+def content_digest(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_name(digest, original_name):
+    ext = os.path.splitext(original_name)[1].lower()
+    ext = EXTENSION_ALIASES.get(ext, ext)
+    return f'{BLOB_ROOT}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Stores each distinct file once, named by its SHA-256, and reference-counts the names.
+
+    Saving content that already exists only bumps the count; ``delete()``
+    removes the file once the last reference to it is gone.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content in _save(), so never rename.
+        return name
+
+    def _save(self, name, content):
+        from .models import StoredBlob
+
+        digest = content_digest(content)
+        name = blob_name(digest, name)
+
+        # The row lock is taken before the file is checked, so a concurrent
+        # delete() of the last reference cannot remove the file under us.
+        with transaction.atomic():
+            blob, created = StoredBlob.objects.select_for_update().get_or_create(
+                name=name, defaults={'sha256': digest, 'size': content.size, 'refcount': 1},
+            )
+            if not os.path.exists(self.path(name)):
+                self._write(name, content)
+            if not created:
+                StoredBlob.objects.filter(pk=blob.pk).update(refcount=F('refcount') + 1)
+        return name
+
+    def _write(self, name, content):
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        tmp_path = f'{full_path}.{uuid.uuid4().hex}.tmp'
+        if hasattr(content, 'temporary_file_path'):
+            file_move_safe(content.temporary_file_path(), tmp_path)
+        else:
+            with open(tmp_path, 'wb') as fh:
+                for chunk in content.chunks():
+                    fh.write(chunk)
+        if self.file_permissions_mode is not None:
+            os.chmod(tmp_path, self.file_permissions_mode)
+        os.replace(tmp_path, full_path)
+
+    def delete(self, name):
+        from .images import discard_variants
+        from .models import StoredBlob
+
+        if not name:
+            raise ValueError('The name must be given to delete().')
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob is not None and blob.refcount > 1:
+                StoredBlob.objects.filter(pk=blob.pk).update(refcount=F('refcount') - 1)
+                return
+            if blob is not None:
+                blob.delete()
+            # Still under the row lock: a concurrent _save() of the same content
+            # waits, then finds no row and writes the file afresh.
+            discard_variants(name)
+            super().delete(name)
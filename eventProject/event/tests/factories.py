@@ -0,0 +1,46 @@
+import datetime
+from django.contrib.auth.models import User
+from graphql_jwt.shortcuts import get_token
+from ..auth import token_digest
+from ..models import Category, City, Country, Event, EventTag, State, UserToken
+
+
+def make_location(suffix=''):
+    country = Country.objects.create(name=f'Country{suffix}')
+    state   = State.objects.create(name=f'State{suffix}', country=country)
+    city    = City.objects.create(name=f'City{suffix}', state=state)
+    return country, state, city
+
+
+def make_event(city, title='Concert', **fields):
+    values = {
+        'title':             title,
+        'country_id':        city.state.country_id,
+        'state_id':          city.state_id,
+        'city':              city,
+        'venue':             'Main Hall',
+        'event_date':        datetime.date(2030, 1, 1),
+        'start_time':        datetime.time(18, 0),
+        'end_time':          datetime.time(21, 0),
+        'short_description': 'Short',
+        'long_description':  'Long description',
+    }
+    values.update(fields)
+    return Event.objects.create(**values)
+
+
+def make_taxonomy(name='Music'):
+    return Category.objects.create(name=name), EventTag.objects.create(name=f'{name}Tag')
+
+
+def make_admin(username='admin'):
+    return User.objects.create_user(username=username, password='secret-pass-1', is_staff=True)
+
+
+def login(user):
+    """Return an access token with a live session row, as LoginMutation would leave it."""
+    token = get_token(user)
+    UserToken.objects.update_or_create(
+        user=user, defaults={'access_token_hash': token_digest(token), 'refresh_token_hash': token_digest(f'r{token}')},
+    )
+    return token
@@ -0,0 +1,51 @@
+from unittest import mock
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase
+from graphql_jwt.shortcuts import get_token
+from .. import auth
+from ..auth import AuthenticationError, authenticate_request, token_digest
+from ..models import UserToken
+from .factories import make_admin
+
+
+class SessionRevocationTests(TestCase):
+
+    def setUp(self):
+        self.user = make_admin()
+        self.token = get_token(self.user)
+        UserToken.objects.create(user=self.user, access_token_hash=token_digest(self.token), refresh_token_hash='r')
+        caches['shared'].delete(auth.USER_VERSION_KEY.format(self.user.pk))
+        with auth._token_cache_lock:
+            auth._session_cache.clear()
+            auth._digest_index.clear()
+
+    def authenticate(self):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'JWT {self.token}')
+        return authenticate_request(request)[0]
+
+    def test_cached_session_skips_the_database(self):
+        self.assertEqual(self.authenticate(), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate(), self.user)
+
+    def test_revocation_in_another_worker_is_seen(self):
+        self.authenticate()
+        # Another process rotates the session: the row changes and only the shared stamp tells us.
+        UserToken.objects.filter(user=self.user).update(access_token_hash='rotated')
+        auth._bump_user_version(self.user.pk)
+        with self.assertRaisesMessage(AuthenticationError, 'invalidated'):
+            self.authenticate()
+
+    def test_invalidate_bumps_after_commit(self):
+        self.authenticate()
+        before = auth._user_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            auth.invalidate_user_token(self.user.pk)
+        self.assertNotEqual(auth._user_version(self.user.pk), before)
+
+    def test_bump_never_expires_and_never_increments(self):
+        shared = caches['shared']
+        with mock.patch.object(shared, 'incr', side_effect=AssertionError('incr is racy')), \
+                mock.patch.object(shared, 'set', wraps=shared.set) as set_:
+            auth._bump_user_version(self.user.pk)
+        self.assertIsNone(set_.call_args.kwargs['timeout'])
@@ -0,0 +1,31 @@
+from django.test import TestCase
+from .factories import login, make_admin, make_taxonomy
+from .test_graphql_view import GraphQLTestMixin
+
+
+QUERY = 'query Complete($limit: Int) { autocomplete(kind: "category", prefix: "ro", limit: $limit) { id name } }'
+
+
+class AutocompleteLimitTests(GraphQLTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        for name in ('Rock', 'Roots', 'Romance'):
+            make_taxonomy(name)
+        self.token = login(make_admin())
+
+    def complete(self, limit):
+        response = self.client.post(
+            '/graphql/', {'query': QUERY, 'variables': {'limit': limit}},
+            content_type='application/json', HTTP_AUTHORIZATION=f'JWT {self.token}',
+        )
+        body = response.json()
+        self.assertNotIn('errors', body)
+        return body['data']['autocomplete']
+
+    def test_null_limit_uses_the_default(self):
+        self.assertEqual(len(self.complete(None)), 3)
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(len(self.complete(2)), 2)
+        self.assertEqual(len(self.complete(-5)), 1)
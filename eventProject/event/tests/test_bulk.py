@@ -0,0 +1,107 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from ..models import Category, Event
+from .factories import login, make_admin, make_location, make_taxonomy
+from .test_graphql_view import GraphQLTestMixin
+
+
+CREATE = '''
+mutation Create($items: [EventInput!]!) {
+  bulkCreateEvents(items: $items) { success message results { index success message id slug } }
+}
+'''
+UPDATE = '''
+mutation Update($items: [EventUpdateInput!]!) {
+  bulkUpdateEvents(items: $items) { success message results { index success message } }
+}
+'''
+UPSERT_CATEGORIES = '''
+mutation Upsert($items: [TaxonomyInput!]!) {
+  bulkUpsertCategories(items: $items) { success message results { index success message id slug } }
+}
+'''
+
+
+class BulkMutationTests(GraphQLTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.country, self.state, self.city = make_location('2')
+        self.category, self.tag = make_taxonomy()
+        self.token = login(make_admin())
+
+    def mutate(self, query, items, token=None):
+        response = self.client.post(
+            '/graphql/', {'query': query, 'variables': {'items': items}},
+            content_type='application/json', HTTP_AUTHORIZATION=f'JWT {token or self.token}',
+        )
+        body = response.json()
+        self.assertNotIn('errors', body)
+        return next(iter(body['data'].values()))
+
+    def event_item(self, title, **fields):
+        return {
+            'title': title, 'countryId': self.country.pk, 'stateId': self.state.pk, 'cityId': self.city.pk,
+            'venue': 'Hall', 'eventDate': '2031-05-01', 'startTime': '18:00:00', 'endTime': '21:00:00',
+            'shortDescription': 'Short', 'longDescription': 'Long',
+            'categoryIds': [self.category.pk], 'tagIds': [self.tag.pk], **fields,
+        }
+
+    def test_create_assigns_unique_slugs_and_relations(self):
+        result = self.mutate(CREATE, [self.event_item('Gala'), self.event_item('Gala')])
+        self.assertTrue(result['success'])
+        slugs = [r['slug'] for r in result['results']]
+        self.assertEqual(len(set(slugs)), 2)
+        event = Event.objects.get(pk=result['results'][1]['id'])
+        self.assertEqual(list(event.category.all()), [self.category])
+        self.assertEqual(list(event.tags.all()), [self.tag])
+
+    def test_create_query_count_does_not_grow_with_the_batch(self):
+        def count(size):
+            with CaptureQueriesContext(connection) as queries:
+                self.mutate(CREATE, [self.event_item(f'Batch {size} {i}') for i in range(size)])
+            return len(queries)
+        count(1)    # warms the session cache, so only the batch itself is counted
+        self.assertEqual(count(2), count(8))
+
+    def test_one_invalid_item_rejects_the_batch(self):
+        result = self.mutate(CREATE, [self.event_item('Fine'), self.event_item('Broken', cityId=999999)])
+        self.assertFalse(result['success'])
+        self.assertEqual(result['message'], 'Batch rejected. No changes were saved.')
+        self.assertIn('Not saved', result['results'][0]['message'])
+        self.assertIn('City matching query does not exist.', result['results'][1]['message'])
+        self.assertFalse(Event.objects.filter(title__in=['Fine', 'Broken']).exists())
+
+    def test_update_changes_fields_and_rejects_duplicates(self):
+        first, second = self.events
+        result = self.mutate(UPDATE, [{'id': first.pk, 'title': 'Renamed'}, {'id': second.pk, 'isActive': False}])
+        self.assertTrue(result['success'])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.title, second.is_active), ('Renamed', False))
+
+        result = self.mutate(UPDATE, [{'id': first.pk, 'venue': 'A'}, {'id': first.pk, 'venue': 'B'}])
+        self.assertFalse(result['success'])
+        self.assertEqual(result['results'][1]['message'], 'Event listed more than once.')
+
+    def test_upsert_categories(self):
+        result = self.mutate(UPSERT_CATEGORIES, [
+            {'name': 'Music', 'isActive': False}, {'name': 'Theatre'}, {'name': 'Music'},
+        ])
+        self.assertFalse(result['success'])
+        self.assertEqual(result['results'][2]['message'], 'Duplicate item in batch.')
+
+        result = self.mutate(UPSERT_CATEGORIES, [{'name': 'Music', 'isActive': False}, {'name': 'Theatre'}])
+        self.assertEqual([r['message'] for r in result['results']], ['Updated.', 'Created.'])
+        self.assertFalse(Category.objects.get(name='Music').isActive)
+        self.assertEqual(Category.objects.get(name='Theatre').slug, 'theatre')
+
+    def test_requires_admin(self):
+        token = login(User.objects.create_user(username='member', password='secret-pass-1'))
+        response = self.client.post(
+            '/graphql/', {'query': CREATE, 'variables': {'items': [self.event_item('Nope')]}},
+            content_type='application/json', HTTP_AUTHORIZATION=f'JWT {token}',
+        )
+        self.assertIn('Admin access required', response.json()['errors'][0]['message'])
@@ -0,0 +1,79 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from unittest import mock
+from django.db import transaction
+from django.test import TestCase, override_settings
+from .. import chunked_uploads
+from ..chunked_uploads import ChunkedUploadError, complete_session, partial_path, start_session, write_chunk
+from ..models import StoredBlob, UploadSession
+from .factories import make_admin, make_event, make_location
+from .test_uploads import image_file
+
+
+class ChunkedUploadTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        self.enterContext(mock.patch('event.chunked_uploads.image_pipeline'))
+        _, _, city = make_location()
+        self.event = make_event(city)
+        self.data = image_file('photo.png', 'purple').read()
+        self.session = start_session(
+            make_admin(), self.event, UploadSession.KIND_EXTRA, 'photo.png',
+            len(self.data), hashlib.sha256(self.data).hexdigest(),
+        )
+
+    def send(self, start, end, **kwargs):
+        return write_chunk(self.session.pk, start, io.BytesIO(self.data[start:end]), end - start, **kwargs)
+
+    def test_chunks_assemble_and_complete(self):
+        middle = len(self.data) // 2
+        self.send(0, middle)
+        self.assertEqual(self.send(middle, len(self.data)).offset, len(self.data))
+        session = complete_session(self.session.pk)
+        self.assertEqual(session.status, UploadSession.STATUS_COMPLETE)
+        self.assertEqual(self.event.extraImages.get().image.name, session.result_name)
+        self.assertTrue(StoredBlob.objects.filter(name=session.result_name).exists())
+
+    def test_out_of_order_chunk_is_rejected_with_the_current_offset(self):
+        self.send(0, 10)
+        with self.assertRaises(ChunkedUploadError) as caught:
+            self.send(20, 30)
+        self.assertEqual((caught.exception.status, caught.exception.offset), (409, 10))
+
+    def test_bad_chunk_checksum_leaves_the_offset_alone(self):
+        with self.assertRaises(ChunkedUploadError):
+            self.send(0, 10, chunk_checksum='0' * 64)
+        self.assertEqual(UploadSession.objects.get(pk=self.session.pk).offset, 0)
+        self.assertEqual(os.listdir(os.path.dirname(partial_path(self.session))), [f'{self.session.pk}.part'])
+
+    def test_body_is_read_before_the_row_is_locked(self):
+        locked = []
+        atomic = transaction.atomic
+
+        @contextmanager
+        def recording_atomic(*args, **kwargs):
+            with atomic(*args, **kwargs):
+                locked.append(True)
+                yield
+
+        class Stream(io.BytesIO):
+            def read(inner, size=-1):
+                self.assertEqual(locked, [], 'chunk read while holding the session lock')
+                return super().read(size)
+
+        with mock.patch.object(chunked_uploads.transaction, 'atomic', recording_atomic):
+            write_chunk(self.session.pk, 0, Stream(self.data[:10]), 10)
+        self.assertEqual(locked, [True])
+
+    def test_incomplete_upload_cannot_complete(self):
+        self.send(0, 10)
+        with self.assertRaises(ChunkedUploadError) as caught:
+            complete_session(self.session.pk)
+        self.assertEqual(caught.exception.status, 409)
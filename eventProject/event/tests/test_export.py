@@ -0,0 +1,59 @@
+import csv
+import gzip
+import io
+import json
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .factories import make_admin, make_event, make_location, make_taxonomy
+
+
+class EventExportViewTests(APITestCase):
+
+    def setUp(self):
+        _, _, city = make_location()
+        category, tag = make_taxonomy()
+        self.events = [make_event(city, title=f'Show {i}') for i in range(3)]
+        for event in self.events:
+            event.category.add(category)
+            event.tags.add(tag)
+        self.client.force_authenticate(make_admin())
+
+    def export(self, **params):
+        response = self.client.get(reverse('event-export'), params)
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', None))
+        return response, b''.join(response.streaming_content)
+
+    def test_csv(self):
+        response, body = self.export(export_format='csv')
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual([row['title'] for row in rows], ['Show 0', 'Show 1', 'Show 2'])
+        self.assertEqual(rows[0]['categories'], 'Music')
+
+    def test_ndjson_and_jsonl(self):
+        for fmt in ('ndjson', 'jsonl'):
+            with self.subTest(fmt=fmt):
+                response, body = self.export(export_format=fmt)
+                self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+                self.assertIn('.ndjson', response['Content-Disposition'])
+                records = [json.loads(line) for line in body.decode().splitlines()]
+                self.assertEqual([r['id'] for r in records], [e.pk for e in self.events])
+
+    def test_default_is_csv(self):
+        response, _ = self.export()
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+
+    def test_gzip(self):
+        response, body = self.export(export_format='ndjson', gzip='1')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertEqual(len(gzip.decompress(body).decode().splitlines()), 3)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(reverse('event-export'), {'export_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.data['success'])
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(reverse('event-export'), {'export_format': 'csv'})
+        self.assertIn(response.status_code, (401, 403))
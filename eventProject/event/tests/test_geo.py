@@ -0,0 +1,28 @@
+from unittest import mock
+from django.core.cache import caches
+from django.test import TestCase
+from .. import geo
+from ..geo import VERSION_KEY, GeoCache
+from .factories import make_location
+
+
+class GeoVersionStampTests(TestCase):
+
+    def setUp(self):
+        caches['shared'].delete(VERSION_KEY)
+        make_location()
+
+    def test_invalidate_in_one_worker_reloads_another(self):
+        writer, reader = GeoCache(), GeoCache()
+        stale = reader.tree()
+        writer.invalidate()
+        with mock.patch.object(geo, 'VERSION_CHECK_INTERVAL', 0):
+            self.assertIsNot(reader.tree(), stale)
+
+    def test_stamp_never_expires_and_never_repeats(self):
+        first = geo._shared_version()
+        with mock.patch.object(caches['shared'], 'incr', side_effect=AssertionError('incr is racy')):
+            GeoCache().invalidate()
+        second = geo._shared_version()
+        self.assertNotEqual(first, second)
+        self.assertIsNone(caches['shared'].default_timeout)
@@ -0,0 +1,81 @@
+import math
+import random
+from django.test import SimpleTestCase
+from ..geohash import EARTH_RADIUS_KM, covering_cells, encode, haversine_km
+
+
+def destination(latitude, longitude, distance_km, bearing):
+    """Point ``distance_km`` from the start along ``bearing`` degrees, on the haversine sphere."""
+    angle = distance_km / EARTH_RADIUS_KM
+    phi1, lmb1, theta = math.radians(latitude), math.radians(longitude), math.radians(bearing)
+    phi2 = math.asin(math.sin(phi1) * math.cos(angle) + math.cos(phi1) * math.sin(angle) * math.cos(theta))
+    lmb2 = lmb1 + math.atan2(
+        math.sin(theta) * math.sin(angle) * math.cos(phi1),
+        math.cos(angle) - math.sin(phi1) * math.sin(phi2),
+    )
+    return math.degrees(phi2), (math.degrees(lmb2) + 540) % 360 - 180
+
+
+class EncodeTests(SimpleTestCase):
+
+    def test_known_value(self):
+        self.assertEqual(encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+
+    def test_precision_is_a_prefix(self):
+        full = encode(48.8566, 2.3522, 9)
+        self.assertEqual(len(full), 9)
+        for precision in range(1, 9):
+            self.assertEqual(encode(48.8566, 2.3522, precision), full[:precision])
+
+    def test_extremes(self):
+        self.assertEqual(encode(-90, -180, 5), '00000')
+        self.assertEqual(encode(90, 180, 5), 'zzzzz')
+
+
+class CoveringCellsTests(SimpleTestCase):
+
+    def assertCovered(self, latitude, longitude, radius_km, point):
+        cells = covering_cells(latitude, longitude, radius_km, max_cells=32)
+        geohash = encode(*point, 9)
+        self.assertTrue(
+            any(geohash.startswith(cell) for cell in cells),
+            f'{point} ({geohash}) is within {radius_km} km of {(latitude, longitude)} but not in {cells}',
+        )
+
+    def test_edge_of_radius(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            latitude, longitude = rng.uniform(-89, 89), rng.uniform(-180, 180)
+            radius_km = rng.choice((0.3, 1, 5, 25, 100, 400))
+            for bearing in (0, 45, 90, 135, 180, 225, 270, 315, rng.uniform(0, 360)):
+                self.assertCovered(latitude, longitude, radius_km,
+                                   destination(latitude, longitude, radius_km * 0.99999, bearing))
+
+    def test_reported_southern_miss(self):
+        self.assertCovered(-73.688, -139.41, 0.3, destination(-73.688, -139.41, 0.3 * 0.99999, 0))
+
+    def test_antimeridian(self):
+        for longitude in (179.999, -179.999):
+            for bearing in (45, 90, 135, 225, 270, 315):
+                point = destination(10.0, longitude, 50, bearing)
+                self.assertCovered(10.0, longitude, 50, point)
+        # Cells on both sides of ±180 are needed.
+        cells = covering_cells(0.05, 180.0, 20, max_cells=32)
+        east, west = encode(0.05, 179.95, 9), encode(0.05, -179.95, 9)
+        self.assertTrue(any(east.startswith(cell) for cell in cells))
+        self.assertTrue(any(west.startswith(cell) for cell in cells))
+
+    def test_poles(self):
+        for latitude in (89.99, -89.99):
+            for bearing in range(0, 360, 30):
+                self.assertCovered(latitude, 0.0, 10, destination(latitude, 0.0, 10 * 0.99999, bearing))
+        # A circle over the pole reaches every longitude.
+        self.assertCovered(89.95, 0.0, 20, (89.95, 180.0))
+
+    def test_cell_budget(self):
+        self.assertLessEqual(len(covering_cells(40.0, -74.0, 10, max_cells=32)), 32)
+        self.assertLessEqual(len(covering_cells(0.0, 0.0, 500, max_cells=32)), 32)
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine_km(0, 0, 0, 1), math.pi * EARTH_RADIUS_KM / 180, places=6)
+        self.assertEqual(haversine_km(12.5, 45.0, 12.5, 45.0), 0)
@@ -0,0 +1,60 @@
+import json
+from unittest import mock
+import graphql
+from django.core.cache import caches
+from django.test import TestCase
+from ..counters import view_counter
+from ..documents import document_cache
+from .factories import make_event, make_location
+
+
+EVENT_QUERY = 'query Event($id: ID!) { eventById(id: $id) { id title } }'
+
+
+class GraphQLTestMixin:
+
+    def setUp(self):
+        patcher = mock.patch.object(view_counter, 'flush_interval', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        document_cache.clear()
+        caches['graphql_responses'].clear()
+        caches['graphql_queries'].clear()
+        _, _, city = make_location()
+        self.events = [make_event(city, title=f'Show {i}') for i in range(2)]
+
+    def graphql(self, body, method='post'):
+        if method == 'get':
+            response = self.client.get('/graphql/', body, HTTP_ACCEPT='application/json')
+        else:
+            response = self.client.post('/graphql/', json.dumps(body), content_type='application/json')
+        return response, json.loads(response.content) if response.content else None
+
+
+class DocumentExecutionTests(GraphQLTestMixin, TestCase):
+
+    def test_each_query_is_parsed_once(self):
+        with mock.patch('event.documents.parse', wraps=graphql.parse) as parse, \
+                mock.patch('graphene_django.views.parse') as upstream_parse:
+            for event in self.events:
+                _, body = self.graphql({'query': EVENT_QUERY, 'variables': {'id': event.pk}})
+                self.assertEqual(body['data']['eventById']['title'], event.title)
+        parse.assert_called_once()
+        upstream_parse.assert_not_called()
+
+    def test_validation_errors_are_cached_too(self):
+        with mock.patch('event.documents.validate', wraps=graphql.validate) as validate:
+            for _ in range(2):
+                _, body = self.graphql({'query': '{ eventById(id: 1) { nope } }'})
+                self.assertIn('nope', body['errors'][0]['message'])
+        validate.assert_called_once()
+
+    def test_syntax_error(self):
+        _, body = self.graphql({'query': '{ eventById('})
+        self.assertIn('Syntax Error', body['errors'][0]['message'])
+
+    def test_get_mutation_is_not_allowed(self):
+        response, _ = self.graphql(
+            {'query': 'mutation { login(email: "a@example.com", password: "b") { success } }'}, method='get',
+        )
+        self.assertEqual(response.status_code, 405)
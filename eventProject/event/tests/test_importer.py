@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from ..importer import Checkpoint, run_import
+from ..models import Category, Event, ImportCheckpoint
+from .factories import make_location
+
+
+HEADER = 'title,country,state,city,venue,event_date,start_time,end_time,short_description,long_description,categories,tags\n'
+
+
+def csv_row(title, categories='Music', city='City'):
+    return f'{title},Country,State,{city},Hall,2030-01-01,18:00,21:00,Short,Long,{categories},Live\n'
+
+
+def ndjson_row(title, **fields):
+    record = {
+        'title': title, 'country': 'Country', 'state': 'State', 'city': 'City', 'venue': 'Hall',
+        'event_date': '2030-01-01', 'start_time': '18:00', 'end_time': '21:00',
+        'short_description': 'Short', 'long_description': 'Long', **fields,
+    }
+    return json.dumps(record) + '\n'
+
+
+class RunImportTests(TestCase):
+
+    def setUp(self):
+        make_location()
+
+    def test_csv_with_create_missing(self):
+        body = HEADER + csv_row('One') + csv_row('Two', 'Music|Jazz', city='Newtown')
+        stats = run_import(io.StringIO(body), 'csv', create_missing=True)
+        self.assertEqual((stats.created, stats.failed), (2, 0))
+        two = Event.objects.get(title='Two')
+        self.assertEqual(sorted(c.name for c in two.category.all()), ['Jazz', 'Music'])
+        self.assertEqual(two.city.name, 'Newtown')
+
+    def test_ndjson_reports_bad_lines(self):
+        body = ndjson_row('One') + '{not json\n' + '[1, 2]\n' + ndjson_row('Two', country='Atlantis')
+        stats = run_import(io.StringIO(body), 'jsonl')
+        self.assertEqual((stats.created, stats.failed), (1, 3))
+        self.assertEqual([e['row'] for e in stats.errors], [2, 3, 4])
+        self.assertIn('Unknown country', stats.errors[2]['error'])
+
+    def test_uncreatable_lookups_fail_only_their_row(self):
+        Category.objects.create(name='Rock-Roll')
+        body = HEADER + csv_row('Long', 'A' * 21) + csv_row('Clash', 'Rock Roll') + csv_row('Fine')
+        stats = run_import(io.StringIO(body), 'csv', create_missing=True)
+        self.assertEqual((stats.created, stats.failed), (1, 2))
+        self.assertIn('longer than 20', stats.errors[0]['error'])
+        self.assertIn('Could not create category', stats.errors[1]['error'])
+        self.assertEqual(Event.objects.get().title, 'Fine')
+
+    def test_malformed_csv_rows_are_reported(self):
+        limit = csv.field_size_limit()
+        self.addCleanup(csv.field_size_limit, limit)
+        csv.field_size_limit(100)
+        body = HEADER + csv_row('x' * 200) + csv_row('Fine')
+        stats = run_import(io.StringIO(body), 'csv', create_missing=True)
+        self.assertEqual((stats.created, stats.failed), (1, 1))
+        self.assertIn('Invalid CSV', stats.errors[0]['error'])
+
+    def test_on_batch_failure_rolls_back_its_batch(self):
+        def crash(row_number, stats):
+            raise RuntimeError('crashed before the checkpoint committed')
+
+        with self.assertRaises(RuntimeError):
+            run_import(io.StringIO(ndjson_row('One') + ndjson_row('Two')), 'jsonl', batch_size=1, on_batch=crash)
+        self.assertFalse(Event.objects.exists())
+
+
+class ImportCommandTests(TestCase):
+
+    def setUp(self):
+        make_location()
+        fd, self.path = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(fd, 'w') as fh:
+            fh.write(''.join(ndjson_row(f'Show {i}') for i in range(5)))
+        self.addCleanup(os.remove, self.path)
+
+    def test_checkpoint_commits_with_each_batch_and_resume_skips_done_rows(self):
+        call_command('import_events', self.path, batch_size=2, stdout=io.StringIO())
+        checkpoint = ImportCheckpoint.objects.get(key=os.path.abspath(self.path))
+        self.assertEqual((checkpoint.rows_done, checkpoint.stats['created']), (5, 5))
+
+        out = io.StringIO()
+        call_command('import_events', self.path, batch_size=2, stdout=out)
+        self.assertIn('Resuming after row 5.', out.getvalue())
+        self.assertEqual(Event.objects.count(), 5)
+
+    def test_checkpoint_for_a_modified_file_is_refused(self):
+        Checkpoint(os.path.abspath(self.path), self.path).save(3, {})
+        with open(self.path, 'a') as fh:
+            fh.write(ndjson_row('Extra'))
+        with self.assertRaisesMessage(CommandError, 'modified source file'):
+            call_command('import_events', self.path, stdout=io.StringIO())
@@ -0,0 +1,76 @@
+from django.test import TestCase
+from .. import listings
+from ..listings import taxonomy_key
+from ..models import EventListing
+from .factories import make_event, make_location, make_taxonomy
+
+
+class ListingRefreshTests(TestCase):
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            _, _, self.city = make_location()
+            self.category, self.tag = make_taxonomy()
+            self.events = [make_event(self.city, title=f'Show {i}') for i in range(2)]
+            for event in self.events:
+                event.category.add(self.category)
+                event.tags.add(self.tag)
+
+    def listing(self, event):
+        return EventListing.objects.get(event=event)
+
+    def test_listing_is_built_with_taxonomy(self):
+        listing = self.listing(self.events[0])
+        self.assertEqual((listing.category_names, listing.tag_names), (['Music'], ['MusicTag']))
+        self.assertIn(taxonomy_key('c', self.category.pk), listing.taxonomy_keys)
+        self.assertEqual(listing.city_name, 'City')
+
+    def test_rename_refreshes_linked_listings(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Jazz'
+            self.category.save()
+        for event in self.events:
+            self.assertEqual(self.listing(event).category_names, ['Jazz'])
+
+    def test_forward_and_reverse_membership_changes(self):
+        other, _ = make_taxonomy('Film')
+        first, second = self.events
+        with self.captureOnCommitCallbacks(execute=True):
+            first.category.remove(self.category)
+            other.events.add(second)
+        self.assertEqual(self.listing(first).category_names, [])
+        self.assertEqual(sorted(self.listing(second).category_names), ['Film', 'Music'])
+
+    def test_reverse_clear_refreshes_every_former_member(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.events.clear()
+        for event in self.events:
+            listing = self.listing(event)
+            self.assertEqual(listing.tag_names, [])
+            self.assertNotIn(taxonomy_key('t', self.tag.pk), listing.taxonomy_keys)
+
+    def test_deleting_taxonomy_refreshes_linked_listings(self):
+        category_key = taxonomy_key('c', self.category.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.delete()
+            self.tag.delete()
+        for event in self.events:
+            listing = self.listing(event)
+            self.assertEqual((listing.category_names, listing.tag_names), ([], []))
+            self.assertNotIn(category_key, listing.taxonomy_keys)
+
+    def test_event_changes_refresh_their_listing(self):
+        event = self.events[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            event.title = 'Renamed'
+            event.is_active = False
+            event.save()
+        listing = self.listing(event)
+        self.assertEqual((listing.title, listing.is_active), ('Renamed', False))
+
+    def test_refresh_waits_for_commit(self):
+        # The queued ids would otherwise ride along with the next test's refresh.
+        self.addCleanup(setattr, listings._pending, 'ids', set())
+        self.category.name = 'Pending'
+        self.category.save()
+        self.assertEqual(self.listing(self.events[0]).category_names, ['Music'])
@@ -0,0 +1,64 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from ..loaders import BatchLoader
+from ..models import EventImages
+from .factories import make_event, make_location, make_taxonomy
+from .test_graphql_view import GraphQLTestMixin
+
+
+QUERY = '{ allEvents { id title category { name } tags { name } extraImages { id image } } }'
+
+
+class BatchLoaderTests(SimpleTestCase):
+
+    def test_registered_keys_load_in_one_batch(self):
+        calls = []
+        loader = BatchLoader(lambda keys: calls.append(sorted(keys)) or {k: k * 10 for k in keys}, default=0)
+        loader.register([1, 2, 3])
+        self.assertEqual(loader.load(2), 20)
+        self.assertEqual((loader.load(1), loader.load(3), loader.load(None)), (10, 30, 0))
+        self.assertEqual(calls, [[1, 2, 3]])
+
+    def test_primed_keys_are_not_loaded(self):
+        loader = BatchLoader(lambda keys: self.fail(f'loaded {keys}'))
+        loader.prime(1, 'primed')
+        loader.register([1])
+        self.assertEqual(loader.load(1), 'primed')
+
+
+class EventRelationQueryCountTests(GraphQLTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        _, _, self.city = make_location('2')
+        self.category, self.tag = make_taxonomy()
+
+    def add_events(self, count):
+        for i in range(count):
+            event = make_event(self.city, title=f'Extra {i}')
+            event.category.add(self.category)
+            event.tags.add(self.tag)
+            event.extraImages.add(EventImages.objects.create(image=f'blobs/extra-{event.pk}.png'))
+
+    def count_queries(self):
+        caches['graphql_responses'].clear()
+        with CaptureQueriesContext(connection) as queries:
+            _, body = self.graphql({'query': QUERY})
+        self.assertNotIn('errors', body)
+        return len(queries), body['data']['allEvents']
+
+    def test_relation_queries_do_not_grow_with_the_number_of_events(self):
+        self.add_events(2)
+        self.count_queries()
+        few, events = self.count_queries()
+        self.add_events(6)
+        many, more_events = self.count_queries()
+        self.assertEqual(len(more_events) - len(events), 6)
+        # The events, then one batched query per relation.
+        self.assertEqual(few, 4)
+        self.assertEqual(many, 4)
+        self.assertEqual(more_events[-1]['category'], [{'name': 'Music'}])
+        self.assertEqual(more_events[-1]['tags'], [{'name': 'MusicTag'}])
+        self.assertEqual(len(more_events[-1]['extraImages']), 1)
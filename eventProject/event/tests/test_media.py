@@ -0,0 +1,88 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from django.test import TestCase, override_settings
+from ..storage import blob_name
+
+
+DATA = bytes(range(256)) * 4
+
+
+class MediaServingTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        self.digest = hashlib.sha256(DATA).hexdigest()
+        self.blob = self.write(blob_name(self.digest, 'photo.png'))
+        self.plain = self.write('events/plain.png')
+
+    def write(self, name, data=DATA):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            fh.write(data)
+        return name
+
+    def get(self, name, **headers):
+        response = self.client.get(f'/media/{name}', headers=headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_blobs_are_immutable_and_tagged_by_their_digest(self):
+        response, body = self.get(self.blob)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, DATA)
+        self.assertEqual(response['ETag'], f'"{self.digest}"')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_other_files_get_a_content_etag_and_short_cache(self):
+        response, _ = self.get(self.plain)
+        self.assertEqual(response['ETag'], f'"{self.digest}"')
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_if_none_match(self):
+        response, body = self.get(self.blob, If_None_Match=f'"other", "{self.digest}"')
+        self.assertEqual((response.status_code, body), (304, b''))
+        self.assertEqual(response['ETag'], f'"{self.digest}"')
+
+    def test_ranges(self):
+        cases = {
+            'bytes=0-9':      (0, 9),
+            'bytes=1000-':    (1000, 1023),
+            'bytes=-24':      (1000, 1023),
+            'bytes=1020-5000': (1020, 1023),
+        }
+        for header, (start, end) in cases.items():
+            with self.subTest(header=header):
+                response, body = self.get(self.blob, Range=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(body, DATA[start:end + 1])
+                self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/{len(DATA)}')
+                self.assertEqual(response['Content-Length'], str(end - start + 1))
+
+    def test_unsatisfiable_range(self):
+        response, _ = self.get(self.blob, Range='bytes=2000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(DATA)}')
+
+    def test_stale_if_range_serves_the_whole_file(self):
+        response, body = self.get(self.blob, Range='bytes=0-9', If_Range='"stale"')
+        self.assertEqual((response.status_code, body), (200, DATA))
+
+    def test_private_and_escaping_paths_are_not_served(self):
+        self.write('uploads/partial/abc.part')
+        for name in ('uploads/partial/abc.part', 'missing.png'):
+            with self.subTest(name=name):
+                self.assertEqual(self.client.get(f'/media/{name}').status_code, 404)
+        self.assertIn(self.client.get('/media/../secret').status_code, (400, 404))
+
+    @override_settings(MEDIA_SERVING={'OFFLOAD': 'x-accel-redirect'})
+    def test_offload_hands_the_file_to_the_front_end(self):
+        response, body = self.get(self.blob)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.blob}')
+        self.assertEqual(body, b'')
+        self.assertEqual(response['ETag'], f'"{self.digest}"')
@@ -0,0 +1,55 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from .factories import make_event, make_location
+from .test_graphql_view import GraphQLTestMixin
+
+
+class EventQueryPlannerTests(GraphQLTestMixin, TestCase):
+
+    def run_query(self, query):
+        caches['graphql_responses'].clear()
+        with CaptureQueriesContext(connection) as queries:
+            _, body = self.graphql({'query': query})
+        self.assertNotIn('errors', body)
+        return [q['sql'] for q in queries], body['data']
+
+    def event_select(self, sql):
+        return next(q for q in sql if q.startswith('SELECT') and 'FROM "event_event"' in q)
+
+    def test_only_selected_columns_are_loaded(self):
+        sql, _ = self.run_query('{ allEvents { title } }')
+        select = self.event_select(sql)
+        self.assertIn('"event_event"."title"', select)
+        self.assertNotIn('long_description', select)
+
+    def test_fragments_contribute_columns(self):
+        sql, data = self.run_query('''
+            { allEvents { ...Texts ... on EventType { venue } } }
+            fragment Texts on EventType { longDescription }
+        ''')
+        select = self.event_select(sql)
+        self.assertIn('long_description', select)
+        self.assertIn('"event_event"."venue"', select)
+        self.assertEqual(data['allEvents'][0]['venue'], 'Main Hall')
+
+    def test_locations_come_from_the_geo_cache(self):
+        query = '{ allEvents { title country { name } state { name } city { name } } }'
+        self.run_query(query)
+        with self.captureOnCommitCallbacks(execute=True):
+            _, _, city = make_location('2')
+        for i in range(5):
+            make_event(city, title=f'More {i}')
+        self.run_query(query)
+
+        sql, data = self.run_query(query)
+        self.assertEqual(len(sql), 1)
+        self.assertEqual(data['allEvents'][-1]['city'], {'name': 'City2'})
+
+    def test_connection_nodes_keep_their_keyset_columns(self):
+        sql, data = self.run_query('{ activeEventsConnection(first: 1) { edges { cursor node { title } } } }')
+        select = self.event_select(sql)
+        self.assertIn('"event_event"."event_date"', select)
+        self.assertNotIn('long_description', select)
+        self.assertTrue(data['activeEventsConnection']['edges'][0]['cursor'])
@@ -0,0 +1,60 @@
+import datetime
+from django.test import TestCase
+from ..pagination import encode_cursor
+from .factories import make_event, make_location
+from .test_graphql_view import GraphQLTestMixin
+
+
+QUERY = '''
+query Page($first: Int, $after: String) {
+  activeEventsConnection(first: $first, after: $after) {
+    edges { cursor node { id title } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+'''
+
+
+class KeysetCursorTests(GraphQLTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        _, _, city = make_location('2')
+        # Two events share a date so the id tie-breaker is exercised.
+        for day, title in ((3, 'C'), (1, 'A'), (2, 'B1'), (2, 'B2'), (5, 'E')):
+            make_event(city, title=title, event_date=datetime.date(2031, 1, day))
+        make_event(city, title='Hidden', event_date=datetime.date(2031, 1, 4), is_active=False)
+
+    def page(self, first=None, after=None):
+        _, body = self.graphql({'query': QUERY, 'variables': {'first': first, 'after': after}})
+        return body
+
+    def connection(self, **kwargs):
+        body = self.page(**kwargs)
+        self.assertNotIn('errors', body)
+        return body['data']['activeEventsConnection']
+
+    def test_pages_walk_every_row_once_in_key_order(self):
+        titles, after = [], None
+        while True:
+            connection = self.connection(first=2, after=after)
+            titles += [edge['node']['title'] for edge in connection['edges']]
+            if not connection['pageInfo']['hasNextPage']:
+                break
+            after = connection['pageInfo']['endCursor']
+        # The mixin's two events are dated 2030, before these.
+        self.assertEqual(titles, ['Show 0', 'Show 1', 'A', 'B1', 'B2', 'C', 'E'])
+
+    def test_first_zero_returns_no_edges(self):
+        connection = self.connection(first=0)
+        self.assertEqual(connection['edges'], [])
+        self.assertTrue(connection['pageInfo']['hasNextPage'])
+
+    def test_negative_first_is_rejected(self):
+        self.assertEqual(self.page(first=-1)['errors'][0]['message'], 'first must not be negative.')
+
+    def test_malformed_cursors_are_invalid(self):
+        for cursor in ('!!not-base64', encode_cursor(['2031-01-01']), encode_cursor(['2031-01-01', 'abc']),
+                       encode_cursor(['not-a-date', '1'])):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.page(after=cursor)['errors'][0]['message'], 'Invalid cursor.')
@@ -0,0 +1,24 @@
+from unittest import mock
+from django.test import TestCase
+from ..persisted_queries import query_hash
+from .test_graphql_view import EVENT_QUERY, GraphQLTestMixin
+
+
+class PersistedQueryTests(GraphQLTestMixin, TestCase):
+
+    def test_hash_only_requests_skip_parsing(self):
+        extensions = {'persistedQuery': {'version': 1, 'sha256Hash': query_hash(EVENT_QUERY)}}
+        first, second = self.events
+        _, body = self.graphql({'query': EVENT_QUERY, 'variables': {'id': first.pk}, 'extensions': extensions})
+        self.assertEqual(body['data']['eventById']['title'], first.title)
+
+        with mock.patch('event.documents.parse') as parse, mock.patch('graphene_django.views.parse') as upstream_parse:
+            _, body = self.graphql({'variables': {'id': second.pk}, 'extensions': extensions})
+        self.assertEqual(body['data']['eventById']['title'], second.title)
+        parse.assert_not_called()
+        upstream_parse.assert_not_called()
+
+    def test_unknown_hash(self):
+        extensions = {'persistedQuery': {'version': 1, 'sha256Hash': '0' * 64}}
+        _, body = self.graphql({'extensions': extensions})
+        self.assertEqual(body['errors'][0]['extensions']['code'], 'PERSISTED_QUERY_NOT_FOUND')
@@ -0,0 +1,57 @@
+from unittest import mock
+from django.test import TestCase
+from ..models import Event
+from ..search import PostgresSearchBackend, SimpleSearchBackend
+from .factories import make_event, make_location, make_taxonomy
+
+
+class SnippetEscapingTests(TestCase):
+
+    def setUp(self):
+        _, _, city = make_location()
+        make_event(city, title='Rock night', long_description='<script>alert(1)</script> rock & roll all night')
+
+    def assertSafeSnippet(self, backend):
+        hits = backend.search(Event.objects.all(), 'rock', 5)
+        self.assertEqual(len(hits), 1)
+        snippet = hits[0].snippet
+        self.assertNotIn('<script>', snippet)
+        self.assertIn('script&gt;', snippet)
+        self.assertIn('&amp;', snippet)
+        self.assertIn('<mark>', snippet)
+
+    def test_postgres_backend_escapes_snippet(self):
+        self.assertSafeSnippet(PostgresSearchBackend())
+
+    def test_simple_backend_escapes_snippet(self):
+        self.assertSafeSnippet(SimpleSearchBackend())
+
+
+class TaxonomyReindexTests(TestCase):
+
+    def setUp(self):
+        _, _, city = make_location()
+        self.category, _ = make_taxonomy('Jazz')
+        self.events = [make_event(city, title=f'Evening {i}') for i in range(3)]
+        for event in self.events:
+            event.category.add(self.category)
+
+    def matches(self, text):
+        return {hit.event.pk for hit in PostgresSearchBackend().search(Event.objects.all(), text, 10)}
+
+    def test_rename_reindexes_linked_events(self):
+        self.assertEqual(self.matches('jazz'), {e.pk for e in self.events})
+        self.category.name = 'Blues'
+        self.category.save()
+        self.assertEqual(self.matches('blues'), {e.pk for e in self.events})
+        self.assertEqual(self.matches('jazz'), set())
+
+    def test_flag_toggle_skips_reindex(self):
+        self.category.isActive = False
+        with mock.patch.object(PostgresSearchBackend, 'index') as index:
+            self.category.save()
+        index.assert_not_called()
+
+    def test_index_is_one_update_per_batch(self):
+        with self.assertNumQueries(1):
+            PostgresSearchBackend().index([e.pk for e in self.events])
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from ..models import StoredBlob
+from ..storage import ContentAddressedStorage, blob_name, content_digest
+
+
+class ContentAddressedStorageTests(TestCase):
+
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def save(self, data=b'same bytes', name='photo.JPEG'):
+        return self.storage.save(name, ContentFile(data))
+
+    def test_identical_content_is_stored_once(self):
+        first = self.save(name='a.jpeg')
+        second = self.save(name='b.jpg')
+        self.assertEqual(first, second)
+        self.assertEqual(first, blob_name(content_digest(ContentFile(b'same bytes')), 'x.jpg'))
+        self.assertEqual(StoredBlob.objects.get(name=first).refcount, 2)
+        self.assertNotEqual(self.save(b'other bytes'), first)
+
+    def test_delete_removes_the_file_with_the_last_reference(self):
+        name = self.save()
+        self.save()
+        self.storage.delete(name)
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(StoredBlob.objects.get(name=name).refcount, 1)
+
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(StoredBlob.objects.filter(name=name).exists())
+
+    def test_save_after_last_delete_recreates_the_blob(self):
+        name = self.save()
+        self.storage.delete(name)
+        self.assertEqual(self.save(), name)
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(StoredBlob.objects.get(name=name).refcount, 1)
+
+    def test_missing_file_is_rewritten_under_an_existing_row(self):
+        name = self.save()
+        os.remove(self.storage.path(name))
+        self.save()
+        with self.storage.open(name) as fh:
+            self.assertEqual(fh.read(), b'same bytes')
+        self.assertEqual(StoredBlob.objects.get(name=name).refcount, 2)
+
+    def test_no_temporary_files_are_left_behind(self):
+        name = self.save()
+        directory = os.path.dirname(self.storage.path(name))
+        self.assertEqual(os.listdir(directory), [os.path.basename(name)])
@@ -0,0 +1,60 @@
+import io
+import shutil
+import tempfile
+import threading
+from unittest import mock
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from ..models import StoredBlob
+from ..uploads import attach_extra_images
+from .factories import make_event, make_location
+
+
+def image_file(name, color, fmt='PNG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (4, 4), color).save(buffer, fmt)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class AttachExtraImagesTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.enterContext(mock.patch('event.uploads.image_pipeline'))
+        _, _, city = make_location()
+        self.event = make_event(city)
+
+    def test_valid_files_are_linked_and_invalid_ones_reported(self):
+        files = [image_file('red.png', 'red'), image_file('blue.jpg', 'blue', 'JPEG'),
+                 SimpleUploadedFile('notes.png', b'not an image')]
+        images, errors = attach_extra_images(self.event, files)
+        self.assertEqual(len(images), 2)
+        self.assertEqual(list(errors[0]), ['notes.png'])
+        self.assertEqual(self.event.extraImages.count(), 2)
+
+    def test_duplicate_uploads_share_one_blob(self):
+        images, _ = attach_extra_images(self.event, [image_file('a.png', 'red'), image_file('b.png', 'red')])
+        self.assertEqual(images[0].image.name, images[1].image.name)
+        self.assertEqual(StoredBlob.objects.get(name=images[0].image.name).refcount, 2)
+
+    def test_storage_runs_on_the_request_thread(self):
+        threads = []
+        save = default_storage.save
+
+        def recording_save(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return save(*args, **kwargs)
+
+        with mock.patch.object(default_storage, 'save', side_effect=recording_save):
+            attach_extra_images(self.event, [image_file('a.png', 'red'), image_file('b.png', 'green')])
+        self.assertEqual(threads, [threading.current_thread()] * 2)
+
+    def test_stored_files_are_released_when_linking_fails(self):
+        with mock.patch('event.uploads.EventImages.objects.bulk_create', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                attach_extra_images(self.event, [image_file('a.png', 'red')])
+        self.assertFalse(StoredBlob.objects.exists())
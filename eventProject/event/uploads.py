@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, UnidentifiedImageError
+from . import response_cache
+from .images import image_pipeline
+from .models import Event, EventImages
+
+
+ALLOWED_FORMATS = {'JPEG': 'image/jpeg', 'PNG': 'image/png'}
+MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+UPLOAD_WORKERS  = 8
+
+
+class UploadValidationError(Exception):
+    pass
+
+
+def sniff_image(f, max_size=MAX_UPLOAD_SIZE):
+    """Identify an upload from its bytes rather than the client-supplied content type."""
+    if f.size > max_size:
+        raise UploadValidationError(f'Image size must not exceed {max_size // (1024 * 1024)} MB.')
+    try:
+        f.seek(0)
+        with Image.open(f) as image:
+            fmt = image.format
+            image.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+        raise UploadValidationError('File is not a valid image.')
+    finally:
+        f.seek(0)
+    if fmt not in ALLOWED_FORMATS:
+        raise UploadValidationError('Unsupported image format. Allowed: JPEG, PNG, JPG.')
+    return ALLOWED_FORMATS[fmt]
+
+
+def _validate(f):
+    try:
+        sniff_image(f)
+    except UploadValidationError as e:
+        return f, str(e)
+    return f, None
+
+
+def _store(f):
+    field = EventImages._meta.get_field('image')
+    return field.storage.save(field.generate_filename(None, f.name), f)
+
+
+def attach_extra_images(event, files):
+    """Validate ``files`` in parallel, store them, then link them to ``event`` with one insert.
+
+    Returns ``(images, errors)``; invalid files are reported and skipped.
+    """
+    workers = max(1, min(UPLOAD_WORKERS, len(files)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='event-uploads') as pool:
+        checked = list(pool.map(_validate, files))
+    valid  = [f for f, error in checked if error is None]
+    errors = [{f.name: {'image': [error]}} for f, error in checked if error is not None]
+    if not valid:
+        return [], errors
+
+    # Storing touches the blob table, so it stays on the request thread and
+    # connection; worker threads would each open a connection of their own.
+    through = Event._meta.get_field('extraImages').remote_field.through
+    names = []
+    try:
+        for f in valid:
+            names.append(_store(f))
+        with transaction.atomic():
+            images = EventImages.objects.bulk_create([EventImages(image=name) for name in names])
+            through.objects.bulk_create([through(event_id=event.pk, eventimages_id=image.pk) for image in images])
+    except Exception:
+        for name in names:
+            default_storage.delete(name)
+        raise
+
+    # bulk_create skips the model signals, so do their work here.
+    response_cache.bump_generation()
+    for name in names:
+        image_pipeline.submit(name)
+    return images, errors
@@ -1,11 +1,17 @@
 from django.urls import path
-from .views import FeatureImageUploadView, ExtraImagesUploadView, login_page, signup_page, event_list_page, event_detail_page
+from .views import FeatureImageUploadView, ExtraImagesUploadView, UploadSessionStartView, UploadSessionView, UploadSessionCompleteView, EventExportView, EventImportView, GraphQLDocumentCacheStatsView, login_page, signup_page, event_list_page, event_detail_page
 
 urlpatterns = [
     path('login/',  login_page,  name='login'),
     path('signup/', signup_page, name='signup'),
     path('events/', event_list_page,   name='event-list'),
+    path('events/export/', EventExportView.as_view(), name='event-export'),
+    path('events/import/', EventImportView.as_view(), name='event-import'),
     path('events/<slug:slug>/', event_detail_page, name='event-detail'),
     path('events/<int:event_id>/feature-image/', FeatureImageUploadView.as_view(), name='event-feature-image'),
     path('events/<int:event_id>/extra-images/', ExtraImagesUploadView.as_view(), name='event-extra-images'),
+    path('events/<int:event_id>/uploads/', UploadSessionStartView.as_view(), name='event-upload-start'),
+    path('uploads/<uuid:session_id>/', UploadSessionView.as_view(), name='upload-session'),
+    path('uploads/<uuid:session_id>/complete/', UploadSessionCompleteView.as_view(), name='upload-session-complete'),
+    path('graphql-cache/documents/', GraphQLDocumentCacheStatsView.as_view(), name='graphql-document-cache-stats'),
 ]
@@ -1,11 +1,19 @@
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAdminUser
 from rest_framework.parsers import MultiPartParser, FormParser
-from .models import Event
+from .chunked_uploads import ChunkedUploadError, abort_session, complete_session, get_config as chunked_upload_config, parse_offset, start_session, write_chunk
+from .documents import document_cache
+from .exporter import EXPORT_FORMATS, filter_events, stream_export
+from .images import image_pipeline
+from .importer import detect_format, open_text, run_import
+from .models import Event, UploadSession
 from .serializers import ExtraImagesResponseSerializer, FeatureImageSerializer, EventImageSerializer
+from .uploads import attach_extra_images
 
 
 class FeatureImageUploadView(APIView):
@@ -33,6 +41,7 @@ class FeatureImageUploadView(APIView):
             if event.feature_image:
                 event.feature_image.delete(save=False)
             serializer.save()
+            image_pipeline.submit(event.feature_image.name)
             response_serializer = FeatureImageSerializer(event, context={'request': request})
             return Response(
                 {
@@ -82,16 +91,8 @@ class ExtraImagesUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        created = []
-        errors  = []
-        for f in files:
-            serializer = EventImageSerializer(data={'image': f}, context={'request': request})
-            if serializer.is_valid():
-                img_obj = serializer.save()
-                event.extraImages.add(img_obj)
-                created.append(serializer.data)
-            else:
-                errors.append({f.name: serializer.errors})
+        images, errors = attach_extra_images(event, files)
+        created = EventImageSerializer(images, many=True, context={'request': request}).data
 
         if errors:
             return Response(
@@ -114,6 +115,192 @@ class ExtraImagesUploadView(APIView):
         )
     
 
+def _upload_session_data(session):
+    return {
+        'id': str(session.pk),
+        'event_id': session.event_id,
+        'kind': session.kind,
+        'filename': session.filename,
+        'size': session.size,
+        'offset': session.offset,
+        'status': session.status,
+        'chunk_size': chunked_upload_config()['CHUNK_SIZE'],
+    }
+
+
+def _upload_error(error):
+    body = {'success': False, 'message': str(error)}
+    if error.offset is not None:
+        body['offset'] = error.offset
+    return Response(body, status=error.status)
+
+
+class UploadSessionStartView(APIView):
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, event_id):
+        try:
+            event = Event.objects.get(pk=event_id)
+        except Event.DoesNotExist:
+            return Response(
+                {'success': False, 'message': 'Event not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        try:
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            size = None
+        try:
+            session = start_session(
+                request.user, event,
+                kind=request.data.get('kind', UploadSession.KIND_EXTRA),
+                filename=request.data.get('filename'),
+                size=size,
+                checksum=request.data.get('sha256'),
+            )
+        except ChunkedUploadError as e:
+            return _upload_error(e)
+        return Response(
+            {'success': True, 'message': 'Upload session created.', 'data': _upload_session_data(session)},
+            status=status.HTTP_201_CREATED
+        )
+
+
+class UploadSessionView(APIView):
+
+    permission_classes = [IsAdminUser]
+
+    def _get_session(self, request, session_id):
+        return UploadSession.objects.filter(pk=session_id, user=request.user).first()
+
+    def get(self, request, session_id):
+        session = self._get_session(request, session_id)
+        if session is None:
+            return Response(
+                {'success': False, 'message': 'Upload session not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({'success': True, 'data': _upload_session_data(session)}, status=status.HTTP_200_OK)
+
+    def put(self, request, session_id):
+        if self._get_session(request, session_id) is None:
+            return Response(
+                {'success': False, 'message': 'Upload session not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+        try:
+            offset = parse_offset(request.headers)
+            session = write_chunk(
+                session_id, offset, request.stream, length,
+                chunk_checksum=request.headers.get('X-Chunk-SHA256'),
+            )
+        except ChunkedUploadError as e:
+            return _upload_error(e)
+        return Response({'success': True, 'data': _upload_session_data(session)}, status=status.HTTP_200_OK)
+
+    def delete(self, request, session_id):
+        session = self._get_session(request, session_id)
+        if session is None:
+            return Response(
+                {'success': False, 'message': 'Upload session not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        abort_session(session)
+        return Response({'success': True, 'message': 'Upload session cancelled.'}, status=status.HTTP_200_OK)
+
+
+class UploadSessionCompleteView(APIView):
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, session_id):
+        if not UploadSession.objects.filter(pk=session_id, user=request.user).exists():
+            return Response(
+                {'success': False, 'message': 'Upload session not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        try:
+            session = complete_session(session_id)
+        except ChunkedUploadError as e:
+            return _upload_error(e)
+        return Response(
+            {
+                'success': True,
+                'message': 'Upload complete.',
+                'data': {**_upload_session_data(session), 'url': request.build_absolute_uri(f'/media/{session.result_name}')},
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class EventImportView(APIView):
+
+    permission_classes = [IsAdminUser]
+    parser_classes     = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {'success': False, 'message': 'No file provided. Use field key "file".'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        fmt = request.data.get('format') or detect_format(upload.name)
+        if fmt not in ('csv', 'jsonl'):
+            return Response(
+                {'success': False, 'message': 'Unsupported format. Allowed: csv, jsonl.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        create_missing = str(request.data.get('create_missing', '')).lower() in ('1', 'true', 'yes')
+        stats = run_import(open_text(upload.file), fmt, create_missing=create_missing)
+        return Response(
+            {
+                'success': stats.failed == 0,
+                'message': f'{stats.created} event(s) imported, {stats.failed} row(s) failed.',
+                'data': {**stats.as_dict(), 'errors': stats.errors},
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class EventExportView(APIView):
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        # Not 'format': DRF reserves that for renderer negotiation and 404s on unknown values.
+        fmt = request.query_params.get('export_format', 'csv').lower()
+        if fmt not in EXPORT_FORMATS:
+            return Response(
+                {'success': False, 'message': f"Unsupported format. Allowed: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        compress = request.query_params.get('gzip', '').lower() in ('1', 'true', 'yes')
+        qs = filter_events(
+            search=request.query_params.get('search'),
+            category_id=request.query_params.get('category_id'),
+            tag_id=request.query_params.get('tag_id'),
+            status=request.query_params.get('status'),
+        )
+
+        extension = 'csv' if fmt == 'csv' else 'ndjson'
+        filename = f"events-{timezone.now():%Y%m%d-%H%M%S}.{extension}" + ('.gz' if compress else '')
+        content_type = 'application/gzip' if compress else EXPORT_FORMATS[fmt]
+        response = StreamingHttpResponse(stream_export(qs, fmt, compress), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class GraphQLDocumentCacheStatsView(APIView):
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({'success': True, 'data': document_cache.stats()}, status=status.HTTP_200_OK)
+
+
 def login_page(request):
     return render(request, 'event/login.html')
 
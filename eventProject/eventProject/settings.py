@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'event',
     'admin_panel',
@@ -62,6 +63,103 @@ GRAPHQL_JWT = {
     'JWT_HIDE_TOKEN_FIELDS': False,
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Swap for FileBasedCache or RedisCache to share entries across workers.
+    'graphql_responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'graphql-responses',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+    'graphql_queries': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'graphql-queries',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    # Small coordination stamps (session revocations, geo data version) that
+    # every worker process must see. This must never be a per-process cache:
+    # the file cache is shared by all processes on one host; use Redis or
+    # Memcached when workers run on several hosts.
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'shared',
+        'TIMEOUT': None,
+        # One stamp per user who ever logged out; culling one would resurrect revoked sessions.
+        'OPTIONS': {'MAX_ENTRIES': 1000000},
+    },
+}
+
+SHARED_CACHE_ALIAS = 'shared'
+
+GRAPHQL_RESPONSE_CACHE = {
+    'ENABLED': True,
+    'CACHE_ALIAS': 'graphql_responses',
+    'TIMEOUT': 60,
+}
+
+GRAPHQL_PERSISTED_QUERIES = {
+    'CACHE_ALIAS': 'graphql_queries',
+    'MANIFEST': None,
+    'ALLOW_REGISTRATION': True,
+}
+
+GRAPHQL_DOCUMENT_CACHE_SIZE = 256
+
+GRAPHQL_QUERY_COST = {
+    'MAX_COST': 5000,
+    'MAX_DEPTH': 8,
+    'DEFAULT_LIST_SIZE': 100,
+    'LIST_SIZES': {
+        'EventType.category': 5,
+        'EventType.tags': 10,
+        'EventType.extraImages': 10,
+        'EventType.variants': 6,
+        'EventImagesType.variants': 6,
+    },
+    'FIELD_COSTS': {
+        'Query.allEvents': 5,
+        'Query.allUsers': 5,
+        'Query.nearbyEvents': 5,
+    },
+}
+
+# BACKEND defaults to PostgreSQL full-text search, or the in-Python
+# SimpleSearchBackend on other databases.
+EVENT_SEARCH = {
+    'BACKEND': None,
+    'CONFIG': 'english',
+}
+
+# Sessions are cached per process for this many seconds. Logins and token
+# refreshes bump a per-user stamp in the shared cache, so a replaced token
+# stops working on every worker immediately, not after the TTL.
+USER_TOKEN_CACHE_TTL = 30
+
+EVENT_VIEW_COUNTER = {
+    'FLUSH_INTERVAL': 10,
+}
+
+# Uploaded images are resized in a background thread pool; WORKERS = 0
+# processes them synchronously after the upload commits.
+EVENT_IMAGE_PIPELINE = {
+    'WORKERS': 2,
+    'SIZES': {
+        'thumbnail': (160, 160),
+        'card': (640, 400),
+        'hero': (1600, 900),
+    },
+}
+
+# Resumable uploads: chunks are PUT with Upload-Offset (or Content-Range)
+# and stream straight to MEDIA_ROOT/uploads/partial/.
+EVENT_CHUNKED_UPLOADS = {
+    'MAX_SIZE': 50 * 1024 * 1024,
+    'CHUNK_SIZE': 1024 * 1024,
+    'TTL': 24 * 60 * 60,
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'event.auth.UserTokenJWTAuthentication',
@@ -161,10 +259,29 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+
+# Media files are stored once per distinct content under blobs/ and
+# reference-counted; run collect_media_garbage to sweep orphans.
+STORAGES = {
+    'default': {
+        'BACKEND': 'event.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
 import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
\ No newline at end of file
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# OFFLOAD hands the file to the front-end server: 'x-sendfile' (Apache)
+# or 'x-accel-redirect' (nginx, with an internal location at ACCEL_PREFIX).
+MEDIA_SERVING = {
+    'OFFLOAD': None,
+    'ACCEL_PREFIX': '/protected-media/',
+    'MAX_AGE': 3600,
+}